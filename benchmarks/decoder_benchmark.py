@@ -0,0 +1,91 @@
+"""
+Allocations and time per entry of the decoder in a batch loop.
+
+Compares a new decoder for every entry (Level5ConditionDecoder.from_base64)
+with one decoder reused through decode(), which resets its reader and
+scratch lists. tracemalloc reports, per entry, the memory allocated while
+decoding that is released afterwards (churn) and the memory kept by the
+returned conditions.
+
+    python -m benchmarks.decoder_benchmark
+    python -m benchmarks.decoder_benchmark --entries 200000
+"""
+import time
+import argparse
+import tracemalloc
+
+from level_5.condition.decoder import Level5ConditionDecoder
+
+SAMPLES = [
+    "AAAAAA8FNZjuS0cAAQAyBfZ9Sng=",
+    "AAAAADUFNZjuS0cAAQAyAAAABW41mO5LRwABADIAAAAKb481Kj1FQwACAAAAAAAyAAAATTIAAAABeA==",
+    "AAAAADsFNfujxRMAAgAAAAAAMgAAAAM1jXZm2AACAAAAAAAyAAAADDIAAAAAeI81Kj1FQwACAAAAAAAyAAAACQ==",
+    "AAAAAC8FNY12ZtgAAgAAAAAAMgAAAAwyAAAAAXg1jXZm2AACAAAAAAAyAAAADDIAAAAAeA==",
+]
+
+def new_decoder():
+    return Level5ConditionDecoder.from_base64
+
+def reused_decoder():
+    decoder = Level5ConditionDecoder()
+    return lambda data: decoder.decode(data).conditions
+
+def measure_time(factory, entries, runs):
+    best = None
+    for _ in range(runs):
+        decode = factory()
+        start = time.perf_counter()
+        for data in entries:
+            decode(data)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def measure_memory(factory, entries):
+    """(churn bytes per entry, kept bytes per entry, kept blocks per entry)"""
+    decode = factory()
+    decode(entries[0])
+
+    # The peak of each decode above what it keeps is the memory allocated and released again
+    tracemalloc.start()
+    churn = 0
+    for data in entries:
+        tracemalloc.reset_peak()
+        result = decode(data)
+        after, peak = tracemalloc.get_traced_memory()
+        churn += peak - after
+        del result
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    results = [decode(data) for data in entries]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    stats = after.compare_to(before, "filename")
+    kept_bytes = sum(stat.size_diff for stat in stats)
+    kept_blocks = sum(stat.count_diff for stat in stats)
+    del results
+
+    count = len(entries)
+    return churn / count, kept_bytes / count, kept_blocks / count
+
+def main():
+    parser = argparse.ArgumentParser(description="Decoder allocations and time per entry")
+    parser.add_argument("--entries", type=int, default=100000, help="Number of entries timed")
+    parser.add_argument("--memory-entries", type=int, default=10000, help="Number of entries traced with tracemalloc")
+    parser.add_argument("--runs", type=int, default=3, help="Timed runs, the best is kept")
+    args = parser.parse_args()
+
+    entries = [SAMPLES[i % len(SAMPLES)] for i in range(args.entries)]
+    traced = entries[:args.memory_entries]
+
+    print(f"{'decoder':<10} {'us/entry':>10} {'churn B/entry':>15} {'kept B/entry':>14} {'kept blocks/entry':>18}")
+    for name, factory in (("new", new_decoder), ("reused", reused_decoder)):
+        elapsed = measure_time(factory, entries, args.runs)
+        churn, kept_bytes, kept_blocks = measure_memory(factory, traced)
+        print(f"{name:<10} {elapsed / len(entries) * 1e6:10.2f} {churn:15.0f} {kept_bytes:14.0f} {kept_blocks:18.1f}")
+
+if __name__ == "__main__":
+    main()
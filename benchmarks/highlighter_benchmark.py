@@ -0,0 +1,99 @@
+"""
+Highlighting cost on a large generated document (100k lines by default).
+
+Compares the combined single-pass tokenizer of the highlighters with the
+previous approach of one compiled pattern per rule, and, when PyQt6 is
+installed, times a full highlight of a QTextDocument.
+
+    python -m benchmarks.highlighter_benchmark
+    python -m benchmarks.highlighter_benchmark --lines 200000 --language squirrel
+"""
+import re
+import time
+import argparse
+
+from languages.code_emitter import ConditionEntry
+from languages.c_language.c_syntaxhighlighter import CSyntaxHighlighter
+from languages.squirrel_language.squirrel_syntaxhighlighter import SquirrelSyntaxHighlighter
+
+SAMPLE = "AAAAADUFNZjuS0cAAQAyAAAABW41mO5LRwABADIAAAAKb481Kj1FQwACAAAAAAAyAAAATTIAAAABeA=="
+
+def build_document(language, line_count):
+    code = ConditionEntry(SAMPLE).emit(language)
+    lines = code.split("\n")
+    return [lines[i % len(lines)] for i in range(line_count)]
+
+def legacy_rules(highlighter_class, function_patterns):
+    """One pattern per rule, as the highlighters used to do"""
+    rules = [re.compile(f"\\b{word}\\b") for word in highlighter_class.KEYWORDS]
+    rules += [re.compile(pattern) for pattern in function_patterns]
+    rules += [re.compile(r'\b[0-9]+\b'), re.compile(r'"[^"\\]*(\\.[^"\\]*)*"'), re.compile(r'//[^\n]*'),
+              re.compile(r'\bvariable[0-9]+\b'), re.compile(r'\bflag_variable[0-9]+\b'), re.compile(r'\bresult\b')]
+    return rules
+
+def time_legacy(rules, lines):
+    start = time.perf_counter()
+    count = 0
+    for text in lines:
+        for pattern in rules:
+            for match in pattern.finditer(text):
+                count += 1
+    return time.perf_counter() - start, count
+
+def time_tokenizer(tokenizer, lines):
+    start = time.perf_counter()
+    count = 0
+    for text in lines:
+        for token in tokenizer.tokenize(text):
+            count += 1
+    return time.perf_counter() - start, count
+
+def time_qt(highlighter_class, lines):
+    try:
+        from PyQt6.QtWidgets import QApplication
+        from PyQt6.QtGui import QTextDocument
+    except ImportError:
+        return None
+
+    app = QApplication.instance() or QApplication(["highlighter_benchmark", "-platform", "offscreen"])
+    document = QTextDocument()
+    document.setPlainText("\n".join(lines))
+
+    start = time.perf_counter()
+    highlighter = highlighter_class(document)
+    highlighter.rehighlight()
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description="Syntax highlighter benchmark")
+    parser.add_argument("--lines", type=int, default=100000, help="Number of lines in the document (default: 100000)")
+    parser.add_argument("--language", choices=("c", "squirrel"), default="c")
+    parser.add_argument("--no-qt", action="store_true", help="Skip the QTextDocument measurement")
+    args = parser.parse_args()
+
+    if args.language == "c":
+        highlighter_class = CSyntaxHighlighter
+        function_patterns = [r'\b[A-Za-z_][A-Za-z0-9_]*(?=\()']
+    else:
+        highlighter_class = SquirrelSyntaxHighlighter
+        function_patterns = [r'\b[A-Z_][A-Z0-9_]*(?=\()', r'\b[a-z_][A-Za-z0-9_]*(?=\()']
+
+    lines = build_document(args.language, args.lines)
+
+    legacy_time, legacy_matches = time_legacy(legacy_rules(highlighter_class, function_patterns), lines)
+    tokenizer_time, tokens = time_tokenizer(highlighter_class.TOKENIZER, lines)
+
+    print(f"{args.lines} lines of {args.language}")
+    print(f"  one pattern per rule : {legacy_time * 1000:8.1f} ms ({legacy_matches} matches)")
+    print(f"  single-pass tokenizer: {tokenizer_time * 1000:8.1f} ms ({tokens} tokens)")
+    print(f"  speedup              : {legacy_time / tokenizer_time:8.2f}x")
+
+    if not args.no_qt:
+        qt_time = time_qt(highlighter_class, lines)
+        if qt_time is None:
+            print("  QTextDocument        : skipped, PyQt6 is not installed")
+        else:
+            print(f"  QTextDocument        : {qt_time * 1000:8.1f} ms (full rehighlight)")
+
+if __name__ == "__main__":
+    main()
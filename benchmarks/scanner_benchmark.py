@@ -0,0 +1,188 @@
+"""
+Validation and throughput of the opcode scanners.
+
+A synthetic corpus is built with the encoder (known and unknown functions,
+every comparator, unknown opcodes between instructions). The rows of the
+NumPy and Python scanners are checked against the functions, locals and
+comparators returned by the decoder for every entry, then both scanners are
+compared on a corrupted copy of the corpus (flipped bytes, truncated
+entries) where they must report the same rows and errors. Times of the
+decoder and of both scanners over the whole corpus follow.
+
+    python -m benchmarks.scanner_benchmark
+    python -m benchmarks.scanner_benchmark --entries 500000 --seed 7
+"""
+import sys
+import time
+import random
+import argparse
+
+from level_5.condition.logic import *
+from level_5.condition.encoder import Level5ConditionEncoder
+from level_5.condition.decoder import Level5ConditionDecoder
+from level_5.condition.functions import FunctionRegistry, FunctionSignature
+from level_5.condition.diagnostics import Level5Diagnostic
+from level_5.condition.opcode_scanner import (pack_blobs, numpy_available, scan_opcodes_numpy,
+                                              scan_opcodes_python, FUNCTION, BLOCK_SEPARATOR)
+
+UNKNOWN_OPCODES = [0x00, 0x10, 0x33, 0x72, 0x80, 0xFF]
+
+def random_local(rng, value=None):
+    lifetime = rng.choice([SymbolType.LOCAL_INT, SymbolType.LOCAL_IDENT])
+    return Level5Variable("", lifetime, rng.getrandbits(32) if value is None else value)
+
+def random_condition(rng, registry):
+    kind = rng.randrange(6)
+    comparator = rng.choice(list(ComparatorEnum))
+
+    if kind == 0:
+        function = Level5Function(registry.get(FunctionNameEnum.GET_GAME_SUB_PHASE.value), [])
+        return Level5Condition(function, random_local(rng), comparator)
+    if kind == 1:
+        function = Level5Function(registry.get(FunctionNameEnum.GET_GLOBAL_BIT_FLAG.value), [random_local(rng)])
+        return Level5Condition(function, random_local(rng, rng.randrange(2)), ComparatorEnum.EQUAL)
+    if kind == 2:
+        function = Level5Function(registry.get(FunctionNameEnum.GET_TEAM_BIT_FLAG.value), [random_local(rng)])
+        return Level5Condition(function, random_local(rng, 1), ComparatorEnum.EQUAL)
+    if kind == 3:
+        function = Level5Function(registry.get(FunctionNameEnum.IS_HAVE_ITEM.value), [random_local(rng)])
+        return Level5Condition(function, random_local(rng, rng.randrange(2)), comparator)
+    if kind == 4:
+        arg_count = rng.randrange(2)
+        signature = FunctionSignature.generic(0x10000000 + rng.randrange(64), arg_count)
+        function = Level5Function(signature, [random_local(rng) for _ in range(arg_count)])
+        return Level5Condition(random_local(rng), function, comparator)
+    return Level5Condition(random_local(rng), random_local(rng), comparator)
+
+def random_blob(rng, registry):
+    blocks = []
+    for _ in range(rng.randint(1, 4)):
+        block = [random_condition(rng, registry) for _ in range(rng.randint(1, 4))]
+        # A team bit flag is only encoded as the first condition of a block
+        block.sort(key=lambda condition: not (isinstance(condition.operator_left, Level5Function)
+                                              and condition.operator_left.function_id == FunctionNameEnum.GET_TEAM_BIT_FLAG.value))
+        teams = [condition for condition in block if isinstance(condition.operator_left, Level5Function)
+                 and condition.operator_left.function_id == FunctionNameEnum.GET_TEAM_BIT_FLAG.value]
+        blocks.append(block if len(teams) <= 1 else [teams[0]])
+
+    blob = bytearray(Level5ConditionEncoder(blocks).encode())
+
+    # Unknown opcodes right after a comparator, which the decoder skips
+    if rng.random() < 0.2:
+        decoder = Level5ConditionDecoder()
+        decoder.reset(bytes(blob))
+        comparators = [condition.offset for block in decoder._read_conditions() for condition in block
+                       if condition.offset is not None]
+        for offset in sorted(rng.sample(comparators, min(2, len(comparators))), reverse=True):
+            blob[offset + 1:offset + 1] = bytes([rng.choice(UNKNOWN_OPCODES)])
+
+    return bytes(blob)
+
+def corrupt(rng, blob):
+    blob = bytearray(blob)
+    if rng.random() < 0.5:
+        for _ in range(rng.randint(1, 3)):
+            blob[rng.randrange(len(blob))] = rng.choice([FUNCTION, 0x32, 0x34, BLOCK_SEPARATOR, rng.randrange(256)])
+    if rng.random() < 0.3:
+        del blob[rng.randrange(len(blob) + 1):]
+    return bytes(blob)
+
+def expected_rows(blob):
+    """Rows of the decoded conditions of a blob, block separators excepted"""
+    decoder = Level5ConditionDecoder(tolerant=True)
+    decoder.reset(blob)
+    conditions = decoder._read_conditions()
+    rows = []
+
+    def add_operand(operand):
+        if isinstance(operand, Level5Function):
+            rows.append((operand.offset, FUNCTION, operand.function_id, -1, 0))
+            for arg in operand.args:
+                rows.append((arg.offset, arg.lifetime.value, operand.function_id, arg.value, 0))
+        elif operand.offset is not None:
+            rows.append((operand.offset, operand.lifetime.value, -1, operand.value, 0))
+
+    for block in conditions:
+        for condition in block:
+            add_operand(condition.operator_left)
+            add_operand(condition.operator_right)
+            if condition.offset is not None:
+                value = condition.comparator.value
+                rows.append((condition.offset, value, -1, -1, value))
+
+    for diagnostic in decoder.diagnostics:
+        if diagnostic.reason == Level5Diagnostic.UNKNOWN_OPCODE:
+            rows.append((diagnostic.offset, diagnostic.opcode, -1, -1, 0))
+
+    return sorted(rows)
+
+def rows_by_entry(table):
+    rows = {}
+    for entry, offset, opcode, function_id, value, comparator in table.rows():
+        if opcode != BLOCK_SEPARATOR:
+            rows.setdefault(entry, []).append((offset, opcode, function_id, value, comparator))
+    return rows
+
+def validate_against_decoder(blobs, table, name):
+    rows = rows_by_entry(table)
+    mismatches = [entry for entry, blob in enumerate(blobs) if rows.get(entry, []) != expected_rows(blob)]
+
+    if table.errors() or mismatches:
+        print(f"{name}: {len(mismatches)} entries differ from the decoder, {len(table.errors())} errors, first: {mismatches[:5]}")
+        return False
+
+    print(f"{name}: {len(table)} rows of {len(blobs)} entries match the decoder")
+    return True
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description="Validation and throughput of the opcode scanners")
+    parser.add_argument("--entries", type=int, default=100000, help="Number of synthetic entries")
+    parser.add_argument("--seed", type=int, default=1, help="Seed of the synthetic corpus")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    registry = FunctionRegistry.for_game()
+    blobs = [random_blob(rng, registry) for _ in range(args.entries)]
+    buffer, offsets = pack_blobs(blobs)
+    print(f"{len(blobs)} entries, {len(buffer)} bytes")
+
+    python_table, python_time = timed(scan_opcodes_python, buffer, offsets)
+    ok = validate_against_decoder(blobs, python_table, "python scanner")
+
+    numpy_table = numpy_time = None
+    if numpy_available():
+        numpy_table, numpy_time = timed(scan_opcodes_numpy, buffer, offsets)
+        ok = validate_against_decoder(blobs, numpy_table, "numpy scanner") and ok
+
+        corrupted = [corrupt(rng, blob) for blob in blobs]
+        corrupted_buffer, corrupted_offsets = pack_blobs(corrupted)
+        expected = scan_opcodes_python(corrupted_buffer, corrupted_offsets)
+        actual = scan_opcodes_numpy(corrupted_buffer, corrupted_offsets)
+        same = expected.rows() == actual.rows() and expected.errors() == actual.errors()
+        print(f"corrupted corpus: {len(expected.errors())} errors, scanners {'agree' if same else 'DIFFER'}")
+        ok = same and ok
+    else:
+        print("numpy is not installed, only the Python scanner is checked")
+
+    decoder = Level5ConditionDecoder(tolerant=True)
+    start = time.perf_counter()
+    for blob in blobs:
+        decoder.reset(blob)
+        decoder._read_conditions()
+    decoder_time = time.perf_counter() - start
+
+    print(f"{'reader':<16} {'s':>8} {'MB/s':>8} {'entries/s':>12}")
+    size = len(buffer) / 1e6
+    for name, elapsed in (("decoder", decoder_time), ("python scanner", python_time), ("numpy scanner", numpy_time)):
+        if elapsed is not None:
+            print(f"{name:<16} {elapsed:8.3f} {size / elapsed:8.1f} {len(blobs) / elapsed:12.0f}")
+
+    sys.exit(0 if ok else 1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Measures the cold start of inz_cond_cmd.py for a single condition.
+
+Runs the CLI several times with `python -X importtime`, reports the median wall
+time, the total import time and the slowest imports. With --record, the result
+is appended as a JSON line so the numbers can be tracked between commits.
+
+    python -m benchmarks.startup_benchmark
+    python -m benchmarks.startup_benchmark --runs 20 --record benchmarks/startup_history.jsonl
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+SAMPLE = "AAAAAA8FNZjuS0cAAQAyBfZ9Sng="
+
+def run_once(extra_args):
+    command = [sys.executable, "-X", "importtime", os.path.join(ROOT, "inz_cond_cmd.py"), "-d", SAMPLE] + extra_args
+
+    start = time.perf_counter()
+    process = subprocess.run(command, cwd=ROOT, capture_output=True, text=True)
+    wall_time = time.perf_counter() - start
+
+    if process.returncode != 0:
+        raise RuntimeError(process.stderr)
+
+    return wall_time, parse_importtime(process.stderr)
+
+def parse_importtime(output):
+    """Returns {module: (self_us, cumulative_us, depth)} from -X importtime output"""
+    modules = {}
+
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        modules[name.strip()] = (int(self_us), int(cumulative_us), depth)
+
+    return modules
+
+def main():
+    parser = argparse.ArgumentParser(description="CLI cold start benchmark")
+    parser.add_argument("--runs", type=int, default=10, help="Number of runs (default: 10)")
+    parser.add_argument("--top", type=int, default=10, help="Number of slowest imports to show")
+    parser.add_argument("--record", help="Append the result as a JSON line to this file")
+    parser.add_argument("cli_args", nargs="*", help="Extra arguments for inz_cond_cmd.py (e.g. -- -sq)")
+    args = parser.parse_args()
+
+    wall_times = []
+    import_times = []
+    modules = {}
+
+    for _ in range(args.runs):
+        wall_time, modules = run_once(args.cli_args)
+        wall_times.append(wall_time)
+        # Top level imports have depth 0, their cumulative times add up to the total
+        import_times.append(sum(cumulative for _, cumulative, depth in modules.values() if depth == 0))
+
+    result = {
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": sys.version.split()[0],
+        "runs": args.runs,
+        "wall_ms_median": statistics.median(wall_times) * 1000,
+        "wall_ms_min": min(wall_times) * 1000,
+        "import_ms_median": statistics.median(import_times) / 1000,
+        "modules": len(modules)
+    }
+
+    print(f"Wall time   median {result['wall_ms_median']:.1f} ms, min {result['wall_ms_min']:.1f} ms ({args.runs} runs)")
+    print(f"Import time median {result['import_ms_median']:.1f} ms, {result['modules']} modules")
+    print(f"\nSlowest imports (cumulative, last run):")
+
+    slowest = sorted(modules.items(), key=lambda item: item[1][1], reverse=True)
+    for name, (self_us, cumulative_us, depth) in slowest[:args.top]:
+        print(f"  {cumulative_us / 1000:8.2f} ms  {name}")
+
+    if args.record:
+        with open(args.record, "a", encoding="utf-8") as f:
+            f.write(json.dumps(result) + "\n")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Throughput of the batch decode path with a growing number of threads.
+
+Decodes and generates a synthetic dump serially, then with decode_batch on
+thread pools of increasing size (and a process pool for reference). Threads
+only scale on a free-threaded CPython (3.13t and later), the script reports
+whether the GIL is enabled.
+
+    python -m benchmarks.thread_benchmark
+    python -m benchmarks.thread_benchmark --entries 200000 --threads 1,2,4,8,16
+"""
+import os
+import sys
+import time
+import argparse
+
+from languages.code_emitter import ConditionEntry
+from languages.decode_stream import decode_batch
+
+SAMPLES = [
+    "AAAAAA8FNZjuS0cAAQAyBfZ9Sng=",
+    "AAAAADUFNZjuS0cAAQAyAAAABW41mO5LRwABADIAAAAKb481Kj1FQwACAAAAAAAyAAAATTIAAAABeA==",
+    "AAAAADsFNfujxRMAAgAAAAAAMgAAAAM1jXZm2AACAAAAAAAyAAAADDIAAAAAeI81Kj1FQwACAAAAAAAyAAAACQ==",
+    "AAAAAC8FNY12ZtgAAgAAAAAAMgAAAAwyAAAAAXg1jXZm2AACAAAAAAAyAAAADDIAAAAAeA==",
+]
+
+def gil_status():
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    if is_gil_enabled is None:
+        return "enabled (no free-threaded build)"
+    return "enabled" if is_gil_enabled() else "disabled"
+
+def run_serial(entries, targets):
+    start = time.perf_counter()
+    for key, data in entries:
+        ConditionEntry(data, key).emit_all(targets)
+    return time.perf_counter() - start
+
+def run_batch(entries, targets, executor, workers, chunk_size):
+    start = time.perf_counter()
+    count = 0
+    for result in decode_batch(entries, targets, executor, workers, chunk_size=chunk_size):
+        if not result.ok:
+            raise ValueError(f"Entry {result.key}: {result.error}")
+        count += 1
+    assert count == len(entries)
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch decode throughput by thread count")
+    parser.add_argument("--entries", type=int, default=50000, help="Number of entries to decode")
+    parser.add_argument("--threads", default="1,2,4,8", help="Comma separated thread counts")
+    parser.add_argument("--chunk-size", type=int, default=256, help="Entries per submitted chunk")
+    parser.add_argument("--targets", default="c,squirrel", help="Comma separated targets emitted for each entry")
+    parser.add_argument("--no-process", action="store_true", help="Skip the process pool reference run")
+    args = parser.parse_args()
+
+    entries = [(f"entry{i}", SAMPLES[i % len(SAMPLES)]) for i in range(args.entries)]
+    targets = args.targets.split(",")
+
+    print(f"Python {sys.version.split()[0]}, GIL {gil_status()}, {os.cpu_count()} CPUs")
+    serial = run_serial(entries, targets)
+    print(f"{'serial':<12} {serial:8.3f} s  {args.entries / serial:10.0f} entries/s")
+
+    for workers in (int(value) for value in args.threads.split(",")):
+        elapsed = run_batch(entries, targets, "thread", workers, args.chunk_size)
+        print(f"{f'threads={workers}':<12} {elapsed:8.3f} s  {args.entries / elapsed:10.0f} entries/s  x{serial / elapsed:.2f}")
+
+    if not args.no_process:
+        elapsed = run_batch(entries, targets, "process", os.cpu_count(), args.chunk_size)
+        print(f"{'processes':<12} {elapsed:8.3f} s  {args.entries / elapsed:10.0f} entries/s  x{serial / elapsed:.2f}")
+
+if __name__ == "__main__":
+    main()
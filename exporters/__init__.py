@@ -0,0 +1,3 @@
+from .ndjson_exporter import NdjsonExporter
+from .msgpack_exporter import MessagePackExporter
+from .sqlite_exporter import SqliteExporter
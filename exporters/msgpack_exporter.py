@@ -0,0 +1,42 @@
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+from level_5.condition.serializer import ConditionSerializer
+
+class MessagePackExporter:
+    """Streams decoded conditions as consecutive MessagePack records (requires msgpack)"""
+    
+    def __init__(self, path):
+        MessagePackExporter._check_available()
+        self.path = path
+        self._file = open(path, "wb")
+        self._packer = msgpack.Packer()
+    
+    def write(self, key, conditions):
+        record = ConditionSerializer.to_record(conditions, key)
+        self._file.write(self._packer.pack(record))
+    
+    def close(self):
+        self._file.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    @staticmethod
+    def load(path):
+        """Yields the (key, conditions) pairs stored in a MessagePack export"""
+        MessagePackExporter._check_available()
+        
+        with open(path, "rb") as f:
+            for record in msgpack.Unpacker(f, raw=False, strict_map_key=False):
+                yield ConditionSerializer.from_record(record)
+    
+    @staticmethod
+    def _check_available():
+        if msgpack is None:
+            raise ImportError("MessagePack export requires the msgpack package (pip install msgpack)")
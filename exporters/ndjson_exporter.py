@@ -0,0 +1,35 @@
+import json
+
+from level_5.condition.serializer import ConditionSerializer
+
+class NdjsonExporter:
+    """Streams decoded conditions as one JSON record per line"""
+    
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "w", encoding="utf-8")
+        self._encoder = json.JSONEncoder(separators=(",", ":"))
+    
+    def write(self, key, conditions):
+        record = ConditionSerializer.to_record(conditions, key)
+        self._file.write(self._encoder.encode(record))
+        self._file.write("\n")
+    
+    def close(self):
+        self._file.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    @staticmethod
+    def load(path):
+        """Yields the (key, conditions) pairs stored in an NDJSON export"""
+        decoder = json.JSONDecoder()
+        
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield ConditionSerializer.from_record(decoder.decode(line))
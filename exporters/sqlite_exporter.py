@@ -0,0 +1,224 @@
+import sqlite3
+
+from level_5.condition.logic import *
+
+class SqliteExporter:
+    """
+    Writes decoded conditions into a normalized SQLite database:
+    entries -> blocks -> conditions -> function_calls -> arguments.
+    Rows are buffered and inserted with executemany, indexes and views are
+    created once when the exporter is closed.
+
+    defer_indexes: indexes of an existing database are dropped when it is
+    opened and created again on close, so appending to it does not update
+    them row by row. Long running updates that delete entries keep them.
+    """
+
+    TABLES = [
+        """CREATE TABLE IF NOT EXISTS entries (
+            id INTEGER PRIMARY KEY,
+            key TEXT
+        )""",
+        """CREATE TABLE IF NOT EXISTS blocks (
+            id INTEGER PRIMARY KEY,
+            entry_id INTEGER NOT NULL,
+            block_index INTEGER NOT NULL
+        )""",
+        """CREATE TABLE IF NOT EXISTS conditions (
+            id INTEGER PRIMARY KEY,
+            block_id INTEGER NOT NULL,
+            entry_id INTEGER NOT NULL,
+            condition_index INTEGER NOT NULL,
+            comparator INTEGER NOT NULL,
+            comparator_name TEXT NOT NULL,
+            comparator_type TEXT,
+            left_value INTEGER,
+            right_value INTEGER,
+            offset INTEGER
+        )""",
+        """CREATE TABLE IF NOT EXISTS function_calls (
+            id INTEGER PRIMARY KEY,
+            condition_id INTEGER NOT NULL,
+            entry_id INTEGER NOT NULL,
+            side TEXT NOT NULL,
+            function_id INTEGER NOT NULL,
+            function_name TEXT NOT NULL,
+            offset INTEGER
+        )""",
+        """CREATE TABLE IF NOT EXISTS arguments (
+            id INTEGER PRIMARY KEY,
+            call_id INTEGER NOT NULL,
+            arg_index INTEGER NOT NULL,
+            symbol_type INTEGER NOT NULL,
+            value INTEGER NOT NULL,
+            offset INTEGER
+        )"""
+    ]
+
+    INDEXES = [
+        "CREATE INDEX IF NOT EXISTS idx_entries_key ON entries (key)",
+        "CREATE INDEX IF NOT EXISTS idx_blocks_entry ON blocks (entry_id)",
+        "CREATE INDEX IF NOT EXISTS idx_conditions_block ON conditions (block_id)",
+        "CREATE INDEX IF NOT EXISTS idx_conditions_entry ON conditions (entry_id)",
+        "CREATE INDEX IF NOT EXISTS idx_function_calls_condition ON function_calls (condition_id)",
+        "CREATE INDEX IF NOT EXISTS idx_function_calls_function ON function_calls (function_id)",
+        "CREATE INDEX IF NOT EXISTS idx_arguments_call ON arguments (call_id)",
+        "CREATE INDEX IF NOT EXISTS idx_arguments_value ON arguments (value)"
+    ]
+
+    # The constant compared against a call is the value on the other side of the condition
+    VIEWS = [
+        """CREATE VIEW IF NOT EXISTS function_usage AS
+            SELECT f.function_id, f.function_name, e.key, c.block_id, c.comparator_name,
+                   CASE f.side WHEN 'left' THEN c.right_value ELSE c.left_value END AS compared_value,
+                   a.value AS argument
+            FROM function_calls f
+            JOIN conditions c ON c.id = f.condition_id
+            JOIN entries e ON e.id = f.entry_id
+            LEFT JOIN arguments a ON a.call_id = f.id AND a.arg_index = 0""",
+        f"""CREATE VIEW IF NOT EXISTS flag_conditions AS
+            SELECT function_name, argument AS flag_id, key, block_id,
+                   (comparator_name = 'EQUAL' AND compared_value = 0) AS negated
+            FROM function_usage
+            WHERE function_id IN ({FunctionNameEnum.GET_GLOBAL_BIT_FLAG.value}, {FunctionNameEnum.GET_TEAM_BIT_FLAG.value})""",
+        f"""CREATE VIEW IF NOT EXISTS item_conditions AS
+            SELECT argument AS item_id, key, block_id,
+                   (comparator_name = 'EQUAL' AND compared_value = 0) AS negated
+            FROM function_usage
+            WHERE function_id = {FunctionNameEnum.IS_HAVE_ITEM.value}""",
+        f"""CREATE VIEW IF NOT EXISTS sub_phase_conditions AS
+            SELECT key, block_id, comparator_name, compared_value AS sub_phase
+            FROM function_usage
+            WHERE function_id = {FunctionNameEnum.GET_GAME_SUB_PHASE.value}"""
+    ]
+
+    def __init__(self, path, batch_size=10000, defer_indexes=True):
+        self.path = path
+        self.batch_size = batch_size
+        self.connection = sqlite3.connect(path)
+        # NORMAL only syncs at WAL checkpoints, an interrupted export cannot corrupt the database
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+
+        for statement in self.TABLES:
+            self.connection.execute(statement)
+
+        if defer_indexes:
+            with self.connection:
+                for name in self.index_names():
+                    self.connection.execute(f"DROP INDEX IF EXISTS {name}")
+
+        # Continue numbering after the rows of a previous export
+        self._next_ids = {}
+        for table in ("entries", "blocks", "conditions", "function_calls", "arguments"):
+            max_id = self.connection.execute(f"SELECT MAX(id) FROM {table}").fetchone()[0]
+            self._next_ids[table] = (max_id or 0) + 1
+
+        self._rows = {table: [] for table in self._next_ids}
+        self._pending_entries = 0
+
+    def write(self, key, conditions):
+        entry_id = self._add_row("entries", (key,))
+
+        for block_index, block in enumerate(conditions):
+            block_id = self._add_row("blocks", (entry_id, block_index))
+
+            for condition_index, condition in enumerate(block):
+                self._write_condition(entry_id, block_id, condition_index, condition)
+
+        self._pending_entries += 1
+        if self._pending_entries >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        placeholders = {
+            "entries": "(?, ?)",
+            "blocks": "(?, ?, ?)",
+            "conditions": "(?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            "function_calls": "(?, ?, ?, ?, ?, ?, ?)",
+            "arguments": "(?, ?, ?, ?, ?, ?)"
+        }
+
+        with self.connection:
+            for table, rows in self._rows.items():
+                if rows:
+                    self.connection.executemany(f"INSERT INTO {table} VALUES {placeholders[table]}", rows)
+                    rows.clear()
+
+        self._pending_entries = 0
+
+    def delete(self, keys):
+        """Removes the rows of entries written before, so that updated entries can be written again"""
+        self.flush()
+
+        with self.connection:
+            self.connection.execute("CREATE TEMP TABLE IF NOT EXISTS deleted_keys (key TEXT PRIMARY KEY)")
+            self.connection.execute("DELETE FROM deleted_keys")
+            self.connection.executemany("INSERT OR IGNORE INTO deleted_keys VALUES (?)", ((key,) for key in keys))
+
+            entry_ids = "SELECT id FROM entries WHERE key IN (SELECT key FROM deleted_keys)"
+            self.connection.execute(f"DELETE FROM arguments WHERE call_id IN "
+                                    f"(SELECT id FROM function_calls WHERE entry_id IN ({entry_ids}))")
+            for table in ("function_calls", "conditions", "blocks"):
+                self.connection.execute(f"DELETE FROM {table} WHERE entry_id IN ({entry_ids})")
+            self.connection.execute("DELETE FROM entries WHERE key IN (SELECT key FROM deleted_keys)")
+
+    @classmethod
+    def index_names(cls):
+        return [statement.split()[5] for statement in cls.INDEXES]
+
+    def create_indexes(self):
+        """Creates the indexes and views, done by close or earlier by long running updates"""
+        with self.connection:
+            for statement in self.INDEXES + self.VIEWS:
+                self.connection.execute(statement)
+
+    def close(self):
+        self.flush()
+        self.create_indexes()
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _write_condition(self, entry_id, block_id, condition_index, condition):
+        left = condition.operator_left
+        right = condition.operator_right
+
+        condition_id = self._add_row("conditions", (
+            block_id,
+            entry_id,
+            condition_index,
+            condition.comparator.value,
+            condition.comparator.name,
+            condition.comparator_type,
+            left.value if isinstance(left, Level5Variable) else None,
+            right.value if isinstance(right, Level5Variable) else None,
+            condition.offset
+        ))
+
+        for side, operand in (("left", left), ("right", right)):
+            if isinstance(operand, Level5Function):
+                self._write_function_call(entry_id, condition_id, side, operand)
+
+    def _write_function_call(self, entry_id, condition_id, side, function):
+        call_id = self._add_row("function_calls", (
+            condition_id,
+            entry_id,
+            side,
+            function.function_id,
+            function.signature.name,
+            function.offset
+        ))
+
+        for arg_index, arg in enumerate(function.args):
+            self._add_row("arguments", (call_id, arg_index, arg.lifetime.value, arg.value, arg.offset))
+
+    def _add_row(self, table, values):
+        row_id = self._next_ids[table]
+        self._next_ids[table] += 1
+        self._rows[table].append((row_id,) + values)
+        return row_id
@@ -0,0 +1,3 @@
+from .conversion_worker import ConversionSignals, ConversionWorker
+from .dump_table_model import DumpTableModel
+from .dump_browser import DumpBrowser
@@ -0,0 +1,70 @@
+import time
+
+from PyQt6.QtCore import QObject, QRunnable, pyqtSignal
+
+class ConversionSignals(QObject):
+    """Signals of a ConversionWorker, delivered on the GUI thread"""
+    
+    # List of (index, code, error) tuples, sent in chunks to keep the GUI thread free
+    results = pyqtSignal(int, list)
+    progress = pyqtSignal(int, int, int)
+    finished = pyqtSignal(int, bool)
+
+class ConversionWorker(QRunnable):
+    """
+    Decodes and generates the code of a list of (ConditionEntry, lock) on a
+    thread pool. Results are streamed back in chunks through signals, and the
+    conversion stops at the next entry once cancel() is called.
+
+    Entries are shared with the jobs started after a cancel, each one is
+    converted under its lock: a new job waits on its own thread for the entry
+    a cancelled job is still converting.
+    """
+    
+    CHUNK_INTERVAL = 0.1
+    
+    def __init__(self, job_id, entries, target):
+        super().__init__()
+        self.job_id = job_id
+        self.entries = entries
+        self.target = target
+        self.signals = ConversionSignals()
+        self._cancelled = False
+    
+    def cancel(self):
+        self._cancelled = True
+    
+    @property
+    def cancelled(self):
+        return self._cancelled
+    
+    def run(self):
+        chunk = []
+        last_sent = time.monotonic()
+        total = len(self.entries)
+        
+        for index, (entry, lock) in enumerate(self.entries):
+            if self._cancelled:
+                break
+            
+            try:
+                with lock:
+                    code = entry.emit(self.target)
+                chunk.append((index, code, None))
+            except Exception as e:
+                chunk.append((index, None, str(e)))
+            
+            now = time.monotonic()
+            if now - last_sent >= self.CHUNK_INTERVAL:
+                self._send(chunk, index + 1, total)
+                chunk = []
+                last_sent = now
+        
+        if chunk:
+            self._send(chunk, chunk[-1][0] + 1, total)
+        
+        self.signals.finished.emit(self.job_id, self._cancelled)
+    
+    def _send(self, chunk, done, total):
+        self.signals.results.emit(self.job_id, chunk)
+        self.signals.progress.emit(self.job_id, done, total)
@@ -0,0 +1,114 @@
+from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
+                             QTextEdit, QLabel, QTableView, QSplitter, QComboBox,
+                             QHeaderView, QAbstractItemView, QFileDialog, QMessageBox)
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QFont
+
+from languages.registry import LanguageRegistry
+from gui.dump_table_model import DumpTableModel
+
+class DumpBrowser(QMainWindow):
+    """Browses a whole condition dump, with the generated code of the selected entry"""
+
+    LANGUAGES = {"C": "c", "Squirrel": "squirrel"}
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.model = DumpTableModel(parent=self)
+        self.highlighter = None
+        self.init_ui()
+
+    def init_ui(self):
+        self.setWindowTitle("Inazuma Condition Parser - Dump Browser")
+        self.setGeometry(120, 120, 1400, 800)
+
+        central_widget = QWidget()
+        self.setCentralWidget(central_widget)
+        main_layout = QVBoxLayout(central_widget)
+
+        # --- Top bar ---
+        top_bar = QHBoxLayout()
+        self.open_button = QPushButton("Open Dump...")
+        self.open_button.clicked.connect(self.open_dump)
+
+        self.count_label = QLabel("No dump loaded")
+        self.count_label.setStyleSheet("font-size: 14px; font-weight: bold;")
+
+        self.language_combo = QComboBox()
+        self.language_combo.addItems(list(self.LANGUAGES))
+        self.language_combo.currentTextChanged.connect(self.change_language)
+
+        top_bar.addWidget(self.count_label)
+        top_bar.addStretch()
+        top_bar.addWidget(self.language_combo)
+        top_bar.addWidget(self.open_button)
+        main_layout.addLayout(top_bar)
+
+        # --- Content area ---
+        splitter = QSplitter(Qt.Orientation.Horizontal)
+
+        self.table_view = QTableView()
+        self.table_view.setModel(self.model)
+        self.table_view.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table_view.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.table_view.setWordWrap(False)
+        # Fixed row heights let the view skip measuring rows that are not visible
+        self.table_view.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.table_view.verticalHeader().setDefaultSectionSize(22)
+        self.table_view.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+        self.table_view.horizontalHeader().setStretchLastSection(True)
+        self.table_view.selectionModel().currentRowChanged.connect(self.show_current)
+        splitter.addWidget(self.table_view)
+
+        self.code_text = QTextEdit()
+        self.code_text.setReadOnly(True)
+        self.code_text.setFont(QFont("Courier New", 10))
+        self.code_text.setStyleSheet("""
+            QTextEdit {
+                background-color: #1E1E1E;
+                color: #D4D4D4;
+                border: 1px solid #3E3E3E;
+                border-radius: 4px;
+            }
+        """)
+        self.code_text.setPlaceholderText("Select an entry to show its code...")
+        splitter.addWidget(self.code_text)
+        splitter.setSizes([800, 600])
+
+        main_layout.addWidget(splitter)
+        self.change_language(self.language_combo.currentText())
+
+    def open_dump(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Open Condition Dump", "", "Text files (*.txt *.tsv);;All files (*)")
+        if path:
+            self.load_dump(path)
+
+    def load_dump(self, path):
+        try:
+            self.model.load(path)
+        except Exception as e:
+            QMessageBox.critical(self, "Open Failed", f"Failed to load the dump:\n{str(e)}")
+            return
+
+        self.count_label.setText(f"{self.model.rowCount()} entries")
+        self.code_text.clear()
+
+    def change_language(self, language):
+        if self.highlighter:
+            self.highlighter.setDocument(None)
+
+        target = self.LANGUAGES[language]
+        self.highlighter = LanguageRegistry.get(target).highlighter_class()(self.code_text.document())
+        self.show_current(self.table_view.currentIndex())
+
+    def show_current(self, current, previous=None):
+        if not current.isValid():
+            return
+
+        row = self.model.row(current.row())
+        if row.error is not None:
+            self.code_text.setPlainText(f"// Entry {row.entry.key}: {row.error}")
+            return
+
+        target = self.LANGUAGES[self.language_combo.currentText()]
+        self.code_text.setPlainText(row.entry.emit(target))
@@ -0,0 +1,98 @@
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex
+
+from tools.lru_cache import LRUCache
+from languages.code_emitter import ConditionEntry
+from level_5.condition.dump import read_dump
+from level_5.condition.summary import ConditionSummary
+
+class DumpRow:
+    """Decoded state of a dump row, kept in the model cache"""
+
+    def __init__(self, entry, summary=None, error=None):
+        self.entry = entry
+        self.summary = summary
+        self.error = error
+
+class DumpTableModel(QAbstractTableModel):
+    """
+    Table over a whole condition dump. Only keys and Base64 strings are kept
+    for every row, rows are decoded when the view asks for them and the most
+    recently used decoded rows are kept in a bounded cache.
+    """
+
+    COLUMNS = ("Key", "Blocks", "Functions", "Flags", "Team flags", "Items", "Sub-phase")
+
+    def __init__(self, cache_size=4096, parent=None):
+        super().__init__(parent)
+        self.keys = []
+        self.data_strings = []
+        self.cache = LRUCache(cache_size)
+
+    def load(self, path):
+        self.beginResetModel()
+        self.keys = []
+        self.data_strings = []
+        self.cache.clear()
+
+        for key, data in read_dump(path):
+            self.keys.append(key)
+            self.data_strings.append(data)
+
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.keys)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.COLUMNS[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or role not in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.ToolTipRole):
+            return None
+
+        column = index.column()
+        if column == 0:
+            return self.keys[index.row()]
+
+        row = self.row(index.row())
+        if row.error is not None:
+            return f"Error: {row.error}" if column == 1 else None
+
+        summary = row.summary
+        if column == 1:
+            return str(summary.block_count)
+        elif column == 2:
+            return ", ".join(sorted(summary.functions))
+        elif column == 3:
+            return ", ".join(str(flag) for flag in sorted(summary.flags))
+        elif column == 4:
+            return ", ".join(str(flag) for flag in sorted(summary.team_flags))
+        elif column == 5:
+            return ", ".join(str(item) for item in sorted(summary.items))
+        elif column == 6:
+            sub_phase_range = summary.sub_phase_range
+            if sub_phase_range is None:
+                return ""
+            low, high = sub_phase_range
+            return str(low) if low == high else f"{low} - {high}"
+
+        return None
+
+    def row(self, row_index):
+        """Returns the decoded DumpRow of a row, decoding it on first access"""
+        row = self.cache.get(row_index)
+
+        if row is None:
+            entry = ConditionEntry(self.data_strings[row_index], self.keys[row_index])
+            try:
+                row = DumpRow(entry, ConditionSummary.from_conditions(entry.conditions))
+            except Exception as e:
+                row = DumpRow(entry, error=str(e))
+            self.cache.put(row_index, row)
+
+        return row
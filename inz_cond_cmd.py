@@ -1,38 +1,438 @@
+import os
+import sys
+import json
+import time
 import argparse
 
+from level_5.condition.dump import read_dump
 from level_5.condition.decoder import Level5ConditionDecoder
-from languages.c_language.c_codegenerator import CCodeGenerator
-from languages.squirrel_language.squirrel_codegenerator import SquirrelCodeGenerator
-from languages.transformers.code_transformer import CodeTransformer
+from languages.code_emitter import CodeEmitter, ConditionEntry
+from level_5.condition.diagnostics import DiagnosticSummary
+from level_5.condition.canonical import ConditionGroups
+
+def select_targets(args):
+    if args.targets:
+        return CodeEmitter.parse_targets(args.targets)
+
+    # Generator selection
+    if args.squirrel:
+        return ["squirrel"]
+
+    return ["c"]
+
+def print_entry(entry, targets):
+    for target in targets:
+        code = entry.emit(target)
+
+        if len(targets) == 1:
+            print("\nGenerated Code:\n")
+        else:
+            print(f"\nGenerated Code ({target}):\n")
+        print(code)
+
+def write_entry(entry, targets, output_dir, name=None):
+    for target in targets:
+        path = os.path.join(output_dir, CodeEmitter.file_name(name or entry.key, target))
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(entry.emit(target))
+
+def archive_entry(entry, targets, archive, name=None):
+    for target in targets:
+        archive.write(CodeEmitter.file_name(name or entry.key, target), entry.emit(target))
+
+def print_groups(groups, first_entries, targets, args, archive=None):
+    if archive:
+        archive.write("dedup.json", json.dumps(groups.to_dict(), indent=4))
+    elif args.output:
+        with open(os.path.join(args.output, "dedup.json"), "w", encoding="utf-8") as f:
+            json.dump(groups.to_dict(), f, indent=4)
+    elif args.export:
+        print(json.dumps(groups.to_dict(), indent=4))
+    else:
+        for group in groups:
+            print(f"\n// Condition {group.structure_hash}: entries {', '.join(str(key) for key in group.keys)}")
+            print_entry(first_entries[group.structure_hash], targets)
+
+    print(f"{len(groups)} unique conditions in {groups.entry_count} entries", file=sys.stderr)
+
+def read_source(args):
+    """(key, base64) pairs of the input dump, or of the condition fields of the cfg.bin tables"""
+    if args.cfg_bin:
+        from level_5.cfg_bin.conditions import read_cfg_bin_conditions
+        return read_cfg_bin_conditions(args.cfg_bin, args.encoding)
+
+    return read_dump(args.input)
+
+def read_entries(args, targets):
+    """Decoded entries of the input, decoded by a thread pool with --jobs"""
+    dump = read_source(args)
+
+    if not args.jobs or args.jobs <= 1:
+        decoder = Level5ConditionDecoder(tolerant=args.tolerant)
+        for key, encoded in dump:
+            entry = ConditionEntry(encoded, key, args.tolerant, decoder=decoder)
+            entry.error
+            yield entry
+        return
+
+    from languages.decode_stream import decode_batch
+
+    # Deduplicated entries are only generated once per group, after grouping
+    emitted = [] if args.dedup else targets
+    for result in decode_batch(dump, emitted, max_workers=args.jobs, tolerant=args.tolerant):
+        # Tolerant entries that could not be decoded keep their entry, with its error
+        if result.entry is None:
+            raise ValueError(f"Entry {result.key}: {result.error}")
+        yield result.entry
+
+def format_error(diagnostic):
+    return f"{diagnostic.reason}: {diagnostic.message}"
+
+def format_finding(key, finding):
+    location = []
+    if finding.block_index is not None:
+        location.append(f"block {finding.block_index}")
+    if finding.condition_index is not None:
+        location.append(f"condition {finding.condition_index}")
+    where = f" ({', '.join(location)})" if location else ""
+    return f"{key}: {finding.kind}{where}: {finding.message}"
+
+def run_analysis(args):
+    """Reports contradictions, dead blocks and always-true entries instead of generating code"""
+    from level_5.condition.analyzer import ConditionAnalyzer, analyze_dump
+
+    if args.data:
+        entry = ConditionEntry(args.data, tolerant=args.tolerant)
+        if entry.error is not None:
+            print(f"entry: error: {format_error(entry.error)}")
+            return
+        for finding in ConditionAnalyzer().analyze(entry.conditions):
+            print(format_finding("entry", finding))
+        return
+
+    counts = {}
+    entry_count = 0
+    errors = 0
+
+    # The analysis holds the GIL, --jobs runs it on processes
+    executor = "process" if args.jobs and args.jobs > 1 else "thread"
+    max_workers = args.jobs if executor == "process" else 1
+
+    for analysis in analyze_dump(read_source(args), executor, max_workers, tolerant=args.tolerant):
+        entry_count += 1
+
+        if analysis.error is not None:
+            errors += 1
+            print(f"{analysis.key}: error: {analysis.error}")
+            continue
+
+        for finding in analysis.findings:
+            counts[finding.kind] = counts.get(finding.kind, 0) + 1
+            print(format_finding(analysis.key, finding))
+
+    print(f"{entry_count} entries analyzed, {errors} could not be decoded", file=sys.stderr)
+    for kind, count in sorted(counts.items(), key=lambda item: item[1], reverse=True):
+        print(f"  {kind}: {count}", file=sys.stderr)
+
+def run_diff(args):
+    from level_5.condition.dump_diff import DumpDiff
+
+    diff = DumpDiff.compare(*args.diff)
+    if args.json:
+        print(json.dumps(diff.to_dict(), indent=4))
+    else:
+        print(diff.format())
+
+def run_stats(args):
+    """Counts opcodes, functions, comparators and operand values of the whole dump in one pass"""
+    from level_5.condition.opcode_stats import OpcodeStatistics
+
+    if args.input:
+        statistics = OpcodeStatistics.from_dump(args.input)
+    elif args.cfg_bin:
+        from tools.chunk_executor import iter_chunks
+
+        statistics = OpcodeStatistics()
+        for chunk in iter_chunks(read_source(args), 65536):
+            statistics.add_entries([(key, data) for _, key, data in chunk])
+    else:
+        sys.exit("--stats needs a dump file (-i) or cfg.bin tables (--cfg-bin)")
+    if args.json:
+        print(json.dumps(statistics.to_dict(), indent=4))
+    else:
+        print(statistics.format())
+
+def run_encode(args):
+    """Encodes C or Squirrel files back to Base64, as dump lines keyed by entry or file name"""
+    from languages.code_parser import parse_entries
+    from level_5.condition.encoder import Level5ConditionEncoder
+
+    for path in args.encode:
+        with open(path, "r", encoding="utf-8") as f:
+            text = f.read()
+
+        try:
+            entries = [(key, Level5ConditionEncoder.to_base64(conditions)) for key, conditions in parse_entries(text)]
+        except ValueError as e:
+            sys.exit(f"{path}: {e}")
+
+        if len(args.encode) == 1 and len(entries) == 1 and entries[0][0] is None:
+            print(entries[0][1])
+            continue
+
+        name = os.path.splitext(os.path.basename(path))[0]
+        for key, encoded in entries:
+            print(f"{name if key is None else key}\t{encoded}")
+
+def run_disassembly(args):
+    """Streams the annotated listing of every entry, see level_5.condition.disassembler"""
+    from level_5.condition.disassembler import Level5ConditionDisassembler
+
+    disassembler = Level5ConditionDisassembler()
+    entries = [("entry", args.data)] if args.data else read_source(args)
+
+    for key, encoded in entries:
+        print(f"// Entry {key}")
+        for line in disassembler.disassemble(encoded):
+            print(line.format())
+        print()
+
+def run_graph(args):
+    """Entries unlocked and locked by setting flags, items or the sub-phase from a starting state"""
+    from level_5.condition.flag_graph import DependencyGraph, parse_atom, format_atom
+
+    if not args.input and not args.cfg_bin:
+        sys.exit("--graph needs a dump file (-i) or cfg.bin tables (--cfg-bin)")
+
+    try:
+        state_atoms = [parse_atom(atom) for atom in args.state.split(",")] if args.state else []
+        unlock_atoms = [parse_atom(atom) for atom in args.unlock.split(",")] if args.unlock else []
+        depends_atoms = [parse_atom(atom) for atom in args.depends.split(",")] if args.depends else []
+    except ValueError as e:
+        sys.exit(str(e))
+
+    graph = DependencyGraph.from_source(read_source(args), tolerant=args.tolerant)
+    state = graph.evaluate(state_atoms)
+    report = {"active": state.active_keys(), "unlock": {}, "depends": {}}
+
+    for atom in unlock_atoms:
+        report["unlock"][format_atom(atom)] = state.what_if(atom).to_dict()
+
+    for atom in depends_atoms:
+        report["depends"][format_atom(atom)] = graph.dependents(atom)
+
+    print(f"{len(graph.keys)} entries, {graph.block_count} blocks ({graph.opaque_blocks} not evaluable, "
+          f"{graph.dead_blocks} never true dropped), {len(report['active'])} active", file=sys.stderr)
+
+    if args.json:
+        print(json.dumps(report, indent=4))
+        return
+
+    if not unlock_atoms and not depends_atoms:
+        for key in report["active"]:
+            print(key)
+
+    for atom, change in report["unlock"].items():
+        print(f"{atom}: {len(change['unlocked'])} unlocked, {len(change['locked'])} locked")
+        for key in change["unlocked"]:
+            print(f"  + {key}")
+        for key in change["locked"]:
+            print(f"  - {key}")
+
+    for atom, keys in report["depends"].items():
+        print(f"{atom}: {len(keys)} dependent entries")
+        for key in keys:
+            print(f"  {key}")
+
+def run_watch(args, targets):
+    from languages.watch_builder import WatchBuilder
+
+    if not args.output and not args.export:
+        sys.exit("--watch needs an output directory (-o) or an SQLite export (-x)")
+
+    exporter = None
+    if args.export:
+        # Deletes of an existing database need its indexes from the first cycle
+        exporter = open_exporter(args.export, defer_indexes=False)
+        if not hasattr(exporter, "delete"):
+            exporter.close()
+            sys.exit("--watch can only keep an SQLite export (.db, .sqlite) up to date")
+
+    builder = WatchBuilder(args.watch, targets, args.output, exporter, args.tolerant)
+    cycle = 0
+
+    try:
+        while True:
+            stats = builder.run_cycle()
+            cycle += 1
+
+            if stats.changes or stats.changes.touched or cycle == 1:
+                print(f"Cycle {cycle}: {stats.format()}", file=sys.stderr)
+                for error in stats.errors:
+                    print(f"  {error}", file=sys.stderr)
+
+            if exporter and cycle == 1:
+                # Indexes make the deletes of the following cycles cheap
+                exporter.create_indexes()
+
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if exporter:
+            exporter.close()
+
+def open_exporter(path, defer_indexes=True):
+    # Exporters are imported on demand to keep the start of the CLI fast
+    if path.lower().endswith((".msgpack", ".mpk")):
+        from exporters.msgpack_exporter import MessagePackExporter
+        return MessagePackExporter(path)
+    if path.lower().endswith((".db", ".sqlite", ".sqlite3")):
+        from exporters.sqlite_exporter import SqliteExporter
+        return SqliteExporter(path, defer_indexes=defer_indexes)
+    from exporters.ndjson_exporter import NdjsonExporter
+    return NdjsonExporter(path)
 
 def main():
     parser = argparse.ArgumentParser(description="Inazuma Condition Parser")
-    parser.add_argument("-d", "--data", required=True, help="Base64 encoded condition file")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("-d", "--data", help="Base64 encoded condition file")
+    source.add_argument("-i", "--input", help="Dump file with one Base64 condition per line, optionally preceded by a key")
+    source.add_argument("--cfg-bin", nargs="+", metavar="PATH", help="Decode the condition fields of cfg.bin tables (files or directories), without an intermediate dump")
+    source.add_argument("--watch", metavar="DIR", help="Poll a directory of dumps and keep the outputs (-o) or the SQLite export (-x) up to date")
+    source.add_argument("-e", "--encode", nargs="+", metavar="PATH", help="Encode C or Squirrel condition code files back to Base64 (one dump line per entry)")
+    source.add_argument("--diff", nargs=2, metavar=("OLD", "NEW"), help="Compare two dumps, decoding only the entries whose bytes changed")
     parser.add_argument("-sq", "--squirrel", action="store_true", help="Generate Squirrel code instead of C")
     parser.add_argument("-c", "--c", action="store_true", help="Force C code generation (default)")
+    parser.add_argument("-t", "--targets", help=f"Comma separated targets emitted from a single decode ({', '.join(CodeEmitter.targets())})")
+    parser.add_argument("-o", "--output", help="Directory where batch outputs are written, one file per entry and target")
+    parser.add_argument("-a", "--archive", help="Write the batch outputs into one archive instead of one file per entry (.zip, .tar, .tar.gz, .tgz, .tar.xz or an indexed .pack)")
+    parser.add_argument("--compress", action="store_true", help="Compress the members of the --archive (deflate for .zip and .pack, gzip for .tar)")
+    parser.add_argument("-x", "--export", help="Export the decoded conditions to an NDJSON file, MessagePack (.msgpack) or an SQLite database (.db, .sqlite)")
+    parser.add_argument("--tolerant", action="store_true", help="Keep decoding after errors, report diagnostics and a summary on stderr")
+    parser.add_argument("-j", "--jobs", type=int, help="Decode the batch on a pool of this many threads (scales on free-threaded Python), --analyze uses this many processes")
+    parser.add_argument("--dedup", action="store_true", help="Emit and export each unique condition once, with the list of entries sharing it")
+    parser.add_argument("--encoding", default="utf-8", help="Encoding of the strings of --cfg-bin tables (utf-8 or shift_jis)")
+    parser.add_argument("--interval", type=float, default=1.0, help="Seconds between two scans of --watch")
+    parser.add_argument("--json", action="store_true", help="Print the --diff, --stats or --graph report as JSON")
+    parser.add_argument("--analyze", action="store_true", help="Report contradictions, dead blocks, redundant conditions and always-true entries instead of generating code")
+    parser.add_argument("--stats", action="store_true", help="Report opcode, function, comparator and operand value counts of the dump, with examples of rare and unknown opcodes (requires numpy)")
+    parser.add_argument("--disasm", action="store_true", help="Print an annotated listing of the bytes of each entry (offsets, opcodes, operands, padding) instead of generating code")
+    parser.add_argument("--graph", action="store_true", help="Build the flag, item and sub-phase dependency graph of the entries and print the active ones, see --state, --unlock and --depends")
+    parser.add_argument("--state", metavar="ATOMS", help="Comma separated starting state of --graph (flag:N, team:N, item:N, phase:N)")
+    parser.add_argument("--unlock", metavar="ATOMS", help="With --graph, list the entries unlocked and locked by setting each of these atoms from the starting state")
+    parser.add_argument("--depends", metavar="ATOMS", help="With --graph, list the entries depending on each of these atoms")
     args = parser.parse_args()
-    
-    encoded = args.data
-    
-    # Decoding the conditions
-    conditions = Level5ConditionDecoder.from_base64(encoded)
-    print("\nDecoded Conditions:", conditions)
-    
-    # Generator selection
-    if args.squirrel:
-        generator = SquirrelCodeGenerator(conditions)
-    else:
-        generator = CCodeGenerator(conditions)
-    
-    # Code generation
-    code = generator.generate()
-    
-    # Beautify the generated code
-    transformer = CodeTransformer(code)
-    code = transformer.beautify()
-    
-    print("\nGenerated Code:\n")
-    print(code)
+
+    if args.diff:
+        run_diff(args)
+        return
+
+    if args.encode:
+        run_encode(args)
+        return
+
+    if args.analyze:
+        run_analysis(args)
+        return
+
+    if args.stats:
+        run_stats(args)
+        return
+
+    if args.graph:
+        run_graph(args)
+        return
+
+    if args.disasm:
+        run_disassembly(args)
+        return
+
+    if args.archive and args.data:
+        parser.error("-a/--archive writes batch outputs, use it with -i or --cfg-bin instead of -d")
+
+    targets = select_targets(args)
+
+    if args.watch:
+        run_watch(args, targets)
+        return
+    exporter = open_exporter(args.export) if args.export else None
+    archive = None
+
+    try:
+        if args.archive:
+            from languages.code_archive import open_archive_writer
+            archive = open_archive_writer(args.archive, args.compress)
+
+        if args.data:
+            # Decoding the conditions
+            entry = ConditionEntry(args.data, tolerant=args.tolerant)
+            if entry.error is not None:
+                sys.exit(f"Entry could not be decoded: {format_error(entry.error)}")
+            print("\nDecoded Conditions:", entry.conditions)
+            for diagnostic in entry.diagnostics:
+                print(f"Diagnostic: {diagnostic}", file=sys.stderr)
+            print_entry(entry, targets)
+
+            if exporter:
+                exporter.write(None, entry.conditions)
+            return
+
+        if args.output:
+            os.makedirs(args.output, exist_ok=True)
+
+        summary = DiagnosticSummary()
+        groups = ConditionGroups() if args.dedup else None
+        first_entries = {}
+
+        for entry in read_entries(args, targets):
+            key = entry.key
+            summary.add(key, entry.diagnostics)
+
+            # Nothing is written for an entry that could not be decoded, no blocks would mean always true
+            if entry.error is not None:
+                if args.output or archive or exporter:
+                    print(f"Entry {key}: {format_error(entry.error)}", file=sys.stderr)
+                else:
+                    print(f"\n// Entry {key}: {format_error(entry.error)}")
+                continue
+
+            if groups is not None:
+                group, is_new = groups.add(key, entry.conditions, entry.structure_hash)
+                if not is_new:
+                    continue
+
+                # The first entry of a group stands for it, outputs are named after the hash
+                first_entries[group.structure_hash] = entry
+                if exporter:
+                    exporter.write(group.structure_hash, entry.conditions)
+                if archive:
+                    archive_entry(entry, targets, archive, group.structure_hash)
+                elif args.output:
+                    write_entry(entry, targets, args.output, group.structure_hash)
+                continue
+
+            if exporter:
+                exporter.write(key, entry.conditions)
+
+            if archive:
+                archive_entry(entry, targets, archive)
+            elif args.output:
+                write_entry(entry, targets, args.output)
+            elif not exporter:
+                print(f"\n// Entry {key}")
+                print_entry(entry, targets)
+
+        if groups is not None:
+            print_groups(groups, first_entries, targets, args, archive)
+
+        if args.tolerant:
+            print(summary.format(), file=sys.stderr)
+    finally:
+        if exporter:
+            exporter.close()
+        if archive:
+            archive.close()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -2,26 +2,40 @@ import re
 import os
 import sys
 import base64
+import threading
 
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                               QHBoxLayout, QPushButton, QTextEdit, QLabel,
-                              QMessageBox)
-from PyQt6.QtCore import Qt
+                              QMessageBox, QProgressBar, QCheckBox)
+from PyQt6.QtCore import Qt, QThreadPool, QTimer
 from PyQt6.QtGui import QFont, QSyntaxHighlighter, QTextCharFormat, QColor
 
-from level_5.condition.decoder import Level5ConditionDecoder
-from languages.c_language.c_codegenerator import CCodeGenerator
-from languages.c_language.c_syntaxhighlighter import CSyntaxHighlighter
-from languages.squirrel_language.squirrel_codegenerator import SquirrelCodeGenerator
-from languages.squirrel_language.squirrel_syntaxhighlighter import SquirrelSyntaxHighlighter
-from languages.transformers.code_transformer import CodeTransformer
+from languages.code_emitter import ConditionEntry
+from languages.registry import LanguageRegistry
+from tools.lru_cache import LRUCache
+from level_5.condition.dump import split_conditions
+from gui.conversion_worker import ConversionWorker
+from gui.dump_browser import DumpBrowser
 
 class Level5ConditionGUI(QMainWindow):
+    LIVE_DECODE_DELAY = 300
+    
     def __init__(self):
         super().__init__()
         self.current_language = "C"
         self.c_highlighter = None
         self.squirrel_highlighter = None
+        self.current_entries = []
+        self.current_source = None
+        self.thread_pool = QThreadPool.globalInstance()
+        self.current_worker = None
+        self.job_id = 0
+        self.job_entries = []
+        self.job_results = []
+        self.dump_browser = None
+        self.job_live = False
+        # (entry, lock) of the entries already seen, with their decoded conditions and generated code
+        self.entry_cache = LRUCache(4096)
         self.init_ui()
     
     def init_ui(self):
@@ -55,8 +69,18 @@ class Level5ConditionGUI(QMainWindow):
         language_label.setStyleSheet("font-size: 14px; font-weight: bold;")
         self.language_label = language_label
         
+        self.dump_button = QPushButton("Open Dump Browser")
+        self.dump_button.setStyleSheet(self.language_button.styleSheet())
+        self.dump_button.clicked.connect(self.open_dump_browser)
+        
+        self.live_checkbox = QCheckBox("Live Decode")
+        self.live_checkbox.setStyleSheet("font-size: 14px;")
+        self.live_checkbox.toggled.connect(self.on_base64_changed)
+        
         top_bar.addWidget(language_label)
         top_bar.addStretch()
+        top_bar.addWidget(self.live_checkbox)
+        top_bar.addWidget(self.dump_button)
         top_bar.addWidget(self.language_button)
         main_layout.addLayout(top_bar)
         
@@ -80,7 +104,7 @@ class Level5ConditionGUI(QMainWindow):
         """)
         self.code_text.setPlaceholderText("Generated code will appear here...")
         left_container.addWidget(self.code_text)
-        self.c_highlighter = CSyntaxHighlighter(self.code_text.document())
+        self.c_highlighter = self.create_highlighter("c")
         
         middle_container = QVBoxLayout()
         middle_container.addStretch()
@@ -108,7 +132,7 @@ class Level5ConditionGUI(QMainWindow):
         self.convert_to_base64_button = QPushButton("Convert to Base64 →")
         self.convert_to_base64_button.setStyleSheet("""
             QPushButton {
-                background-color: #6C757D;
+                background-color: #0078D4;
                 color: white;
                 border: none;
                 padding: 12px 24px;
@@ -117,12 +141,10 @@ class Level5ConditionGUI(QMainWindow):
                 border-radius: 4px;
                 min-width: 180px;
             }
-            QPushButton:disabled {
-                background-color: #495057;
-                color: #ADB5BD;
+            QPushButton:hover {
+                background-color: #106EBE;
             }
         """)
-        self.convert_to_base64_button.setEnabled(False)
         self.convert_to_base64_button.clicked.connect(self.convert_to_base64)
         middle_container.addWidget(self.convert_to_base64_button)
 
@@ -146,6 +168,28 @@ class Level5ConditionGUI(QMainWindow):
         self.clear_button.clicked.connect(self.clear_texts)
         middle_container.addWidget(self.clear_button)
 
+        middle_container.addSpacing(20)
+        self.cancel_button = QPushButton("Cancel")
+        self.cancel_button.setStyleSheet("""
+            QPushButton {
+                background-color: #6C757D;
+                color: white;
+                border: none;
+                padding: 12px 24px;
+                font-size: 14px;
+                font-weight: bold;
+                border-radius: 4px;
+                min-width: 180px;
+            }
+            QPushButton:disabled {
+                background-color: #495057;
+                color: #ADB5BD;
+            }
+        """)
+        self.cancel_button.setEnabled(False)
+        self.cancel_button.clicked.connect(self.cancel_conversion)
+        middle_container.addWidget(self.cancel_button)
+
         middle_container.addStretch()
         
         right_container = QVBoxLayout()
@@ -164,17 +208,46 @@ class Level5ConditionGUI(QMainWindow):
             }
         """)
         self.base64_text.setPlaceholderText("Paste Base64 encoded condition here...")
+        self.base64_text.textChanged.connect(self.on_base64_changed)
         right_container.addWidget(self.base64_text)
         
+        # Live decoding waits until the text has not changed for a short delay
+        self.live_timer = QTimer(self)
+        self.live_timer.setSingleShot(True)
+        self.live_timer.setInterval(self.LIVE_DECODE_DELAY)
+        self.live_timer.timeout.connect(self.live_convert)
+        
         content_layout.addLayout(left_container, 2)
         content_layout.addLayout(middle_container, 0)
         content_layout.addLayout(right_container, 2)
         main_layout.addLayout(content_layout)
+        
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setVisible(False)
+        main_layout.addWidget(self.progress_bar)
+        
+        self.status_label = QLabel("")
+        self.status_label.setStyleSheet("color: #DC3545;")
+        main_layout.addWidget(self.status_label)
     
     def clear_texts(self):
         """Clear both text containers"""
+        self.cancel_conversion()
         self.code_text.clear()
         self.base64_text.clear()
+        self.status_label.setText("")
+        self.current_entries = []
+        self.current_source = None
+    
+    def open_dump_browser(self):
+        if self.dump_browser is None:
+            self.dump_browser = DumpBrowser()
+        self.dump_browser.show()
+        self.dump_browser.raise_()
+    
+    def create_highlighter(self, language):
+        highlighter_class = LanguageRegistry.get(language).highlighter_class()
+        return highlighter_class(self.code_text.document())
     
     def toggle_language(self):
         if self.current_language == "C":
@@ -182,47 +255,192 @@ class Level5ConditionGUI(QMainWindow):
             self.language_button.setText("Switch to C")
             if self.c_highlighter:
                 self.c_highlighter.setDocument(None)
-            self.squirrel_highlighter = SquirrelSyntaxHighlighter(self.code_text.document())
+            self.squirrel_highlighter = self.create_highlighter("squirrel")
         else:
             self.current_language = "C"
             self.language_button.setText("Switch to Squirrel")
             if self.squirrel_highlighter:
                 self.squirrel_highlighter.setDocument(None)
-            self.c_highlighter = CSyntaxHighlighter(self.code_text.document())
+            self.c_highlighter = self.create_highlighter("c")
         
         self.language_label.setText(f"Current Language: {self.current_language}")
         
-        if self.base64_text.toPlainText().strip():
+        base64_data = self.normalize_source(self.base64_text.toPlainText())
+        if self.current_entries and self.current_source == base64_data:
+            # Reuse the decoded entries, the other language is generated at most once
+            self.start_conversion(self.current_entries)
+        elif base64_data:
             self.convert_to_code()
     
     def convert_to_code(self):
-        base64_data = self.base64_text.toPlainText().strip()
+        base64_data = self.normalize_source(self.base64_text.toPlainText())
         if not base64_data:
             QMessageBox.warning(self, "No Base64 Data",
                                 "Please paste Base64 encoded condition data in the right container.")
             return
-        try:
-            # Decoding the conditions
-            conditions = Level5ConditionDecoder.from_base64(base64_data)
-            
-            # Generator selection
-            generator = CCodeGenerator(conditions) if self.current_language == "C" else SquirrelCodeGenerator(conditions)
-            
-            # Code generation
-            code = generator.generate()
-  
-            # Beautify the generated code
-            transformer = CodeTransformer(code)
-            code = transformer.beautify()  
+        
+        self.current_entries = self.create_entries(base64_data)
+        self.current_source = base64_data
+        self.start_conversion(self.current_entries)
+    
+    def on_base64_changed(self):
+        if self.live_checkbox.isChecked():
+            self.live_timer.start()
+    
+    def live_convert(self):
+        base64_data = self.normalize_source(self.base64_text.toPlainText())
+        
+        # Nothing to do when only whitespace changed since the last conversion
+        if not base64_data or base64_data == self.current_source:
+            return
+        
+        self.current_entries = self.create_entries(base64_data)
+        self.current_source = base64_data
+        self.start_conversion(self.current_entries, live=True)
+    
+    @staticmethod
+    def normalize_source(text):
+        """Text without the whitespace that does not change the pasted conditions"""
+        lines = (" ".join(line.split()) for line in text.splitlines())
+        return "\n".join(line for line in lines if line)
+    
+    def create_entries(self, base64_data):
+        """
+        (entry, lock) pairs, entries are decoded on the worker and entries seen
+        before are reused from the cache
+        """
+        entries = []
+        
+        for key, data in split_conditions(base64_data):
+            cached = self.entry_cache.get((key, data))
+            if cached is None:
+                cached = (ConditionEntry(data, key), threading.Lock())
+                self.entry_cache.put((key, data), cached)
+            entries.append(cached)
+        
+        return entries
+    
+    def start_conversion(self, entries, live=False):
+        """Decodes and generates the entries on the thread pool, results come back through signals"""
+        # Results of the cancelled job are ignored by job id, the entry it is
+        # still converting is locked by the worker
+        self.cancel_conversion()
+        
+        self.job_id += 1
+        self.job_entries = entries
+        self.job_results = [None] * len(entries)
+        self.job_live = live
+        
+        target = "c" if self.current_language == "C" else "squirrel"
+        worker = ConversionWorker(self.job_id, entries, target)
+        worker.signals.results.connect(self.on_conversion_results)
+        worker.signals.progress.connect(self.on_conversion_progress)
+        worker.signals.finished.connect(self.on_conversion_finished)
+        self.current_worker = worker
+        
+        self.progress_bar.setRange(0, len(entries))
+        self.progress_bar.setValue(0)
+        self.progress_bar.setVisible(len(entries) > 1)
+        self.cancel_button.setEnabled(True)
+        
+        self.thread_pool.start(worker)
+    
+    def cancel_conversion(self):
+        if self.current_worker:
+            self.current_worker.cancel()
+        self.cancel_button.setEnabled(False)
+    
+    def on_conversion_results(self, job_id, chunk):
+        if job_id != self.job_id:
+            return
+        
+        for index, code, error in chunk:
+            self.job_results[index] = (code, error)
+    
+    def on_conversion_progress(self, job_id, done, total):
+        if job_id == self.job_id:
+            self.progress_bar.setValue(done)
+    
+    def on_conversion_finished(self, job_id, cancelled):
+        if job_id != self.job_id:
+            return
+        
+        self.current_worker = None
+        self.cancel_button.setEnabled(False)
+        self.progress_bar.setVisible(False)
+        
+        self.status_label.setText("")
+        
+        if len(self.job_entries) == 1 and not cancelled:
+            code, error = self.job_results[0]
+            if error is not None:
+                self.current_entries = []
+                if self.job_live:
+                    # Do not interrupt typing with a dialog
+                    self.status_label.setText(f"Invalid condition: {error}")
+                else:
+                    QMessageBox.critical(self, "Conversion Failed",
+                                         f"Failed to convert Base64 to code:\n{error}")
+                return
             
             self.code_text.setPlainText(code)
-        except Exception as e:
-            QMessageBox.critical(self, "Conversion Failed",
-                                 f"Failed to convert Base64 to code:\n{str(e)}")
+            return
+        
+        parts = []
+        for (entry, _), result in zip(self.job_entries, self.job_results):
+            if result is None:
+                continue
+            
+            code, error = result
+            if error is not None:
+                parts.append(f"// Entry {entry.key}: {error}")
+            else:
+                parts.append(f"// Entry {entry.key}\n{code}")
+        
+        if cancelled:
+            parts.append(f"// Conversion cancelled after {len(parts)} of {len(self.job_entries)} entries")
+            # Entries that were not converted must be converted again on the next run
+            self.current_source = None
+        
+        self.code_text.setPlainText("\n\n".join(parts))
+    
+    def closeEvent(self, event):
+        self.cancel_conversion()
+        self.thread_pool.waitForDone()
+        super().closeEvent(event)
     
     def convert_to_base64(self):
-        QMessageBox.information(self, "Not Implemented",
-                                "Code to Base64 conversion is not yet implemented.")
+        """Parses the C or Squirrel code of the left container and encodes it, one line per entry"""
+        from languages.code_parser import parse_entries, Level5ParseError
+        from level_5.condition.encoder import Level5ConditionEncoder
+        
+        code = self.code_text.toPlainText()
+        if not code.strip():
+            QMessageBox.warning(self, "No Code",
+                                "Please write or paste C or Squirrel condition code in the left container.")
+            return
+        
+        try:
+            entries = parse_entries(code)
+            encoded = [(key, Level5ConditionEncoder.to_base64(conditions)) for key, conditions in entries]
+        except Level5ParseError as e:
+            # Put the cursor where the error is
+            cursor = self.code_text.textCursor()
+            cursor.setPosition(e.position)
+            self.code_text.setTextCursor(cursor)
+            self.code_text.setFocus()
+            QMessageBox.critical(self, "Conversion Failed", f"Failed to convert code to Base64:\n{e}")
+            return
+        except ValueError as e:
+            QMessageBox.critical(self, "Conversion Failed", f"Failed to convert code to Base64:\n{e}")
+            return
+        
+        if len(encoded) == 1 and encoded[0][0] is None:
+            self.base64_text.setPlainText(encoded[0][1])
+        else:
+            # Several entries are written like a dump, they are decoded back the same way
+            self.base64_text.setPlainText("\n".join(f"{key if key is not None else index}\t{data}"
+                                                    for index, (key, data) in enumerate(encoded, 1)))
 
 def main():
     app = QApplication(sys.argv)
@@ -0,0 +1,28 @@
+import asyncio
+import argparse
+
+from server.condition_service import ConditionService
+from server.decode_server import DecodeServer
+
+def main():
+    parser = argparse.ArgumentParser(description="Inazuma Condition Parser server")
+    parser.add_argument("--host", default="127.0.0.1", help="HTTP host (default: 127.0.0.1)")
+    parser.add_argument("-p", "--port", type=int, default=8765, help="HTTP port (default: 8765)")
+    parser.add_argument("-u", "--unix", help="Also listen on this Unix socket path (one JSON request per line)")
+    parser.add_argument("--no-http", action="store_true", help="Only listen on the Unix socket")
+    parser.add_argument("--cache-size", type=int, default=65536, help="Number of decoded entries kept in memory")
+    args = parser.parse_args()
+
+    if args.no_http and not args.unix:
+        parser.error("--no-http requires --unix")
+
+    service = ConditionService(args.cache_size)
+    server = DecodeServer(service, args.host, None if args.no_http else args.port, args.unix)
+
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -1,2 +1,8 @@
 from .c_codegenerator import CCodeGenerator
-from .c_syntaxhighlighter import CSyntaxHighlighter
\ No newline at end of file
+
+def __getattr__(name):
+    # The highlighter needs PyQt6, it is only imported when requested
+    if name == "CSyntaxHighlighter":
+        from .c_syntaxhighlighter import CSyntaxHighlighter
+        return CSyntaxHighlighter
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
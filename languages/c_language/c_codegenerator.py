@@ -1,21 +1,18 @@
-import os
-import sys
-
-# Add root path to sys.path
-root_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../.."))
-if root_path not in sys.path:
-    sys.path.insert(0, root_path)
-
 from level_5.condition.logic import *
+from level_5.condition.functions import FunctionRegistry
 
 class CCodeGenerator:
-    def __init__(self, conditions):
+    def __init__(self, conditions, game=None):
         """
         conditions: List of lists of Level5Condition
         Each inner list represents an if block
         Multiple conditions in same list = && combination
+        game: game whose registry names the function calls, functions it does
+        not know keep the name of their decoded signature
         """
         self.conditions = conditions
+        self.game = game
+        self.registry = FunctionRegistry.for_game(game)
         
     def generate(self):
         code_lines = []
@@ -110,10 +107,8 @@ class CCodeGenerator:
     
     def _format_function(self, function):
         """Formats a function call for C code"""
-        func_name_str = FunctionNameEnum.to_string(function.name.value)
-        
-        if not func_name_str:
-            func_name_str = function.name.name
+        signature = self.registry.get(function.signature.id) or function.signature
+        func_name_str = signature.c_name
         
         # Format arguments
         args = []
@@ -1,49 +1,13 @@
-import re
+from languages.highlight_tokenizer import HighlightTokenizer
+from languages.syntax_highlighter import TokenSyntaxHighlighter
 
-from PyQt6.QtGui import QFont, QSyntaxHighlighter, QTextCharFormat, QColor
-
-class CSyntaxHighlighter(QSyntaxHighlighter):
+class CSyntaxHighlighter(TokenSyntaxHighlighter):
     """Syntax highlighter for C language"""
     
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self.highlighting_rules = []
-        
-        keyword_format = QTextCharFormat()
-        keyword_format.setForeground(QColor("#569CD6"))
-        keyword_format.setFontWeight(QFont.Weight.Bold)
-        keywords = [
-            "bool", "int", "void", "if", "else", "return", "true", "false",
-            "while", "for", "do", "switch", "case", "break", "continue",
-            "struct", "typedef", "enum", "const", "static", "extern"
-        ]
-        for word in keywords:
-            pattern = f"\\b{word}\\b"
-            self.highlighting_rules.append((re.compile(pattern), keyword_format))
-        
-        function_format = QTextCharFormat()
-        function_format.setForeground(QColor("#DCDCAA"))
-        self.highlighting_rules.append((re.compile(r'\b[A-Za-z_][A-Za-z0-9_]*(?=\()'), function_format))
-        
-        number_format = QTextCharFormat()
-        number_format.setForeground(QColor("#B5CEA8"))
-        self.highlighting_rules.append((re.compile(r'\b[0-9]+\b'), number_format))
-        
-        string_format = QTextCharFormat()
-        string_format.setForeground(QColor("#CE9178"))
-        self.highlighting_rules.append((re.compile(r'"[^"\\]*(\\.[^"\\]*)*"'), string_format))
-        
-        comment_format = QTextCharFormat()
-        comment_format.setForeground(QColor("#6A9955"))
-        self.highlighting_rules.append((re.compile(r'//[^\n]*'), comment_format))
-        
-        variable_format = QTextCharFormat()
-        variable_format.setForeground(QColor("#9CDCFE"))
-        self.highlighting_rules.append((re.compile(r'\bvariable[0-9]+\b'), variable_format))
-        self.highlighting_rules.append((re.compile(r'\bflag_variable[0-9]+\b'), variable_format))
-        self.highlighting_rules.append((re.compile(r'\bresult\b'), variable_format))
+    KEYWORDS = [
+        "bool", "int", "void", "if", "else", "return", "true", "false",
+        "while", "for", "do", "switch", "case", "break", "continue",
+        "struct", "typedef", "enum", "const", "static", "extern"
+    ]
     
-    def highlightBlock(self, text):
-        for pattern, fmt in self.highlighting_rules:
-            for match in pattern.finditer(text):
-                self.setFormat(match.start(), match.end() - match.start(), fmt)
\ No newline at end of file
+    TOKENIZER = HighlightTokenizer(KEYWORDS, r'\b[A-Za-z_][A-Za-z0-9_]*(?=\()')
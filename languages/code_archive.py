@@ -0,0 +1,281 @@
+import io
+import os
+import mmap
+import zlib
+import struct
+import tarfile
+import zipfile
+from abc import ABC, abstractmethod
+
+PACK_MAGIC = b"INZC"
+PACK_INDEX_MAGIC = b"INZI"
+PACK_VERSION = 1
+PACK_HEADER = struct.Struct("<4sHH")
+PACK_RECORD = struct.Struct("<QIIH")
+PACK_FOOTER = struct.Struct("<QI4s")
+
+PACK_COMPRESSED = 1
+
+def archive_format(path):
+    """"zip", "tar" or "pack" from the extension of an archive path"""
+    lower = path.lower()
+    if lower.endswith(".zip"):
+        return "zip"
+    if lower.endswith((".tar", ".tar.gz", ".tgz", ".tar.xz")):
+        return "tar"
+    if lower.endswith(".pack"):
+        return "pack"
+    raise ValueError(f"Unknown archive format for {path}, use .zip, .tar, .tar.gz, .tgz, .tar.xz or .pack")
+
+def open_archive_writer(path, compress=False):
+    """Writer for the format of the path, compress: deflate members (zip, pack) or gzip the tar when its extension does not say"""
+    archive = archive_format(path)
+    if archive == "zip":
+        return ZipCodeArchiveWriter(path, compress)
+    if archive == "tar":
+        return TarCodeArchiveWriter(path, compress)
+    return PackCodeArchiveWriter(path, compress)
+
+def open_archive_reader(path):
+    archive = archive_format(path)
+    if archive == "zip":
+        return ZipCodeArchiveReader(path)
+    if archive == "tar":
+        return TarCodeArchiveReader(path)
+    return PackCodeArchiveReader(path)
+
+class CodeArchiveWriter(ABC):
+    """
+    Writes generated files into one archive instead of one file each.
+    Members are named like the files of the batch output, <key><extension>
+    (see CodeEmitter.file_name).
+    """
+
+    BUFFER_SIZE = 1 << 20
+
+    def write(self, name, text):
+        self.write_bytes(name, text.encode("utf-8"))
+
+    @abstractmethod
+    def write_bytes(self, name, data):
+        pass
+
+    @abstractmethod
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+class ZipCodeArchiveWriter(CodeArchiveWriter):
+    def __init__(self, path, compress=False):
+        self.path = path
+        self._file = open(path, "wb", buffering=self.BUFFER_SIZE)
+        self._zip = zipfile.ZipFile(self._file, "w", zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED)
+
+    def write_bytes(self, name, data):
+        self._zip.writestr(name, data)
+
+    def close(self):
+        self._zip.close()
+        self._file.close()
+
+class TarCodeArchiveWriter(CodeArchiveWriter):
+    """Streams a tar file, gzip or xz compressed by the extension (or gzip with compress)"""
+
+    def __init__(self, path, compress=False):
+        lower = path.lower()
+        if lower.endswith((".tar.gz", ".tgz")) or (compress and lower.endswith(".tar")):
+            mode = "w|gz"
+        elif lower.endswith(".tar.xz"):
+            mode = "w|xz"
+        else:
+            mode = "w|"
+
+        self.path = path
+        self._file = open(path, "wb", buffering=self.BUFFER_SIZE)
+        self._tar = tarfile.open(fileobj=self._file, mode=mode)
+
+    def write_bytes(self, name, data):
+        info = tarfile.TarInfo(name)
+        info.size = len(data)
+        self._tar.addfile(info, io.BytesIO(data))
+
+    def close(self):
+        self._tar.close()
+        self._file.close()
+
+class PackCodeArchiveWriter(CodeArchiveWriter):
+    """
+    Indexed concatenation of the members, written in one pass.
+
+    Layout, little endian:
+
+    0x00  magic "INZC", version (uint16), flags (uint16)
+    0x08  member data, each zlib compressed on its own with compress
+          index: member count (uint32), then per member its data offset
+          (uint64), stored size, size (2 x uint32), name length (uint16)
+          and the UTF-8 name
+          footer: index offset (uint64), member count (uint32), "INZI"
+
+    The index is at the end so the data is streamed as it is generated;
+    readers load it from the footer and seek to a member directly.
+    """
+
+    def __init__(self, path, compress=False):
+        self.path = path
+        self.compress = compress
+        self._file = open(path, "wb", buffering=self.BUFFER_SIZE)
+        self._file.write(PACK_HEADER.pack(PACK_MAGIC, PACK_VERSION, PACK_COMPRESSED if compress else 0))
+        self._offset = PACK_HEADER.size
+        self._index = []
+
+    def write_bytes(self, name, data):
+        stored = zlib.compress(data) if self.compress else data
+        self._file.write(stored)
+        self._index.append((name, self._offset, len(stored), len(data)))
+        self._offset += len(stored)
+
+    def close(self):
+        if self._file.closed:
+            return
+
+        index_offset = self._offset
+        write = self._file.write
+        write(struct.pack("<I", len(self._index)))
+        for name, offset, stored_size, size in self._index:
+            encoded = name.encode("utf-8")
+            write(PACK_RECORD.pack(offset, stored_size, size, len(encoded)))
+            write(encoded)
+
+        write(PACK_FOOTER.pack(index_offset, len(self._index), PACK_INDEX_MAGIC))
+        self._file.close()
+
+class CodeArchiveReader(ABC):
+    """Random access to the members of a code archive by name, or by entry key and target"""
+
+    @abstractmethod
+    def names(self):
+        pass
+
+    @abstractmethod
+    def read_bytes(self, name):
+        pass
+
+    def read(self, name):
+        return self.read_bytes(name).decode("utf-8")
+
+    def get(self, key, target):
+        """Generated code of an entry for a target"""
+        from languages.code_emitter import CodeEmitter
+        return self.read(CodeEmitter.file_name(key, target))
+
+    @abstractmethod
+    def __contains__(self, name):
+        pass
+
+    @abstractmethod
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+class ZipCodeArchiveReader(CodeArchiveReader):
+    def __init__(self, path):
+        self.path = path
+        self._zip = zipfile.ZipFile(path)
+        self._names = set(self._zip.namelist())
+
+    def names(self):
+        return self._zip.namelist()
+
+    def read_bytes(self, name):
+        return self._zip.read(name)
+
+    def __contains__(self, name):
+        return name in self._names
+
+    def close(self):
+        self._zip.close()
+
+class TarCodeArchiveReader(CodeArchiveReader):
+    """Members of uncompressed tar files are read in place, compressed ones are decompressed up to the member"""
+
+    def __init__(self, path):
+        self.path = path
+        self._tar = tarfile.open(path)
+        self._members = {member.name: member for member in self._tar.getmembers()}
+
+    def names(self):
+        return list(self._members)
+
+    def read_bytes(self, name):
+        if name not in self._members:
+            raise KeyError(name)
+        return self._tar.extractfile(self._members[name]).read()
+
+    def __contains__(self, name):
+        return name in self._members
+
+    def close(self):
+        self._tar.close()
+
+class PackCodeArchiveReader(CodeArchiveReader):
+    """Reads a .pack file through a memory map, see PackCodeArchiveWriter"""
+
+    def __init__(self, path):
+        self.path = path
+
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size < PACK_HEADER.size + PACK_FOOTER.size:
+                raise ValueError(f"{path} is not a code pack")
+            self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            self._index = self._read_index()
+        except Exception:
+            self._data.close()
+            raise
+
+    def _read_index(self):
+        data = self._data
+        magic, version, flags = PACK_HEADER.unpack_from(data, 0)
+        index_offset, count, index_magic = PACK_FOOTER.unpack_from(data, len(data) - PACK_FOOTER.size)
+
+        if magic != PACK_MAGIC or index_magic != PACK_INDEX_MAGIC:
+            raise ValueError(f"{self.path} is not a code pack")
+        if version != PACK_VERSION:
+            raise ValueError(f"Unsupported code pack version {version}")
+
+        self.compressed = bool(flags & PACK_COMPRESSED)
+
+        index = {}
+        position = index_offset + 4
+        for _ in range(count):
+            offset, stored_size, size, name_length = PACK_RECORD.unpack_from(data, position)
+            position += PACK_RECORD.size
+            index[data[position:position + name_length].decode("utf-8")] = (offset, stored_size, size)
+            position += name_length
+
+        return index
+
+    def names(self):
+        return list(self._index)
+
+    def read_bytes(self, name):
+        offset, stored_size, _ = self._index[name]
+        stored = self._data[offset:offset + stored_size]
+        return zlib.decompress(stored) if self.compressed else stored
+
+    def __contains__(self, name):
+        return name in self._index
+
+    def close(self):
+        self._data.close()
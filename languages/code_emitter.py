@@ -0,0 +1,152 @@
+from level_5.condition.decoder import Level5ConditionDecoder, Level5DecodeError
+from level_5.condition.canonical import structural_hash
+from languages.registry import LanguageRegistry
+
+class CodeEmitter:
+    """Resolves emission targets against the language registry"""
+
+    # Characters a key cannot keep in a file or archive member name
+    UNSAFE_NAME_CHARS = frozenset('/\\:*?"<>|%')
+
+    @staticmethod
+    def targets():
+        return LanguageRegistry.names()
+
+    @staticmethod
+    def resolve_target(name):
+        return LanguageRegistry.resolve(name)
+
+    @staticmethod
+    def extension(target):
+        return LanguageRegistry.get(target).extension
+
+    @classmethod
+    def file_name(cls, key, target):
+        """
+        Name of the output of an entry for a target. Path separators, characters
+        reserved on Windows, control characters and % are percent-encoded in the
+        key, as are the names "." and "..": a key never leaves the output
+        directory and two keys never share a file.
+        """
+        key = str(key)
+        if key in ("", ".", ".."):
+            name = "".join(f"%{ord(char):02X}" for char in key) or "%"
+        else:
+            name = "".join(f"%{ord(char):02X}" if char in cls.UNSAFE_NAME_CHARS or ord(char) < 0x20 else char
+                           for char in key)
+        return f"{name}{cls.extension(target)}"
+
+    @classmethod
+    def parse_targets(cls, value):
+        """Parses a comma separated list of targets, keeping order and dropping duplicates"""
+        targets = []
+
+        for name in value.split(","):
+            if not name.strip():
+                continue
+
+            target = cls.resolve_target(name)
+            if target not in targets:
+                targets.append(target)
+
+        return targets
+
+class ConditionEntry:
+    """
+    A condition decoded once, with the output of every emitted target kept so
+    that switching between languages does not decode or generate again.
+
+    Entries are meant to be used by one thread at a time. Generators and
+    transformers are stateless, so different entries can be decoded and
+    emitted in parallel.
+
+    decoder: optional Level5ConditionDecoder reused across entries by batch
+    loops, created with the same tolerant mode and game.
+
+    A tolerant entry that cannot be decoded at all has its diagnostic as
+    error; its conditions and outputs raise Level5DecodeError instead of
+    standing for a condition that is always true.
+    """
+
+    def __init__(self, data, key=None, tolerant=False, game=None, decoder=None):
+        self.key = key
+        self.data = data
+        self.tolerant = tolerant
+        self.game = game
+        self._decoder = decoder
+        self.diagnostics = []
+        self._decoded = False
+        self._error = None
+        self._conditions = None
+        self._structure_hash = None
+        self._raw_code = {}
+        self._outputs = {}
+
+    @classmethod
+    def from_conditions(cls, conditions, key=None):
+        entry = cls(None, key)
+        entry._conditions = conditions
+        entry._decoded = True
+        return entry
+
+    @property
+    def conditions(self):
+        if self.error is not None:
+            raise Level5DecodeError(self._error.reason, self._error.message)
+        return self._conditions
+
+    @property
+    def error(self):
+        """The Level5Diagnostic that stopped a tolerant decoding, None when the entry was decoded"""
+        if not self._decoded:
+            decoder = self._decoder or Level5ConditionDecoder(tolerant=self.tolerant, game=self.game)
+            result = decoder.decode(self.data)
+            self.diagnostics = result.diagnostics
+            self._conditions = result.conditions
+            self._error = result.error
+            self._decoder = None
+            self._decoded = True
+        return self._error
+
+    @property
+    def structure_hash(self):
+        """Structural hash of the decoded conditions, see level_5.condition.canonical"""
+        if self._structure_hash is None:
+            self._structure_hash = structural_hash(self.conditions)
+        return self._structure_hash
+
+    def emit(self, target):
+        target = CodeEmitter.resolve_target(target)
+
+        if target not in self._outputs:
+            self._outputs[target] = self._generate(target)
+
+        return self._outputs[target]
+
+    def emit_all(self, targets):
+        """Emits every target from the same decoded conditions"""
+        return {target: self.emit(target) for target in targets}
+
+    def _generate(self, target):
+        backend = LanguageRegistry.get(target)
+        code = self._raw(backend)
+
+        if backend.beautify:
+            from languages.transformers.code_transformer import CodeTransformer
+            code = CodeTransformer(code).beautify()
+
+        return code
+
+    def _raw(self, backend):
+        """Raw generator output, shared with the backends converting it (Squirrel is built from C)"""
+        if backend.name not in self._raw_code:
+            generator = backend.generator_class()(self.conditions, game=self.game)
+
+            if backend.source:
+                code = generator.generate(self._raw(LanguageRegistry.get(backend.source)))
+            else:
+                code = generator.generate()
+
+            self._raw_code[backend.name] = code
+
+        return self._raw_code[backend.name]
@@ -0,0 +1,374 @@
+from level_5.condition.logic import *
+from level_5.condition.functions import FunctionRegistry
+
+# Token kinds, punctuation tokens are their own text
+IDENTIFIER = "identifier"
+NUMBER = "number"
+END = "end"
+
+COMPARATORS = {
+    "<": ComparatorEnum.LESS_THAN,
+    ">": ComparatorEnum.GREATER_THAN,
+    ">=": ComparatorEnum.GREATER_THAN_OR_EQUAL,
+    "==": ComparatorEnum.EQUAL,
+}
+
+# Comparisons the generators never write, there is no opcode for them
+UNSUPPORTED_COMPARATORS = ("<=", "!=")
+
+IDENTIFIER_START = frozenset("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ_")
+IDENTIFIER_CHARS = IDENTIFIER_START | frozenset("0123456789")
+DIGITS = frozenset("0123456789")
+HEX_DIGITS = frozenset("0123456789abcdefABCDEF")
+WHITESPACE = frozenset(" \t\r\n")
+UINT32_MAX = 0xFFFFFFFF
+TWO_CHAR_TOKENS = frozenset(["&&", "==", ">=", "<=", "!=", "??"])
+ONE_CHAR_TOKENS = frozenset("(){};,!<>=")
+
+class Level5ParseError(ValueError):
+    """Syntax error in condition code, at a line and column (both from 1)"""
+
+    def __init__(self, message, line, column, position):
+        super().__init__(f"line {line}, column {column}: {message}")
+        self.message = message
+        self.line = line
+        self.column = column
+        self.position = position
+
+def tokenize(text, start=0, end=None):
+    """
+    List of (kind, text, position) tokens of text[start:end], ending with an
+    END token. Comments (// and /* */) and whitespace are skipped; every
+    character is looked at once.
+    """
+    tokens = []
+    append = tokens.append
+    length = len(text) if end is None else end
+    position = start
+
+    while position < length:
+        char = text[position]
+
+        if char in WHITESPACE:
+            position += 1
+        elif char in IDENTIFIER_START:
+            token_start = position
+            position += 1
+            while position < length and text[position] in IDENTIFIER_CHARS:
+                position += 1
+            append((IDENTIFIER, text[token_start:position], token_start))
+        elif char in DIGITS or (char == "-" and position + 1 < length and text[position + 1] in DIGITS):
+            token_start = position
+            position += 1
+            if char == "0" and text.startswith(("0x", "0X"), token_start, length):
+                position += 1
+                while position < length and text[position] in HEX_DIGITS:
+                    position += 1
+            else:
+                while position < length and text[position] in DIGITS:
+                    position += 1
+            if position < length and text[position] in IDENTIFIER_START:
+                _raise(text, token_start, f"Invalid number {text[token_start:position + 1]!r}")
+            append((NUMBER, text[token_start:position], token_start))
+        elif text.startswith("//", position):
+            line_end = text.find("\n", position, length)
+            position = length if line_end == -1 else line_end
+        elif text.startswith("/*", position):
+            comment_end = text.find("*/", position + 2, length)
+            if comment_end == -1:
+                _raise(text, position, "Unterminated comment")
+            position = comment_end + 2
+        elif position + 1 < length and text[position:position + 2] in TWO_CHAR_TOKENS:
+            append((text[position:position + 2], text[position:position + 2], position))
+            position += 2
+        elif char in ONE_CHAR_TOKENS:
+            append((char, char, position))
+            position += 1
+        else:
+            _raise(text, position, f"Unexpected character {char!r}")
+
+    append((END, "", length))
+    return tokens
+
+def _raise(text, position, message):
+    line = text.count("\n", 0, position) + 1
+    column = position - (text.rfind("\n", 0, position) + 1) + 1
+    raise Level5ParseError(message, line, column, position)
+
+class ConditionCodeParser:
+    """
+    Parses the C or Squirrel code written by CCodeGenerator and
+    SquirrelCodeGenerator back into condition blocks, with a single-pass
+    recursive descent over the tokens.
+
+    Accepted: an optional "bool/function condition() { ... }" wrapper, the
+    result declaration, "if (...) { result = true; }" blocks (nested ifs are
+    ANDed), "&&" chains, comparisons, bare calls (== 1), "!call" (== 0),
+    parentheses around a condition, "return result;", function names in any
+    naming style of the registry and func_XXXXXXXX ids. A top-level
+    "result = true;" is an entry without conditions; code that never sets
+    result to true has no encoding and is rejected.
+
+    What the code does not show is not rebuilt: numbers are LOCAL_INT,
+    function padding is left to the encoder and "??" is read as
+    unknown_comparator (0x70 unless told otherwise, 0x79 is also written ??).
+    """
+
+    def __init__(self, game=None, unknown_comparator=ComparatorEnum.UNK_COMPARATOR_3):
+        self.registry = FunctionRegistry.for_game(game)
+        self.unknown_comparator = unknown_comparator
+        self.text = ""
+        self.tokens = []
+        self.index = 0
+        self.local_var_count = 0
+
+    def parse(self, text, start=0, end=None):
+        """List of blocks of Level5Condition of text[start:end], raises Level5ParseError"""
+        self.text = text
+        self.tokens = tokenize(text, start, end)
+        self.index = 0
+        self.local_var_count = 0
+
+        if len(self.tokens) == 1:
+            self._error("Expected condition code")
+
+        blocks = []
+        always_true = False
+
+        if self._peek_text() in ("bool", "function") and self._peek_kind(1) == IDENTIFIER and self._peek_kind(2) == "(":
+            self.index += 2
+            self._expect("(")
+            self._expect(")")
+            self._expect("{")
+            always_true = self._parse_statements(blocks, "}")
+            self._expect("}")
+        else:
+            always_true = self._parse_statements(blocks, END)
+
+        self._expect(END)
+
+        # No blocks is the encoding of a condition that is always true
+        if always_true:
+            return []
+        if not blocks:
+            self._error("result is never set to true, a condition that is always false cannot be encoded", 0, found=False)
+        return blocks
+
+    def _parse_statements(self, blocks, closing):
+        """Statements until the closing token, returns True when result is set outside of an if"""
+        always_true = False
+
+        while self._peek_kind() != closing:
+            word = self._peek_text()
+
+            if word == "if":
+                self._parse_if(blocks, [])
+            elif word in ("bool", "local", "int", "var"):
+                self.index += 1
+                self._parse_result_assignment()
+            elif word == "result":
+                always_true |= self._parse_result_assignment()
+            elif word == "return":
+                self.index += 1
+                self._expect_word("result")
+                self._expect(";")
+            else:
+                self._error("Expected if, the result declaration or return result")
+
+        return always_true
+
+    def _parse_result_assignment(self):
+        self._expect_word("result")
+        self._expect("=")
+        value = self._peek_text()
+        if value not in ("true", "false"):
+            self._error("Expected true or false")
+        self.index += 1
+        self._expect(";")
+        return value == "true"
+
+    def _parse_if(self, blocks, outer):
+        self._expect_word("if")
+        self._expect("(")
+        conditions = outer + self._parse_and()
+        self._expect(")")
+        self._expect("{")
+
+        while self._peek_kind() != "}":
+            if self._peek_text() == "if":
+                self._parse_if(blocks, conditions)
+                continue
+
+            if not self._parse_result_assignment():
+                self._error("Only result = true; can be set in an if block", self.index - 2)
+            blocks.append(list(conditions))
+
+        self._expect("}")
+
+    def _parse_and(self):
+        conditions = [self._parse_condition()]
+        while self._peek_kind() == "&&":
+            self.index += 1
+            conditions.append(self._parse_condition())
+        return conditions
+
+    def _parse_condition(self):
+        kind = self._peek_kind()
+
+        if kind == "(":
+            self.index += 1
+            condition = self._parse_condition()
+            self._expect(")")
+            return condition
+
+        if kind == "!":
+            self.index += 1
+            start = self.index
+            operand = self._parse_operand()
+            if not isinstance(operand, Level5Function):
+                self._error("! can only be applied to a function call", start)
+            return self._condition(operand, self._local(0), ComparatorEnum.EQUAL)
+
+        start = self.index
+        left = self._parse_operand()
+        kind = self._peek_kind()
+
+        if kind in COMPARATORS or kind == "??":
+            comparator = self.unknown_comparator if kind == "??" else COMPARATORS[kind]
+            self.index += 1
+            return self._condition(left, self._parse_operand(), comparator)
+
+        if kind in UNSUPPORTED_COMPARATORS:
+            self._error(f"No opcode for the comparator {kind}", found=False)
+
+        if not isinstance(left, Level5Function):
+            self._error("Expected a comparison or a function call", start)
+        return self._condition(left, self._local(1), ComparatorEnum.EQUAL)
+
+    def _parse_operand(self):
+        kind, text, _ = self.tokens[self.index]
+
+        if kind == NUMBER:
+            return self._local(self._number())
+
+        if kind != IDENTIFIER:
+            self._error("Expected a number or a function call")
+
+        signature = self.registry.by_name(text)
+        if signature is None:
+            self._error(f"Unknown function {text}", found=False)
+
+        start = self.index
+        self.index += 1
+        self._expect("(")
+
+        args = []
+        if self._peek_kind() != ")":
+            args.append(self._parse_argument())
+            while self._peek_kind() == ",":
+                self.index += 1
+                args.append(self._parse_argument())
+        self._expect(")")
+
+        if signature.arg_count is not None and signature.arg_count != len(args):
+            self._error(f"{text} expects {signature.arg_count} argument(s), got {len(args)}", start, found=False)
+        return Level5Function(signature, args)
+
+    def _parse_argument(self):
+        kind, text, _ = self.tokens[self.index]
+        if kind != NUMBER:
+            self._error("Function arguments must be numbers")
+        return self._local(self._number())
+
+    def _number(self):
+        """Value of the NUMBER token, a uint32 like the encoder writes"""
+        _, text, _ = self.tokens[self.index]
+        digits = text.lstrip("-")
+
+        if len(digits) > 1 and digits[0] == "0" and digits[1] not in "xX":
+            self._error(f"Invalid number {text!r}, decimal numbers cannot start with 0", found=False)
+
+        value = int(text, 0)
+        if not 0 <= value <= UINT32_MAX:
+            self._error(f"Number {text} out of range 0-{UINT32_MAX}", found=False)
+
+        self.index += 1
+        return value
+
+    def _local(self, value):
+        variable = Level5Variable(f"variable{self.local_var_count}", SymbolType.LOCAL_INT, value)
+        self.local_var_count += 1
+        return variable
+
+    def _condition(self, left, right, comparator):
+        # Same comparator type as the decoder gives
+        if isinstance(left, Level5Function):
+            comparator_type = left.signature.return_type
+        elif isinstance(right, Level5Function):
+            comparator_type = right.signature.return_type
+        else:
+            comparator_type = "int"
+        return Level5Condition(left, right, comparator, comparator_type)
+
+    def _peek_kind(self, ahead=0):
+        index = min(self.index + ahead, len(self.tokens) - 1)
+        return self.tokens[index][0]
+
+    def _peek_text(self):
+        return self.tokens[self.index][1]
+
+    def _expect(self, kind):
+        if self.tokens[self.index][0] != kind:
+            self._error(f"Expected {'the end of the code' if kind == END else repr(kind)}")
+        self.index += 1
+
+    def _expect_word(self, word):
+        if self.tokens[self.index][1] != word or self.tokens[self.index][0] != IDENTIFIER:
+            self._error(f"Expected {word}")
+        self.index += 1
+
+    def _error(self, message, index=None, found=True):
+        kind, text, position = self.tokens[self.index if index is None else index]
+        if found:
+            message += f", found {'the end of the code' if kind == END else repr(text)}"
+        _raise(self.text, position, message)
+
+def parse_code(text, game=None):
+    """Condition blocks of generated C or Squirrel code"""
+    return ConditionCodeParser(game).parse(text)
+
+def parse_entries(text, game=None):
+    """
+    (key, conditions) pairs of code holding several entries, each preceded
+    by a "// Entry <key>" line like the batch output of the CLI and the GUI.
+    Text without such lines is one entry keyed None. Error locations are in
+    the whole text.
+    """
+    parser = ConditionCodeParser(game)
+    entries = []
+
+    def parse(key, start, end=None):
+        try:
+            return parser.parse(text, start, end)
+        except Level5ParseError as e:
+            if key is None:
+                raise
+            raise Level5ParseError(f"Entry {key}: {e.message}", e.line, e.column, e.position) from None
+
+    key = None
+    start = 0
+    position = 0
+
+    for line in text.splitlines(True):
+        stripped = line.strip()
+        if stripped.startswith("// Entry "):
+            # Text before the first entry line only counts when it holds code
+            if key is not None or len(tokenize(text, start, position)) > 1:
+                entries.append((key, parse(key, start, position)))
+            key = stripped[len("// Entry "):].split(":", 1)[0].strip()
+            start = position + len(line)
+        position += len(line)
+
+    if key is not None or not entries:
+        entries.append((key, parse(key, start)))
+    return entries
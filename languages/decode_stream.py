@@ -0,0 +1,134 @@
+import asyncio
+import collections
+
+from tools.chunk_executor import create_executor, map_chunks
+
+from languages.code_emitter import ConditionEntry
+from level_5.condition.decoder import Level5ConditionDecoder
+
+class StreamResult:
+    """
+    Outcome of one streamed entry: the decoded ConditionEntry, or the error
+    that stopped it. A tolerant entry that could not be decoded at all keeps
+    its entry along with the error.
+    """
+
+    def __init__(self, index, key, entry=None, error=None):
+        self.index = index
+        self.key = key
+        self.entry = entry
+        self.error = error
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    def __repr__(self):
+        return f"<StreamResult index={self.index} key={self.key} ok={self.ok}>"
+
+def _decode_entry(decoder, index, key, data, targets, tolerant, game):
+    try:
+        entry = ConditionEntry(data, key, tolerant, game, decoder)
+        if entry.error is not None:
+            return StreamResult(index, key, entry, f"{entry.error.reason}: {entry.error.message}")
+        entry.emit_all(targets)
+        return StreamResult(index, key, entry)
+    except Exception as e:
+        return StreamResult(index, key, error=str(e))
+
+def _decode_chunk(chunk, targets, tolerant, game):
+    """Decodes a chunk of (index, key, data) and emits their targets, run in the executor"""
+    decoder = Level5ConditionDecoder(tolerant=tolerant, game=game)
+    return [_decode_entry(decoder, index, key, data, targets, tolerant, game) for index, key, data in chunk]
+
+async def _iterate(source):
+    """Iterates a sync or async iterable of Base64 strings or (key, Base64) pairs"""
+    if hasattr(source, "__aiter__"):
+        async for item in source:
+            yield item
+    else:
+        for item in source:
+            yield item
+
+async def decode_stream(source, targets=(), executor=None, max_workers=None, max_in_flight=16,
+                        chunk_size=32, ordered=True, tolerant=False, game=None):
+    """
+    Decodes entries from an (async) iterable without blocking the event loop.
+
+    Every entry is decoded, and its targets emitted, in the executor: an
+    Executor instance, "thread", "process", or None for the default executor
+    of the loop. Entries are submitted in chunks of chunk_size, which keeps
+    the cost of a process executor low. At most max_in_flight chunks are
+    submitted at once, the source is not read further until results are
+    consumed. Results are StreamResult objects, in source order when ordered
+    is true, otherwise as soon as their chunk is ready.
+
+        async for result in decode_stream(entries, ["c", "squirrel"]):
+            print(result.key, result.entry.emit("c"))
+    """
+    if max_in_flight < 1 or chunk_size < 1:
+        raise ValueError("max_in_flight and chunk_size must be at least 1")
+
+    loop = asyncio.get_running_loop()
+    executor, owned = create_executor(executor, max_workers)
+    targets = list(targets)
+    pending = collections.deque() if ordered else set()
+    chunk = []
+    index = 0
+
+    def submit():
+        future = loop.run_in_executor(executor, _decode_chunk, chunk, targets, tolerant, game)
+        if ordered:
+            pending.append(future)
+        else:
+            pending.add(future)
+
+    try:
+        async for item in _iterate(source):
+            key, data = item if isinstance(item, tuple) else (index, item)
+            chunk.append((index, key, data))
+            index += 1
+
+            if len(chunk) < chunk_size:
+                continue
+
+            submit()
+            chunk = []
+
+            # Backpressure: wait for results before reading more of the source
+            while len(pending) >= max_in_flight:
+                for result in await _next_results(pending, ordered):
+                    yield result
+
+        if chunk:
+            submit()
+
+        while pending:
+            for result in await _next_results(pending, ordered):
+                yield result
+    finally:
+        for future in pending:
+            future.cancel()
+        if owned:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+async def _next_results(pending, ordered):
+    """Waits for the next result in order, or for any results when unordered"""
+    if ordered:
+        return await pending.popleft()
+
+    done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+    pending.difference_update(done)
+    return [result for future in done for result in future.result()]
+
+def decode_batch(source, targets=(), executor="thread", max_workers=None, max_in_flight=16,
+                 chunk_size=256, tolerant=False, game=None):
+    """
+    Synchronous counterpart of decode_stream for batch tools: decodes entries
+    of an iterable in chunks on a thread pool (or "process", or an Executor)
+    and yields StreamResult objects in source order. The decoder, generators
+    and transformers are stateless, so on a free-threaded CPython the threads
+    use every core without pickling the entries.
+    """
+    return map_chunks(source, _decode_chunk, (list(targets), tolerant, game),
+                      executor, max_workers, max_in_flight, chunk_size)
@@ -0,0 +1,35 @@
+import re
+
+class HighlightTokenizer:
+    """
+    Splits a line of code into highlighted tokens with a single regex made of
+    named groups, so a line is scanned once whatever the number of rules.
+    At a given position the first group that matches wins: comments, strings,
+    variables, function calls, keywords and numbers, in that order. Other
+    identifiers are consumed whole so keywords are never found inside them.
+    """
+    
+    KINDS = ("comment", "string", "variable", "function", "keyword", "number")
+    
+    def __init__(self, keywords, function_pattern):
+        keyword_pattern = r'\b(?:' + "|".join(re.escape(word) for word in sorted(keywords, key=len, reverse=True)) + r')\b'
+        
+        rules = [
+            ("comment", r'//[^\n]*'),
+            ("string", r'"[^"\\]*(?:\\.[^"\\]*)*"'),
+            ("variable", r'\b(?:flag_variable[0-9]+|variable[0-9]+|result)\b'),
+            ("function", function_pattern),
+            ("keyword", keyword_pattern),
+            ("number", r'\b[0-9]+\b'),
+            ("identifier", r'[A-Za-z_][A-Za-z0-9_]*')
+        ]
+        
+        self.pattern = re.compile("|".join(f"(?P<{kind}>{pattern})" for kind, pattern in rules))
+    
+    def tokenize(self, text):
+        """Yields (start, length, kind) for every highlighted token of the text"""
+        for match in self.pattern.finditer(text):
+            kind = match.lastgroup
+            if kind != "identifier":
+                start = match.start()
+                yield start, match.end() - start, kind
@@ -0,0 +1 @@
+from .json_codegenerator import JsonCodeGenerator
@@ -0,0 +1,17 @@
+import json
+
+from level_5.condition.serializer import ConditionSerializer
+
+class JsonCodeGenerator:
+    def __init__(self, conditions, game=None):
+        """
+        conditions: List of lists of Level5Condition
+        Produces the structured record of ConditionSerializer as indented JSON
+        game: accepted like the other generators, functions carry their signature
+        """
+        self.conditions = conditions
+        self.game = game
+    
+    def generate(self):
+        record = ConditionSerializer.to_record(self.conditions)
+        return json.dumps(record, indent=4)
@@ -0,0 +1,90 @@
+import importlib
+
+class LanguageBackend:
+    """
+    A language known by name. Generator and highlighter classes are given as
+    "module:Class" paths and only imported when they are first used.
+    """
+    
+    def __init__(self, name, generator, highlighter=None, extension="", aliases=(), source=None, beautify=True):
+        self.name = name
+        self.generator = generator
+        self.highlighter = highlighter
+        self.extension = extension
+        self.aliases = tuple(aliases)
+        # Name of the backend whose raw code is passed to this generator, if any
+        self.source = source
+        self.beautify = beautify
+        self._classes = {}
+    
+    def generator_class(self):
+        return self._load(self.generator)
+    
+    def highlighter_class(self):
+        if self.highlighter is None:
+            raise ValueError(f"No highlighter registered for {self.name}")
+        return self._load(self.highlighter)
+    
+    def _load(self, path):
+        if path not in self._classes:
+            module_name, _, class_name = path.partition(":")
+            self._classes[path] = getattr(importlib.import_module(module_name), class_name)
+        return self._classes[path]
+
+class LanguageRegistry:
+    """Registered language backends, looked up by name or alias"""
+    
+    _backends = {}
+    _aliases = {}
+    
+    @classmethod
+    def register(cls, name, generator, highlighter=None, extension="", aliases=(), source=None, beautify=True):
+        backend = LanguageBackend(name, generator, highlighter, extension, aliases, source, beautify)
+        cls._backends[name] = backend
+        
+        for alias in backend.aliases:
+            cls._aliases[alias] = name
+        
+        return backend
+    
+    @classmethod
+    def resolve(cls, name):
+        """Returns the registered name for a name or alias"""
+        key = name.strip().lower()
+        key = cls._aliases.get(key, key)
+        
+        if key not in cls._backends:
+            raise ValueError(f"Unknown target: {name}")
+        
+        return key
+    
+    @classmethod
+    def get(cls, name):
+        return cls._backends[cls.resolve(name)]
+    
+    @classmethod
+    def names(cls):
+        return list(cls._backends)
+
+LanguageRegistry.register(
+    "c",
+    "languages.c_language.c_codegenerator:CCodeGenerator",
+    "languages.c_language.c_syntaxhighlighter:CSyntaxHighlighter",
+    extension=".c"
+)
+
+LanguageRegistry.register(
+    "squirrel",
+    "languages.squirrel_language.squirrel_codegenerator:SquirrelCodeGenerator",
+    "languages.squirrel_language.squirrel_syntaxhighlighter:SquirrelSyntaxHighlighter",
+    extension=".nut",
+    aliases=("sq", "nut"),
+    source="c"
+)
+
+LanguageRegistry.register(
+    "json",
+    "languages.json_language.json_codegenerator:JsonCodeGenerator",
+    extension=".json",
+    beautify=False
+)
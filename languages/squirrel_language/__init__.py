@@ -1,2 +1,8 @@
 from .squirrel_codegenerator import SquirrelCodeGenerator
-from .squirrel_syntaxhighlighter import SquirrelSyntaxHighlighter
+
+def __getattr__(name):
+    # The highlighter needs PyQt6, it is only imported when requested
+    if name == "SquirrelSyntaxHighlighter":
+        from .squirrel_syntaxhighlighter import SquirrelSyntaxHighlighter
+        return SquirrelSyntaxHighlighter
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,30 +1,22 @@
 import re
-import os
-import sys
 
-# Add root path to sys.path
-root_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../.."))
-if root_path not in sys.path:
-    sys.path.insert(0, root_path)
-    
 from languages.c_language.c_codegenerator import CCodeGenerator
+from level_5.condition.functions import FunctionRegistry
 
 class SquirrelCodeGenerator:
-    def __init__(self, conditions):
+    # Function calls, renamed in one pass with the Squirrel names of the registry
+    CALL_PATTERN = re.compile(r'\b([A-Za-z_]\w*)\(')
+    
+    def __init__(self, conditions, game=None):
         self.conditions = conditions
-        
-        # Mapping of C function names to Squirrel function names
-        self.function_mapping = {
-            'getGameSubPhase': 'CMND_GET_GAME_SUB_PHASE',
-            'getGlobalBitFlag': 'CMND_GET_GLOBAL_BIT_FLAG',
-            'getTeamBitFlag': 'CMND_GET_TEAM_BIT_FLAG',
-            'isHaveItem': 'CMND_IS_HAVE_ITEM'
-        }
+        self.game = game
+        self.registry = FunctionRegistry.for_game(game)
     
-    def generate(self):
-        # Generate C code first
-        c_generator = CCodeGenerator(self.conditions)
-        c_code = c_generator.generate()
+    def generate(self, c_code=None):
+        # Generate C code first, unless it was already generated for these conditions
+        if c_code is None:
+            c_generator = CCodeGenerator(self.conditions, self.game)
+            c_code = c_generator.generate()
         
         # Convert C code to Squirrel code
         squirrel_code = self._convert_c_to_squirrel(c_code)
@@ -41,11 +33,13 @@ class SquirrelCodeGenerator:
         # Replace bool result declaration
         squirrel_code = squirrel_code.replace('bool result = false;', 'local result = false;')
         
-        # Replace function names using mapping
-        for c_func, squirrel_func in self.function_mapping.items():
-            # Use regex to match function calls (function name followed by parenthesis)
-            pattern = r'\b' + c_func + r'\('
-            replacement = squirrel_func + '('
-            squirrel_code = re.sub(pattern, replacement, squirrel_code)
+        # Replace function names using the registry
+        squirrel_code = self.CALL_PATTERN.sub(self._replace_call, squirrel_code)
         
-        return squirrel_code
\ No newline at end of file
+        return squirrel_code
+    
+    def _replace_call(self, match):
+        signature = self.registry.by_name(match.group(1))
+        if signature is None:
+            return match.group(0)
+        return signature.squirrel_name + '('
\ No newline at end of file
@@ -0,0 +1,36 @@
+from PyQt6.QtGui import QFont, QSyntaxHighlighter, QTextCharFormat, QColor
+
+class TokenSyntaxHighlighter(QSyntaxHighlighter):
+    """
+    Base class of the language highlighters.
+    Subclasses set TOKENIZER to a HighlightTokenizer, each block is then
+    highlighted with the tokens of its tokenize().
+    """
+    
+    TOKENIZER = None
+    
+    COLORS = {
+        "keyword": "#569CD6",
+        "function": "#DCDCAA",
+        "number": "#B5CEA8",
+        "string": "#CE9178",
+        "comment": "#6A9955",
+        "variable": "#9CDCFE"
+    }
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.formats = {}
+        
+        for kind, color in self.COLORS.items():
+            text_format = QTextCharFormat()
+            text_format.setForeground(QColor(color))
+            if kind == "keyword":
+                text_format.setFontWeight(QFont.Weight.Bold)
+            self.formats[kind] = text_format
+    
+    def highlightBlock(self, text):
+        formats = self.formats
+        
+        for start, length, kind in self.TOKENIZER.tokenize(text):
+            self.setFormat(start, length, formats[kind])
@@ -1,4 +1,5 @@
 import re
+import itertools
 
 class CodeSimplifier:
     """
@@ -6,11 +7,10 @@ class CodeSimplifier:
     - Removing blank lines
     - Converting && conditions to nested if statements
     - Extracting literal values into variables
-    """
     
-    def __init__(self):
-        self.variable_counter = 0
-        self.declared_variables = set()
+    The simplifier keeps no state between calls, one instance can be shared
+    by several threads.
+    """
     
     def simplify(self, code):
         """
@@ -42,8 +42,7 @@ class CodeSimplifier:
         """
         lines = code.split('\n')
         result = []
-        self.variable_counter = 0
-        self.declared_variables = set()
+        variable_counter = itertools.count()
         
         # First pass: find where to insert variable declarations
         insert_index = -1
@@ -66,7 +65,7 @@ class CodeSimplifier:
             
             if stripped.startswith('if'):
                 # Extract literals from this if statement
-                modified_line, new_declarations = self._extract_literals_from_line(line)
+                modified_line, new_declarations = self._extract_literals_from_line(line, variable_counter)
                 
                 if new_declarations:
                     # Insert variable declarations before this if
@@ -88,9 +87,10 @@ class CodeSimplifier:
         
         return code
     
-    def _extract_literals_from_line(self, line):
+    def _extract_literals_from_line(self, line, variable_counter):
         """
-        Extracts numeric literals from a line and replaces them with variables.
+        Extracts numeric literals from a line and replaces them with variables
+        numbered by variable_counter.
         Returns the modified line and a list of (variable_name, value) tuples.
         """
         new_declarations = []
@@ -101,8 +101,7 @@ class CodeSimplifier:
         
         def replace_literal(match):
             value = match.group(1)
-            var_name = f"variable{self.variable_counter}"
-            self.variable_counter += 1
+            var_name = f"variable{next(variable_counter)}"
             new_declarations.append((var_name, value))
             return var_name
         
@@ -0,0 +1,146 @@
+import os
+import time
+import hashlib
+
+from tools.directory_watcher import DirectoryWatcher
+from languages.code_emitter import CodeEmitter, ConditionEntry
+from level_5.condition.dump import read_dump
+from level_5.condition.decoder import Level5ConditionDecoder
+
+class WatchCycleStats:
+    """Work done and skipped during one watch cycle"""
+
+    def __init__(self, changes):
+        self.changes = changes
+        self.entries_built = 0
+        self.entries_skipped = 0
+        self.entries_removed = 0
+        self.errors = []
+        self.elapsed = 0.0
+
+    def format(self):
+        changes = self.changes
+        return (f"{len(changes.added)} added, {len(changes.modified)} modified, {len(changes.removed)} removed files; "
+                f"{changes.unchanged + changes.touched} files skipped ({changes.touched} touched with the same content); "
+                f"entries: {self.entries_built} built, {self.entries_skipped} skipped, {self.entries_removed} removed; "
+                f"{len(self.errors)} errors; {self.elapsed:.3f} s")
+
+class WatchBuilder:
+    """
+    Keeps the outputs of a directory of condition dumps up to date.
+
+    Every cycle scans the directory, only dump files that changed are read,
+    and in those only the entries whose Base64 data changed are decoded and
+    generated again. Outputs of an entry are written to
+    <output_dir>/<dump path without extension>/<key><extension>; in the
+    export, entries are keyed "<dump path>:<key>".
+    """
+
+    def __init__(self, root, targets, output_dir=None, exporter=None, tolerant=False,
+                 patterns=("*.txt", "*.tsv")):
+        self.root = root
+        self.targets = targets
+        self.output_dir = output_dir
+        self.exporter = exporter
+        self.tolerant = tolerant
+        self.watcher = DirectoryWatcher(root, patterns)
+        self.decoder = Level5ConditionDecoder(tolerant=tolerant)
+        self.entry_hashes = {}
+
+    def run_cycle(self):
+        start = time.perf_counter()
+        stats = WatchCycleStats(self.watcher.scan())
+
+        for path in stats.changes.removed:
+            self._remove_entries(path, list(self.entry_hashes.pop(path, {})), stats)
+
+        for path in stats.changes.changed:
+            self._build_file(path, stats)
+
+        if self.exporter and stats.changes:
+            self.exporter.flush()
+
+        stats.elapsed = time.perf_counter() - start
+        return stats
+
+    def _build_file(self, path, stats):
+        previous = self.entry_hashes.get(path, {})
+        hashes = {}
+        changed = []
+
+        try:
+            for key, data in read_dump(os.path.join(self.root, path)):
+                digest = hashlib.blake2b(data.encode("utf-8"), digest_size=16).digest()
+                hashes[key] = digest
+
+                if previous.get(key) == digest:
+                    stats.entries_skipped += 1
+                else:
+                    changed.append((key, data))
+        except (OSError, UnicodeDecodeError) as e:
+            # The file may still be written, it is read again once its mtime or size changes
+            stats.errors.append(f"{path}: {e}")
+            return
+
+        self._remove_entries(path, [key for key in previous if key not in hashes], stats)
+
+        if self.exporter and changed:
+            self.exporter.delete(self._export_key(path, key) for key, _ in changed)
+
+        for key, data in changed:
+            try:
+                entry = ConditionEntry(data, key, self.tolerant, decoder=self.decoder)
+                self._write_entry(path, entry)
+                stats.entries_built += 1
+            except Exception as e:
+                # No output is left from the previous data, and the entry is built again on the next change
+                stats.errors.append(f"{path}:{key}: {e}")
+                if self.exporter:
+                    self.exporter.delete([self._export_key(path, key)])
+                self._remove_outputs(path, [key])
+                del hashes[key]
+
+        self.entry_hashes[path] = hashes
+
+    def _write_entry(self, path, entry):
+        if self.exporter:
+            self.exporter.write(self._export_key(path, entry.key), entry.conditions)
+
+        if self.output_dir:
+            directory = self._output_directory(path)
+            os.makedirs(directory, exist_ok=True)
+
+            for target in self.targets:
+                output_path = os.path.join(directory, CodeEmitter.file_name(entry.key, target))
+                with open(output_path, "w", encoding="utf-8") as f:
+                    f.write(entry.emit(target))
+
+    def _remove_entries(self, path, keys, stats):
+        if not keys:
+            return
+
+        stats.entries_removed += len(keys)
+
+        if self.exporter:
+            self.exporter.delete(self._export_key(path, key) for key in keys)
+
+        self._remove_outputs(path, keys)
+
+    def _remove_outputs(self, path, keys):
+        if self.output_dir:
+            directory = self._output_directory(path)
+            for key in keys:
+                for target in self.targets:
+                    output_path = os.path.join(directory, CodeEmitter.file_name(key, target))
+                    if os.path.exists(output_path):
+                        os.remove(output_path)
+
+            if os.path.isdir(directory) and not os.listdir(directory):
+                os.rmdir(directory)
+
+    def _output_directory(self, path):
+        return os.path.join(self.output_dir, os.path.splitext(path)[0])
+
+    @staticmethod
+    def _export_key(path, key):
+        return f"{path}:{key}"
@@ -0,0 +1,2 @@
+from .reader import CfgBinReader, CfgBinEntry, CfgBinParamType
+from .conditions import CfgBinField, read_condition_fields, read_cfg_bin_conditions
@@ -0,0 +1,82 @@
+import os
+import re
+
+from level_5.cfg_bin.reader import CfgBinReader, CfgBinParamType
+
+# Conditions start with the 4 zero bytes of their header, like the entries of a dump
+CONDITION_PATTERN = re.compile(r"^AAAAA[A-Za-z0-9+/]*={0,2}$")
+
+def is_condition(value):
+    """True for a string parameter holding a Base64 condition, at least as long as its 6-byte header"""
+    return (isinstance(value, str) and len(value) % 4 == 0
+            and len(value) * 3 // 4 - value.count("=") >= 6
+            and CONDITION_PATTERN.match(value) is not None)
+
+class CfgBinField:
+    """Where a condition was found: table, entry index and name, parameter index"""
+
+    def __init__(self, table, entry_index, entry_name, param_index):
+        self.table = table
+        self.entry_index = entry_index
+        self.entry_name = entry_name
+        self.param_index = param_index
+
+    @property
+    def name(self):
+        return f"{self.entry_name}[{self.param_index}]"
+
+    @property
+    def key(self):
+        """Key of the condition in batch outputs and exports, unique across the tables read together"""
+        return f"{self.table}.{self.entry_index}.{self.entry_name}.{self.param_index}"
+
+    def __repr__(self):
+        return f"<CfgBinField table={self.table} entry={self.entry_index} field={self.name}>"
+
+def table_name(path, root=None):
+    """
+    Name of a table in keys, without the .cfg.bin extension: the path
+    relative to the searched directory root with / separators, or the file
+    name of a file given on its own
+    """
+    name = os.path.basename(path) if root is None else os.path.relpath(path, root).replace(os.sep, "/")
+    for extension in (".cfg.bin", ".bin"):
+        if name.lower().endswith(extension):
+            return name[:-len(extension)]
+    return name
+
+def read_condition_fields(path, encoding="utf-8", table=None):
+    """Yields (CfgBinField, base64) for the condition strings of a cfg.bin table, in the order of its entries"""
+    table = table or table_name(path)
+
+    with CfgBinReader.open(path, encoding) as reader:
+        for entry in reader.entries():
+            for param_index, (param_type, value) in enumerate(zip(entry.types, entry.values)):
+                if param_type == CfgBinParamType.STRING and is_condition(value):
+                    yield CfgBinField(table, entry.index, entry.name, param_index), value
+
+def find_cfg_bins(paths):
+    """(path, table name) of the cfg.bin files of a list of files and directories, directories searched recursively"""
+    for path in paths:
+        if not os.path.isdir(path):
+            yield path, table_name(path)
+            continue
+
+        for directory, subdirectories, files in os.walk(path):
+            subdirectories.sort()
+            for name in sorted(files):
+                if name.lower().endswith(".cfg.bin"):
+                    file_path = os.path.join(directory, name)
+                    yield file_path, table_name(file_path, path)
+
+def read_cfg_bin_conditions(paths, encoding="utf-8"):
+    """Yields (key, base64) pairs of every condition of the cfg.bin files, like read_dump"""
+    tables = {}
+    for path, table in find_cfg_bins(paths):
+        if table in tables:
+            raise ValueError(f"{tables[table]} and {path} are both read as the table {table}, their entries would have the same keys")
+        tables[table] = path
+
+    for table, path in tables.items():
+        for field, data in read_condition_fields(path, encoding, table):
+            yield field.key, data
@@ -0,0 +1,161 @@
+import mmap
+
+from tools.binary_reader import BinaryDataReader
+
+class CfgBinParamType:
+    """2-bit parameter types of a cfg.bin entry"""
+
+    STRING = 0
+    INT = 1
+    FLOAT = 2
+    UNKNOWN = 3
+
+class CfgBinEntry:
+    """One entry of a cfg.bin table: its name and the values of its parameters"""
+
+    def __init__(self, index, crc32, name, types, values, offset):
+        self.index = index
+        self.crc32 = crc32
+        self.name = name
+        self.types = types
+        self.values = values
+        self.offset = offset
+
+    def __repr__(self):
+        return f"<CfgBinEntry index={self.index} name={self.name} values={self.values}>"
+
+class CfgBinReader:
+    """
+    Reads the entries of a Level-5 cfg.bin table one at a time.
+
+    Layout, little endian:
+
+    0x00  entries count, string table offset, string table length, string
+          table count (4 x int32)
+    0x10  entries: crc32 of the name, parameter count (byte), parameter
+          types (2 bits each, 4 per byte) aligned to 4 bytes, then one
+          4-byte value per parameter (an offset in the string table, -1
+          for no string, an int32 or a float)
+          string table: null terminated strings
+          key table, aligned to 16 bytes: size, key count, key strings
+          offset, key strings length (4 x int32), key count x (crc32,
+          offset of the name in the key strings)
+
+    Entries are read from the buffer as they are iterated and strings are
+    decoded when an entry using them is read, nothing else is kept in memory.
+    Files are memory-mapped by open().
+    """
+
+    HEADER_SIZE = 0x10
+
+    def __init__(self, data, name=None, encoding="utf-8"):
+        self.data = data
+        self.name = name
+        self.encoding = encoding
+        self.reader = BinaryDataReader(data, order='little')
+
+        self.entries_count = self.reader.read_int32()
+        self.string_table_offset = self.reader.read_int32()
+        self.string_table_length = self.reader.read_int32()
+        self.string_table_count = self.reader.read_int32()
+
+        if self.string_table_offset + self.string_table_length > len(data):
+            raise ValueError(f"String table at 0x{self.string_table_offset:X} is beyond the end of the file")
+
+        self.keys = self._read_key_table()
+
+    @classmethod
+    def open(cls, path, encoding="utf-8"):
+        """Reader over a memory-mapped cfg.bin file, close() releases it"""
+        with open(path, "rb") as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            return cls(data, path, encoding)
+        except Exception:
+            data.close()
+            raise
+
+    def close(self):
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def entries(self):
+        """Yields the CfgBinEntry of the table in order"""
+        reader = self.reader
+        reader.to_seek(self.HEADER_SIZE)
+
+        for index in range(self.entries_count):
+            offset = reader.offset
+            if offset >= self.string_table_offset:
+                raise ValueError(f"Entry {index} starts in the string table (0x{offset:X})")
+
+            crc32 = reader.read_int32()
+            param_count = reader.read_byte()
+
+            types = []
+            for _ in range((param_count + 3) // 4):
+                packed = reader.read_byte()
+                for shift in range(0, 8, 2):
+                    if len(types) < param_count:
+                        types.append((packed >> shift) & 3)
+
+            reader.align(4)
+
+            values = []
+            for param_type in types:
+                if param_type == CfgBinParamType.STRING:
+                    values.append(self.string(reader.read_sint32()))
+                elif param_type == CfgBinParamType.FLOAT:
+                    values.append(reader.read_float())
+                else:
+                    values.append(reader.read_sint32())
+
+            yield CfgBinEntry(index, crc32, self.keys.get(crc32, f"0x{crc32:08X}"), types, values, offset)
+
+    def string(self, offset):
+        """String at an offset of the string table, None for -1"""
+        if offset < 0:
+            return None
+        if offset >= self.string_table_length:
+            raise ValueError(f"String offset 0x{offset:X} is beyond the string table")
+
+        start = self.string_table_offset + offset
+        end = self.data.find(b"\x00", start, self.string_table_offset + self.string_table_length)
+        if end == -1:
+            end = self.string_table_offset + self.string_table_length
+
+        return self.data[start:end].decode(self.encoding, "replace")
+
+    def _read_key_table(self):
+        """crc32 -> entry name, empty when the file has no key table"""
+        start = self.string_table_offset + self.string_table_length
+        start += -start % 16
+
+        if start + 16 > len(self.data):
+            return {}
+
+        reader = BinaryDataReader(self.data, order='little')
+        reader.to_seek(start)
+        size = reader.read_int32()
+        count = reader.read_int32()
+        strings_offset = start + reader.read_int32()
+        strings_end = strings_offset + reader.read_int32()
+
+        if start + size > len(self.data) or strings_end > len(self.data):
+            raise ValueError(f"Key table at 0x{start:X} is beyond the end of the file")
+
+        keys = {}
+        for _ in range(count):
+            crc32 = reader.read_int32()
+            name_offset = strings_offset + reader.read_int32()
+            name_end = self.data.find(b"\x00", name_offset, strings_end)
+            keys[crc32] = self.data[name_offset:name_end if name_end != -1 else strings_end].decode(self.encoding, "replace")
+
+        return keys
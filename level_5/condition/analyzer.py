@@ -0,0 +1,277 @@
+from tools.chunk_executor import map_chunks
+from level_5.condition.logic import *
+from level_5.condition.canonical import canonical_block
+
+class AnalysisFinding:
+    """A problem found in the decoded conditions of an entry"""
+
+    CONTRADICTION = "contradiction"
+    DEAD_BLOCK = "dead_block"
+    NEVER_TRUE = "never_true"
+    ALWAYS_TRUE = "always_true"
+    REDUNDANT_CONDITION = "redundant_condition"
+    DUPLICATE_BLOCK = "duplicate_block"
+
+    def __init__(self, kind, block_index, condition_index, message):
+        self._kind = kind
+        self._block_index = block_index
+        self._condition_index = condition_index
+        self._message = message
+
+    @property
+    def kind(self):
+        return self._kind
+
+    @property
+    def block_index(self):
+        """Index of the block, None for findings about the whole entry"""
+        return self._block_index
+
+    @property
+    def condition_index(self):
+        """Index of the condition in its block, None for findings about a block or the entry"""
+        return self._condition_index
+
+    @property
+    def message(self):
+        return self._message
+
+    def to_dict(self):
+        return {"kind": self.kind, "block": self.block_index, "condition": self.condition_index, "message": self.message}
+
+    def __repr__(self):
+        return (f"<AnalysisFinding kind={self.kind} "
+                f"block={self.block_index} "
+                f"condition={self.condition_index} "
+                f"message={self.message!r}>")
+
+class ConditionAnalyzer:
+    """
+    Finds blocks that can never be true, entries that are always or never
+    true, and conditions or blocks that change nothing.
+
+    Every condition compares a function call with a constant, so the values
+    a call can take in a block are an interval: bool calls start as [0, 1],
+    int calls as the unsigned 32-bit range, and every comparison narrows the
+    interval. An empty interval is a contradiction. The analysis is linear
+    in the number of conditions; comparators with unknown semantics are not
+    interpreted.
+    """
+
+    INT_DOMAIN = (0, 0xFFFFFFFF)
+    BOOL_DOMAIN = (0, 1)
+
+    # Comparator applied when the constant is on the left: 5 < f() is f() > 5
+    MIRRORED = {"<": ">", ">": "<", ">=": "<=", "<=": ">=", "==": "=="}
+
+    def analyze(self, conditions):
+        """Returns the AnalysisFinding list of decoded conditions"""
+        findings = []
+        dead_blocks = 0
+        always_true = not conditions
+        seen_blocks = {}
+
+        for block_index, block in enumerate(conditions):
+            block_form = canonical_block(block)
+            if block_form in seen_blocks:
+                findings.append(AnalysisFinding(AnalysisFinding.DUPLICATE_BLOCK, block_index, None,
+                                                f"Same conditions as block {seen_blocks[block_form]}"))
+            else:
+                seen_blocks[block_form] = block_index
+
+            block_findings, dead, tautology = self._analyze_block(block_index, block)
+            findings.extend(block_findings)
+            dead_blocks += dead
+            always_true = always_true or tautology
+
+        if conditions and dead_blocks == len(conditions):
+            findings.append(AnalysisFinding(AnalysisFinding.NEVER_TRUE, None, None, "Every block can never be true"))
+        elif always_true:
+            message = "No condition" if not conditions else "A block is always true"
+            findings.append(AnalysisFinding(AnalysisFinding.ALWAYS_TRUE, None, None, message))
+
+        return findings
+
+    def _analyze_block(self, block_index, block):
+        """Returns (findings, dead, tautology) for one AND-block"""
+        findings = []
+        terms = {}
+        dead = False
+        tautology = bool(block)
+
+        for condition_index, condition in enumerate(block):
+            constraint = self.constraint(condition)
+
+            if constraint is None:
+                # Not interpreted: unknown comparator or two calls compared together
+                tautology = False
+                continue
+
+            if constraint[0] == "constant":
+                if not constraint[1]:
+                    dead = True
+                    tautology = False
+                    findings.append(AnalysisFinding(AnalysisFinding.DEAD_BLOCK, block_index, condition_index,
+                                                    f"{self._describe(condition)} is always false"))
+                else:
+                    findings.append(AnalysisFinding(AnalysisFinding.REDUNDANT_CONDITION, block_index, condition_index,
+                                                    f"{self._describe(condition)} is always true"))
+                continue
+
+            _, term, domain, interval = constraint
+            entry = terms.setdefault(term, (domain, []))
+            entry[1].append((condition_index, condition, interval))
+
+        for term, (domain, constraints) in terms.items():
+            term_findings, term_dead, term_tautology = self._analyze_term(block_index, domain, constraints)
+            findings.extend(term_findings)
+            dead = dead or term_dead
+            tautology = tautology and term_tautology
+
+        if dead:
+            tautology = False
+        return findings, dead, tautology
+
+    def _analyze_term(self, block_index, domain, constraints):
+        """Intersects the intervals of the conditions on one call"""
+        findings = []
+        total = domain
+
+        for i, (condition_index, condition, interval) in enumerate(constraints):
+            total = self.intersect(total, interval)
+            if total is None:
+                # Report the condition that empties the interval
+                others = " && ".join(self._describe(other) for _, other, _ in constraints[:i])
+                message = f"{self._describe(condition)} contradicts {others}" if others else f"{self._describe(condition)} is always false"
+                findings.append(AnalysisFinding(AnalysisFinding.CONTRADICTION, block_index, condition_index, message))
+                return findings, True, False
+
+        # A condition is needed when it sets a bound of the interval; the first of equal bounds sets it
+        low_owner = next((i for i, (_, _, interval) in enumerate(constraints) if interval[0] == total[0]), None)
+        high_owner = next((i for i, (_, _, interval) in enumerate(constraints) if interval[1] == total[1]), None)
+
+        for i, (condition_index, condition, interval) in enumerate(constraints):
+            sets_low = i == low_owner and total[0] != domain[0]
+            sets_high = i == high_owner and total[1] != domain[1]
+
+            if not sets_low and not sets_high:
+                if interval == domain:
+                    message = f"{self._describe(condition)} is always true"
+                else:
+                    message = f"{self._describe(condition)} is implied by the other conditions of the block"
+                findings.append(AnalysisFinding(AnalysisFinding.REDUNDANT_CONDITION, block_index, condition_index, message))
+
+        return findings, False, total == domain
+
+    def constraint(self, condition):
+        """
+        ("term", call, domain, interval) for a call compared with a constant,
+        ("constant", result) for two constants, None when not interpreted.
+        """
+        left = condition.operator_left
+        right = condition.operator_right
+        operator = ComparatorEnum.to_string(condition.comparator.value)
+
+        if operator not in self.MIRRORED:
+            return None
+
+        if isinstance(left, Level5Variable) and isinstance(right, Level5Variable):
+            return ("constant", self._compare(left.value, operator, right.value))
+
+        if isinstance(left, Level5Variable) and isinstance(right, Level5Function):
+            left, right = right, left
+            operator = self.MIRRORED[operator]
+
+        if not isinstance(left, Level5Function) or not isinstance(right, Level5Variable):
+            return None
+
+        term = (left.function_id, tuple((arg.lifetime.value, arg.value) for arg in left.args))
+        domain = self.BOOL_DOMAIN if left.signature.return_type == "bool" else self.INT_DOMAIN
+        interval = self.intersect(domain, self._interval(operator, right.value))
+        return ("term", term, domain, interval)
+
+    @staticmethod
+    def _interval(operator, value):
+        if operator == "==":
+            return (value, value)
+        if operator == "<":
+            return (float("-inf"), value - 1)
+        if operator == "<=":
+            return (float("-inf"), value)
+        if operator == ">":
+            return (value + 1, float("inf"))
+        return (value, float("inf"))
+
+    @staticmethod
+    def intersect(first, second):
+        if first is None or second is None:
+            return None
+        low = max(first[0], second[0])
+        high = min(first[1], second[1])
+        return (low, high) if low <= high else None
+
+    @staticmethod
+    def _compare(left, operator, right):
+        if operator == "<":
+            return left < right
+        if operator == ">":
+            return left > right
+        if operator == ">=":
+            return left >= right
+        if operator == "<=":
+            return left <= right
+        return left == right
+
+    @staticmethod
+    def _describe(condition):
+        return describe_condition(condition)
+
+def describe_condition(condition):
+    """One condition as a C expression, without the boolean simplifications of the generator"""
+    operands = []
+    for operand in (condition.operator_left, condition.operator_right):
+        if isinstance(operand, Level5Function):
+            args = ", ".join(str(arg.value) for arg in operand.args)
+            operands.append(f"{operand.signature.c_name}({args})")
+        else:
+            operands.append(str(operand.value))
+    comparator = ComparatorEnum.to_string(condition.comparator.value)
+    return f"{operands[0]} {comparator} {operands[1]}"
+
+class EntryAnalysis:
+    """Findings of one dump entry, or the error that prevented the analysis"""
+
+    def __init__(self, key, findings=None, error=None):
+        self.key = key
+        self.findings = findings or []
+        self.error = error
+
+def _analyze_chunk(chunk, tolerant, game):
+    """Decodes and analyzes a chunk of (index, key, data), run in the executor"""
+    from level_5.condition.decoder import Level5ConditionDecoder
+
+    decoder = Level5ConditionDecoder(tolerant=tolerant, game=game)
+    analyzer = ConditionAnalyzer()
+    results = []
+
+    for index, key, data in chunk:
+        try:
+            result = decoder.decode(data)
+            if result.failed:
+                results.append(EntryAnalysis(key, error=f"{result.error.reason}: {result.error.message}"))
+            else:
+                results.append(EntryAnalysis(key, analyzer.analyze(result.conditions)))
+        except Exception as e:
+            results.append(EntryAnalysis(key, error=str(e)))
+
+    return results
+
+def analyze_dump(entries, executor="thread", max_workers=None, chunk_size=256, tolerant=False, game=None):
+    """
+    Analyzes (key, Base64) entries in parallel chunks and yields EntryAnalysis
+    in order. The analysis is pure Python: threads only help on a
+    free-threaded build, use executor="process" to use several cores.
+    Chunks are decoded and analyzed in the worker, only the keys, findings
+    and errors come back.
+    """
+    return map_chunks(entries, _analyze_chunk, (tolerant, game), executor, max_workers, chunk_size=chunk_size)
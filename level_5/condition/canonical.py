@@ -0,0 +1,76 @@
+import hashlib
+
+from level_5.condition.logic import *
+
+def canonical_form(conditions):
+    """
+    Structure of decoded conditions without what does not change their logic:
+    offsets, function padding, variable names, the order of the conditions of
+    a block and the order of the blocks. Returns nested tuples of ints and
+    strings, equal for conditions that only differ by those.
+    """
+    return tuple(sorted(canonical_block(block) for block in conditions))
+
+def canonical_block(block):
+    """Canonical form of one AND-block, its conditions in a fixed order"""
+    return tuple(sorted(_canonical_condition(condition) for condition in block))
+
+def structural_hash(conditions):
+    """Stable hexadecimal hash of the canonical form, the same across runs and machines"""
+    return hashlib.blake2b(repr(canonical_form(conditions)).encode("ascii"), digest_size=16).hexdigest()
+
+def _canonical_condition(condition):
+    return (_canonical_operand(condition.operator_left),
+            _canonical_operand(condition.operator_right),
+            condition.comparator.value)
+
+def _canonical_operand(operand):
+    if isinstance(operand, Level5Function):
+        return ("f", operand.function_id, tuple(_canonical_operand(arg) for arg in operand.args))
+    elif isinstance(operand, Level5Variable):
+        return ("v", operand.lifetime.value, operand.value)
+
+    raise ValueError(f"Unsupported operand: {operand!r}")
+
+class ConditionGroup:
+    """Entries sharing one structural hash, with the conditions of the first of them"""
+
+    def __init__(self, structure_hash, conditions):
+        self.structure_hash = structure_hash
+        self.conditions = conditions
+        self.keys = []
+
+    def __repr__(self):
+        return f"<ConditionGroup hash={self.structure_hash} entries={len(self.keys)}>"
+
+class ConditionGroups:
+    """Groups a corpus by semantic identity: unique condition -> list of entry keys"""
+
+    def __init__(self):
+        self.groups = {}
+        self.entry_count = 0
+
+    def add(self, key, conditions, structure_hash=None):
+        """Adds an entry and returns (group, is_new)"""
+        if structure_hash is None:
+            structure_hash = structural_hash(conditions)
+
+        self.entry_count += 1
+        group = self.groups.get(structure_hash)
+        is_new = group is None
+
+        if is_new:
+            group = ConditionGroup(structure_hash, conditions)
+            self.groups[structure_hash] = group
+
+        group.keys.append(key)
+        return group, is_new
+
+    def __iter__(self):
+        return iter(self.groups.values())
+
+    def __len__(self):
+        return len(self.groups)
+
+    def to_dict(self):
+        return {group.structure_hash: group.keys for group in self.groups.values()}
@@ -1,72 +1,130 @@
-import os
-import sys
-import base64
+import binascii
+import warnings
 
-# Add root path to sys.path
-root_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
-if root_path not in sys.path:
-    sys.path.insert(0, root_path)
-
-# Import from root
 from tools.binary_reader import BinaryDataReader
 from level_5.condition.logic import *
+from level_5.condition.functions import FunctionRegistry
+from level_5.condition.diagnostics import Level5Diagnostic, Level5DecodeResult
+
+class Level5DecodeError(ValueError):
+    """Decoding error with the reason of the matching Level5Diagnostic"""
+    
+    def __init__(self, reason, message):
+        super().__init__(message)
+        self.reason = reason
 
 class Level5ConditionDecoder:
-    def __init__(self, data):
+    """
+    Thread safety: from_base64 and decode_base64 use a private decoder per
+    call and can run from any number of threads at once. A decoder instance
+    holds the read position and the variable numbering of its buffer, it must
+    not be shared between threads; decoding again restarts from the header.
+    
+    Batch loops should keep one instance (per thread) and call decode() for
+    every entry: the reader and the scratch lists are reused instead of being
+    allocated again.
+    """
+    
+    # Opcode values resolved once, enum lookups dominate the decoding loop otherwise
+    FUNCTION = SymbolType.FUNCTION.value
+    LOCAL_INT = SymbolType.LOCAL_INT.value
+    LOCAL_IDENT = SymbolType.LOCAL_IDENT.value
+    BLOCK_SEPARATOR = 0x8F
+    COMPARATORS = {comparator.value: comparator for comparator in ComparatorEnum}
+    TEAM_BIT_FLAG = FunctionNameEnum.GET_TEAM_BIT_FLAG.value
+    
+    # Opcodes that can follow the padding of a function without arguments
+    NEXT_OPCODES = frozenset([FUNCTION, LOCAL_INT, LOCAL_IDENT, BLOCK_SEPARATOR] + list(COMPARATORS))
+    
+    def __init__(self, data=b"", tolerant=False, game=None):
+        """
+        In tolerant mode, errors are recorded in diagnostics instead of raised:
+        the broken block is dropped and decoding resumes at the next 0x8F block
+        separator, or stops at the end of the entry when there is none.
+        Invalid Base64 or a missing header fail the whole entry, the result
+        then has an error and no conditions.
+        
+        Function ids missing from the signature table of the game are decoded
+        generically and reported as unknown_function diagnostics.
+        """
         self.reader = BinaryDataReader(data)
         self.local_var_count = 0;
+        self.tolerant = tolerant
+        self.diagnostics = []
+        self.registry = FunctionRegistry.for_game(game)
+        self._variables = []
+
+    @staticmethod
+    def from_base64(encoded_str, tolerant=False, game=None):
+        return Level5ConditionDecoder(tolerant=tolerant, game=game).decode(encoded_str).conditions
 
     @staticmethod
-    def from_base64(encoded_str):
-        decoded = base64.b64decode(encoded_str)
-        parser = Level5ConditionDecoder(decoded)
-        return parser._read_conditions()
+    def decode_base64(encoded_str, tolerant=True, game=None):
+        """Decodes an entry and returns a Level5DecodeResult with its conditions and diagnostics"""
+        return Level5ConditionDecoder(tolerant=tolerant, game=game).decode(encoded_str)
+
+    def reset(self, data):
+        """Rebinds the decoder to new bytes, keeping its reader and scratch lists"""
+        self.reader.reset(data)
+        self.local_var_count = 0
+        self._variables.clear()
+        
+        # The previous list may be held by a returned result, only replace it when used
+        if self.diagnostics:
+            self.diagnostics = []
+
+    def decode(self, encoded_str):
+        """Decodes a Base64 entry with this instance and returns a Level5DecodeResult"""
+        try:
+            decoded = binascii.a2b_base64(encoded_str)
+        except ValueError as e:
+            if not self.tolerant:
+                raise
+            diagnostic = Level5Diagnostic(None, None, Level5Diagnostic.INVALID_BASE64, str(e))
+            return Level5DecodeResult(None, [diagnostic], diagnostic)
+        
+        self.reset(decoded)
+        conditions = self._read_conditions()
+        if conditions is None:
+            return Level5DecodeResult(None, self.diagnostics, self.diagnostics[-1])
+        return Level5DecodeResult(conditions, self.diagnostics)
 
     def _read_conditions(self):
-        self.reader.to_seek(0x04)
-        block_length = self.reader.read_byte()
-        sub_count = self.reader.read_byte()
-        variables = []
+        try:
+            self.reader.to_seek(0x04)
+            block_length = self.reader.read_byte()
+            sub_count = self.reader.read_byte()
+        except ValueError as e:
+            if not self.tolerant:
+                raise
+            self._report(self.reader.offset, None, Level5Diagnostic.TRUNCATED, f"Invalid header: {e}")
+            return None
+        
+        variables = self._variables
         conditions = []
         current_block = []
         
         while self.reader.offset < self.reader.length:
+            offset = self.reader.offset
             keyword = self.reader.read_byte()
             
-            if SymbolType.is_function(keyword):
-                function = self._read_function()
-                variables.append(function)
+            try:
+                current_block = self._read_instruction(keyword, offset, variables, conditions, current_block)
+            except ValueError as e:
+                if not self.tolerant:
+                    raise
                 
-                # Special rule: if we have exactly 1 variable and it's GET_TEAM_BIT_FLAG, consume it immediately
-                if len(variables) == 1 and isinstance(variables[0], Level5Function):
-                    if variables[0].name == FunctionNameEnum.GET_TEAM_BIT_FLAG:
-                        self._create_implicit_condition(variables, current_block)
-                        
-            elif SymbolType.is_local(keyword):
-                local_variable = self._read_local_variable(f"variable{self.local_var_count}", keyword)
-                variables.append(local_variable)
-            elif ComparatorEnum.is_comparator(keyword):
-                comparator = ComparatorEnum(keyword)
+                reason = e.reason if isinstance(e, Level5DecodeError) else Level5Diagnostic.TRUNCATED
+                self._report(offset, keyword, reason, str(e))
                 
-                if len(variables) >= 2:
-                    # Determine comparator type based on variables
-                    comparator_type = self._determine_comparator_type(variables[0], variables[1])
-                    
-                    # Create a new condition using the first two variables
-                    new_condition = Level5Condition(variables[0], variables[1], comparator, comparator_type)
-                    current_block.append(new_condition)
-                    
-                    # Consume the two variables used
-                    variables.pop(0)
-                    variables.pop(0)
-                else:
-                    print("Warning: not enough variables for comparator")
-            elif keyword == 0x8F:
-                # close current condition block and start a new one
+                # Drop the broken block and resume at the next block separator
+                variables.clear()
+                current_block = []
                 
-                if current_block:
-                    conditions.append(current_block)
-                    current_block = []
+                resync_offset = self.reader.data.find(b"\x8F", offset + 1)
+                if resync_offset == -1:
+                    break
+                self.reader.to_seek(resync_offset)
         
         # If there is one variable left at the end, create a condition with == 1
         if len(variables) == 1:
@@ -78,6 +136,56 @@ class Level5ConditionDecoder:
         
         return conditions
 
+    def _read_instruction(self, keyword, offset, variables, conditions, current_block):
+        """Reads the instruction of a keyword and returns the block being filled"""
+        comparator = self.COMPARATORS.get(keyword)
+        
+        if keyword == self.FUNCTION:
+            function = self._read_function(offset)
+            variables.append(function)
+            
+            # Special rule: if we have exactly 1 variable and it's GET_TEAM_BIT_FLAG, consume it immediately
+            if len(variables) == 1 and isinstance(variables[0], Level5Function):
+                if variables[0].function_id == self.TEAM_BIT_FLAG:
+                    self._create_implicit_condition(variables, current_block)
+                    
+        elif keyword == self.LOCAL_INT or keyword == self.LOCAL_IDENT:
+            local_variable = self._read_local_variable(f"variable{self.local_var_count}", keyword, offset)
+            variables.append(local_variable)
+        elif comparator is not None:
+            
+            if len(variables) >= 2:
+                # Determine comparator type based on variables
+                comparator_type = self._determine_comparator_type(variables[0], variables[1])
+                
+                # Create a new condition using the first two variables
+                new_condition = Level5Condition(variables[0], variables[1], comparator, comparator_type, offset)
+                current_block.append(new_condition)
+                
+                # Consume the two variables used
+                variables.pop(0)
+                variables.pop(0)
+            else:
+                self._report(offset, keyword, Level5Diagnostic.MISSING_OPERANDS, "Not enough variables for comparator")
+        elif keyword == self.BLOCK_SEPARATOR:
+            # close current condition block and start a new one
+            
+            if current_block:
+                conditions.append(current_block)
+                current_block = []
+        else:
+            # Unknown opcodes are skipped
+            self._report(offset, keyword, Level5Diagnostic.UNKNOWN_OPCODE, f"Unknown opcode: 0x{keyword:02X}")
+        
+        return current_block
+
+    def _report(self, offset, opcode, reason, message):
+        self.diagnostics.append(Level5Diagnostic(offset, opcode, reason, message))
+        
+        # Problems that do not stop decoding are only warned about in strict mode
+        if not self.tolerant and reason == Level5Diagnostic.MISSING_OPERANDS:
+            warnings.warn(f"{message} at offset {offset}")
+
     def _create_implicit_condition(self, variables, current_block):
         """Creates an implicit condition with == 1 for a remaining variable"""
         # Create a local int variable with the value 1
@@ -98,52 +206,65 @@ class Level5ConditionDecoder:
         """Determine the comparator type based on the operands"""
         # Check if left operand is a function
         if isinstance(left, Level5Function):
-            return FunctionNameEnum.get_return_type(left.name.value)
+            return left.signature.return_type
         
         # Check if right operand is a function
         if isinstance(right, Level5Function):
-            return FunctionNameEnum.get_return_type(right.name.value)
+            return right.signature.return_type
         
         # Default to int if both are variables
         return "int"
 
-    def _read_local_variable(self, var_name, keyword):
-        if SymbolType.is_local_int(keyword):
+    def _read_local_variable(self, var_name, keyword, offset=None):
+        if keyword == self.LOCAL_INT:
             var_value = self.reader.read_int32()
             lifetime = SymbolType.LOCAL_INT
-        elif SymbolType.is_local_ident(keyword):
+        elif keyword == self.LOCAL_IDENT:
             var_value = self.reader.read_int32(order='little')
             lifetime = SymbolType.LOCAL_IDENT
         else:
-            raise ValueError(f"Invalid keyword: {keyword}")
+            raise Level5DecodeError(Level5Diagnostic.INVALID_LOCAL, f"Invalid keyword: {keyword}")
         
         self.local_var_count += 1
         
-        return Level5Variable(var_name, lifetime, var_value)
+        return Level5Variable(var_name, lifetime, var_value, offset)
 
-    def _read_function(self):
-        func_name_value = self.reader.read_int32()
+    def _read_function(self, offset=None):
+        func_id = self.reader.read_int32()
+        signature = self.registry.get(func_id)
         
-        try:
-            func_name = FunctionNameEnum(func_name_value)
-        except ValueError:
-            raise ValueError(f"Unknown function name: 0x{func_name_value:08X}")
+        if signature is None:
+            signature = self.registry.generic(func_id, self._guess_arg_count(func_id))
+            self._report(offset, self.FUNCTION, Level5Diagnostic.UNKNOWN_FUNCTION,
+                         f"Unknown function 0x{func_id:08X} decoded with {signature.arg_count} argument(s)")
         
         func_args = []
-        
-        func_arg_count = FunctionArgEnum.get_arg_count(func_name_value)
-        
-        if func_arg_count is None:
-            raise ValueError(f"No argument count found for function: {func_name.name}")
+        func_arg_count = signature.arg_count
         
         if func_arg_count == 0:
-            self.reader.skip(3)
+            padding = self.reader.read_bytes(3)
         else:
-            self.reader.skip(7)
+            padding = self.reader.read_bytes(7)
         
         for i in range(func_arg_count):
+            arg_offset = self.reader.offset
             arg_keyword = self.reader.read_byte()
-            arg = self._read_local_variable(f"variable{self.local_var_count}", arg_keyword)
+            arg = self._read_local_variable(f"variable{self.local_var_count}", arg_keyword, arg_offset)
             func_args.append(arg)
         
-        return Level5Function(func_name, func_args)
\ No newline at end of file
+        return Level5Function(signature, func_args, offset, padding)
+
+    def _guess_arg_count(self, func_id):
+        """Arity of an unknown function from the layout of the bytes after its id"""
+        data = self.reader.data
+        offset = self.reader.offset
+        
+        # No argument: 3 padding bytes then the next instruction or the end
+        if offset + 3 >= len(data) or data[offset + 3] in self.NEXT_OPCODES:
+            return 0
+        
+        # One argument: 7 padding bytes then a local
+        if offset + 7 < len(data) and data[offset + 7] in (self.LOCAL_INT, self.LOCAL_IDENT):
+            return 1
+        
+        raise Level5DecodeError(Level5Diagnostic.UNKNOWN_FUNCTION, f"Unknown function 0x{func_id:08X} with unrecognized arguments")
\ No newline at end of file
@@ -0,0 +1,109 @@
+class Level5Diagnostic:
+    """A problem found while decoding, at a byte offset of the decoded data"""
+
+    INVALID_BASE64 = "invalid_base64"
+    TRUNCATED = "truncated"
+    UNKNOWN_FUNCTION = "unknown_function"
+    INVALID_LOCAL = "invalid_local"
+    MISSING_OPERANDS = "missing_operands"
+    UNKNOWN_OPCODE = "unknown_opcode"
+
+    def __init__(self, offset, opcode, reason, message):
+        self._offset = offset
+        self._opcode = opcode
+        self._reason = reason
+        self._message = message
+
+    @property
+    def offset(self):
+        return self._offset
+
+    @property
+    def opcode(self):
+        return self._opcode
+
+    @property
+    def reason(self):
+        return self._reason
+
+    @property
+    def message(self):
+        return self._message
+
+    def to_dict(self):
+        return {"offset": self.offset, "opcode": self.opcode, "reason": self.reason, "message": self.message}
+
+    def __repr__(self):
+        opcode = "None" if self.opcode is None else f"0x{self.opcode:02X}"
+        return (f"<Level5Diagnostic offset={self.offset} "
+                f"opcode={opcode} "
+                f"reason={self.reason} "
+                f"message={self.message!r}>")
+
+class Level5DecodeResult:
+    """
+    Conditions decoded from one entry with the diagnostics reported while decoding.
+
+    An entry that could not be decoded at all (invalid Base64 or no header)
+    has the diagnostic as its error and None as conditions: no blocks would
+    read as a condition that is always true.
+    """
+
+    def __init__(self, conditions, diagnostics, error=None):
+        self._conditions = conditions
+        self._diagnostics = diagnostics
+        self._error = error
+
+    @property
+    def conditions(self):
+        return self._conditions
+
+    @property
+    def error(self):
+        return self._error
+
+    @property
+    def failed(self):
+        return self._error is not None
+
+    @property
+    def diagnostics(self):
+        return self._diagnostics
+
+    @property
+    def ok(self):
+        return not self._diagnostics
+
+class DiagnosticSummary:
+    """Counts diagnostics by reason over a batch and keeps a few example entries"""
+
+    def __init__(self, max_examples=5):
+        self.max_examples = max_examples
+        self.entry_count = 0
+        self.failed_entries = 0
+        self.counts = {}
+        self.examples = {}
+
+    def add(self, key, diagnostics):
+        self.entry_count += 1
+
+        if not diagnostics:
+            return
+
+        self.failed_entries += 1
+        for diagnostic in diagnostics:
+            self.counts[diagnostic.reason] = self.counts.get(diagnostic.reason, 0) + 1
+
+            examples = self.examples.setdefault(diagnostic.reason, [])
+            if len(examples) < self.max_examples:
+                examples.append((key, diagnostic))
+
+    def format(self):
+        lines = [f"{self.failed_entries} of {self.entry_count} entries reported diagnostics"]
+
+        for reason, count in sorted(self.counts.items(), key=lambda item: item[1], reverse=True):
+            lines.append(f"  {reason}: {count}")
+            for key, diagnostic in self.examples[reason]:
+                lines.append(f"    entry {key} at offset {diagnostic.offset}: {diagnostic.message}")
+
+        return "\n".join(lines)
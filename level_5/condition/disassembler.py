@@ -0,0 +1,172 @@
+import binascii
+
+from level_5.condition.logic import *
+from level_5.condition.decoder import Level5ConditionDecoder, Level5DecodeError
+from level_5.condition.diagnostics import Level5Diagnostic
+from level_5.condition.analyzer import describe_condition
+from level_5.condition.opcode_stats import opcode_name
+
+class DisassemblyLine:
+    """
+    One line of a listing: the bytes at an offset and what they are.
+
+    kind is "header", "opcode", "padding", "argument", "skipped" (bytes
+    dropped after an error, up to the next block separator), "note"
+    (conditions created without an opcode of their own, no bytes) or
+    "error" (no offset).
+    """
+
+    HEADER = "header"
+    OPCODE = "opcode"
+    PADDING = "padding"
+    ARGUMENT = "argument"
+    SKIPPED = "skipped"
+    NOTE = "note"
+    ERROR = "error"
+
+    BYTES_PER_ROW = 8
+
+    def __init__(self, offset, data, kind, text):
+        self.offset = offset
+        self.data = data
+        self.kind = kind
+        self.text = text
+
+    def format(self):
+        """The line as "offset  bytes  text", bytes past 8 are continued on the following rows"""
+        offset = "" if self.offset is None else f"{self.offset:04X}"
+        rows = [self.data[start:start + self.BYTES_PER_ROW] for start in range(0, len(self.data), self.BYTES_PER_ROW)] or [b""]
+        width = self.BYTES_PER_ROW * 3 - 1
+
+        lines = [f"{offset:>6}  {rows[0].hex(' ').upper():<{width}}  {self.text}"]
+        for index, row in enumerate(rows[1:], 1):
+            row_offset = f"{self.offset + index * self.BYTES_PER_ROW:04X}"
+            lines.append(f"{row_offset:>6}  {row.hex(' ').upper()}")
+        return "\n".join(lines)
+
+    def to_dict(self):
+        return {"offset": self.offset, "data": self.data.hex(), "kind": self.kind, "text": self.text}
+
+    def __repr__(self):
+        return f"<DisassemblyLine offset={self.offset} kind={self.kind} text={self.text!r}>"
+
+class Level5ConditionDisassembler(Level5ConditionDecoder):
+    """
+    Annotated listing of an entry, instruction by instruction.
+
+    Instructions go through the same _read_instruction as the decoder, so
+    arities, unknown function guesses, implicit == 1 conditions and the
+    resync after errors are the decoder's; the listing only adds the bytes
+    read for each of them. Lines are yielded as they are read.
+
+    Tolerant by default: a listing is mostly wanted for entries that do not
+    decode.
+    """
+
+    def __init__(self, tolerant=True, game=None):
+        super().__init__(tolerant=tolerant, game=game)
+
+    def disassemble(self, encoded_str):
+        """Yields the DisassemblyLine of a Base64 entry"""
+        try:
+            decoded = binascii.a2b_base64(encoded_str)
+        except ValueError as e:
+            if not self.tolerant:
+                raise
+            self.reset(b"")
+            self._report(None, None, Level5Diagnostic.INVALID_BASE64, str(e))
+            yield DisassemblyLine(None, b"", DisassemblyLine.ERROR, f"{Level5Diagnostic.INVALID_BASE64}: {e}")
+            return
+
+        yield from self.disassemble_bytes(decoded)
+
+    def disassemble_bytes(self, data):
+        """Yields the DisassemblyLine of decoded bytes"""
+        self.reset(data)
+        reader = self.reader
+
+        if len(data) < 6:
+            message = f"Invalid header: {len(data)} bytes"
+            if not self.tolerant:
+                raise Level5DecodeError(Level5Diagnostic.TRUNCATED, message)
+            self._report(0, None, Level5Diagnostic.TRUNCATED, message)
+            yield DisassemblyLine(0, bytes(data), DisassemblyLine.SKIPPED, f"{Level5Diagnostic.TRUNCATED}: {message}")
+            return
+
+        yield DisassemblyLine(0, bytes(data[:6]), DisassemblyLine.HEADER, f"HEADER length={data[4]} count={data[5]}")
+        reader.to_seek(6)
+
+        variables = self._variables
+        conditions = []
+        current_block = []
+
+        while reader.offset < reader.length:
+            offset = reader.offset
+            keyword = reader.read_byte()
+            block = current_block
+            block_size = len(block)
+            diagnostic_count = len(self.diagnostics)
+
+            try:
+                current_block = self._read_instruction(keyword, offset, variables, conditions, current_block)
+            except ValueError as e:
+                if not self.tolerant:
+                    raise
+
+                reason = e.reason if isinstance(e, Level5DecodeError) else Level5Diagnostic.TRUNCATED
+                self._report(offset, keyword, reason, str(e))
+                variables.clear()
+                current_block = []
+
+                resync_offset = data.find(b"\x8F", offset + 1)
+                end = len(data) if resync_offset == -1 else resync_offset
+                yield DisassemblyLine(offset, bytes(data[offset:end]), DisassemblyLine.SKIPPED,
+                                      f"{reason}: {e}, block dropped")
+                if resync_offset == -1:
+                    break
+                reader.to_seek(resync_offset)
+                continue
+
+            created = block[block_size:] if current_block is block else []
+            diagnostics = self.diagnostics[diagnostic_count:]
+            yield from self._instruction_lines(data, offset, keyword, variables, conditions, created, diagnostics)
+
+        if len(variables) == 1:
+            self._create_implicit_condition(variables, current_block)
+            yield DisassemblyLine(reader.offset, b"", DisassemblyLine.NOTE, f"end: {describe_condition(current_block[-1])} (implicit)")
+        elif variables:
+            yield DisassemblyLine(reader.offset, b"", DisassemblyLine.NOTE, f"end: {len(variables)} operands not compared")
+
+    def _instruction_lines(self, data, offset, keyword, variables, conditions, created, diagnostics):
+        name = opcode_name(keyword)
+        notes = "".join(f", {diagnostic.reason}" for diagnostic in diagnostics)
+
+        if keyword == self.FUNCTION:
+            function = created[0].operator_left if created else variables[-1]
+            signature = function.signature
+            arguments = "argument" if signature.arg_count == 1 else "arguments"
+            yield DisassemblyLine(offset, bytes(data[offset:offset + 5]), DisassemblyLine.OPCODE,
+                                  f"{name} {signature.c_name} 0x{signature.id:08X}, {signature.arg_count} {arguments}{notes}")
+            yield DisassemblyLine(offset + 5, bytes(function.padding), DisassemblyLine.PADDING, "  padding")
+
+            for index, arg in enumerate(function.args, 1):
+                yield DisassemblyLine(arg.offset, bytes(data[arg.offset:arg.offset + 5]), DisassemblyLine.ARGUMENT,
+                                      f"  {arg.lifetime.name} {arg.value} (argument {index})")
+
+            for condition in created:
+                yield DisassemblyLine(self.reader.offset, b"", DisassemblyLine.NOTE, f"  {describe_condition(condition)} (implicit)")
+        elif keyword == self.LOCAL_INT or keyword == self.LOCAL_IDENT:
+            yield DisassemblyLine(offset, bytes(data[offset:offset + 5]), DisassemblyLine.OPCODE, f"{name} {variables[-1].value}")
+        elif keyword in self.COMPARATORS:
+            text = describe_condition(created[0]) if created else "not enough operands"
+            yield DisassemblyLine(offset, bytes(data[offset:offset + 1]), DisassemblyLine.OPCODE, f"{name}  {text}")
+        elif keyword == self.BLOCK_SEPARATOR:
+            yield DisassemblyLine(offset, bytes(data[offset:offset + 1]), DisassemblyLine.OPCODE, f"{name}  blocks: {len(conditions)}")
+        else:
+            yield DisassemblyLine(offset, bytes(data[offset:offset + 1]), DisassemblyLine.OPCODE, f"0x{keyword:02X} unknown opcode, skipped")
+
+def format_listing(encoded_str, key=None, game=None):
+    """Listing of a Base64 entry as text"""
+    lines = [] if key is None else [f"// Entry {key}"]
+    lines.extend(line.format() for line in Level5ConditionDisassembler(game=game).disassemble(encoded_str))
+    return "\n".join(lines)
@@ -0,0 +1,81 @@
+import os
+import mmap
+
+def read_dump(path):
+    """
+    Yields (key, base64) pairs from a condition dump file.
+    Each non-empty line holds one condition, optionally preceded by a key and
+    a tab or space. Lines without a key are keyed by their line number.
+    Lines starting with # are ignored.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        yield from parse_dump_lines(f)
+
+def read_dump_chunks(path, chunk_size=1 << 22):
+    """
+    Yields lists of (key, base64) pairs from a dump file, reading it through
+    a memory map about chunk_size bytes at a time. Keys are the same as with
+    read_dump, the Base64 data is returned as ASCII bytes.
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            start = 0
+            line_number = 0
+
+            while start < len(mapped):
+                # Chunks end on a line break so no line is split
+                end = mapped.find(b"\n", min(start + chunk_size, len(mapped)) - 1)
+                end = len(mapped) if end == -1 else end + 1
+
+                entries = []
+                for line in mapped[start:end].splitlines():
+                    line_number += 1
+                    line = line.strip()
+
+                    if not line or line.startswith(b"#"):
+                        continue
+
+                    parts = line.split(None, 1)
+
+                    if len(parts) == 2:
+                        entries.append((parts[0].decode("utf-8"), parts[1].strip()))
+                    else:
+                        entries.append((str(line_number), parts[0]))
+
+                yield entries
+                start = end
+
+def parse_dump_lines(lines):
+    """Yields (key, base64) pairs from the lines of a dump, see read_dump"""
+    for line_number, line in enumerate(lines, 1):
+        line = line.strip()
+
+        if not line or line.startswith("#"):
+            continue
+
+        parts = line.split(None, 1)
+
+        if len(parts) == 2:
+            yield parts[0], parts[1].strip()
+        else:
+            yield str(line_number), parts[0]
+
+def split_conditions(text):
+    """
+    Splits pasted text into (key, base64) pairs.
+    Text with several lines is read as a dump when every line holds a whole
+    condition (they all start with the 4 zero bytes of the header), otherwise
+    the text is a single condition that may be wrapped over several lines.
+    """
+    text = text.strip()
+    lines = [line for line in text.splitlines() if line.strip()]
+
+    if len(lines) > 1:
+        entries = list(parse_dump_lines(lines))
+        if all(data.startswith("AAAAA") for _, data in entries):
+            return entries
+
+    return [("1", text)]
@@ -0,0 +1,261 @@
+import hashlib
+import binascii
+from collections import Counter
+
+from level_5.condition.logic import *
+from level_5.condition.dump import read_dump
+from level_5.condition.canonical import canonical_block, structural_hash
+from level_5.condition.analyzer import describe_condition
+from level_5.condition.decoder import Level5ConditionDecoder
+
+def hash_dump(path):
+    """Returns {key: digest} of the raw condition bytes of every entry of a dump"""
+    hashes = {}
+
+    for key, data in read_dump(path):
+        try:
+            raw = binascii.a2b_base64(data)
+        except ValueError:
+            # Invalid Base64 is compared as text
+            raw = data.encode("utf-8", "replace")
+        hashes[key] = hashlib.blake2b(raw, digest_size=16).digest()
+
+    return hashes
+
+class DumpDiff:
+    """
+    Differences between two condition dumps, entry by entry.
+
+    Entries are first compared by a hash of their raw bytes, only entries
+    whose bytes changed are decoded. Their decoded conditions are then
+    compared: entries with the same structural hash are equivalent, other
+    ones get a list of semantic changes.
+    """
+
+    def __init__(self, old_path, new_path):
+        self.old_path = old_path
+        self.new_path = new_path
+        self.added = []
+        self.removed = []
+        self.unchanged = 0
+        self.changed = []
+
+    @classmethod
+    def compare(cls, old_path, new_path, game=None):
+        diff = cls(old_path, new_path)
+        old_hashes = hash_dump(old_path)
+        new_hashes = hash_dump(new_path)
+
+        changed_keys = set()
+        for key, digest in new_hashes.items():
+            old_digest = old_hashes.get(key)
+            if old_digest is None:
+                diff.added.append(key)
+            elif old_digest == digest:
+                diff.unchanged += 1
+            else:
+                changed_keys.add(key)
+        diff.removed = [key for key in old_hashes if key not in new_hashes]
+
+        if changed_keys:
+            old_data = {key: data for key, data in read_dump(old_path) if key in changed_keys}
+            decoder = Level5ConditionDecoder(game=game)
+
+            for key, data in read_dump(new_path):
+                if key in changed_keys:
+                    diff.changed.append(EntryDiff.compare(key, old_data[key], data, decoder))
+
+        return diff
+
+    def to_dict(self):
+        return {
+            "old": self.old_path,
+            "new": self.new_path,
+            "added": self.added,
+            "removed": self.removed,
+            "unchanged": self.unchanged,
+            "changed": [entry.to_dict() for entry in self.changed]
+        }
+
+    def format(self):
+        lines = [f"+ {key}" for key in self.added]
+        lines += [f"- {key}" for key in self.removed]
+
+        for entry in self.changed:
+            lines.extend(entry.format())
+
+        lines.append(f"{self.unchanged} unchanged, {len(self.added)} added, "
+                     f"{len(self.removed)} removed, {len(self.changed)} changed")
+        return "\n".join(lines)
+
+class EntryDiff:
+    """Semantic changes of one entry present in both dumps with different bytes"""
+
+    CHANGED = "changed"
+    EQUIVALENT = "equivalent"
+    ERROR = "error"
+
+    def __init__(self, key, status, changes=None, error=None):
+        self.key = key
+        self.status = status
+        self.changes = changes or []
+        self.error = error
+
+    @classmethod
+    def compare(cls, key, old_data, new_data, decoder):
+        try:
+            old_conditions = decoder.decode(old_data).conditions
+            new_conditions = decoder.decode(new_data).conditions
+        except Exception as e:
+            return cls(key, cls.ERROR, error=str(e))
+
+        if structural_hash(old_conditions) == structural_hash(new_conditions):
+            return cls(key, cls.EQUIVALENT)
+
+        return cls(key, cls.CHANGED, diff_conditions(old_conditions, new_conditions))
+
+    def to_dict(self):
+        record = {"key": self.key, "status": self.status}
+        if self.status == self.CHANGED:
+            record["changes"] = [change.to_dict() for change in self.changes]
+        elif self.status == self.ERROR:
+            record["error"] = self.error
+        return record
+
+    def format(self):
+        if self.status == self.EQUIVALENT:
+            return [f"= {self.key} (same conditions, bytes differ in padding, header or order)"]
+        if self.status == self.ERROR:
+            return [f"! {self.key}: {self.error}"]
+        return [f"~ {self.key}"] + [f"    {change.format()}" for change in self.changes]
+
+class ConditionChange:
+    """One semantic change between the old and new conditions of an entry"""
+
+    BLOCK_ADDED = "block_added"
+    BLOCK_REMOVED = "block_removed"
+    FLAG_CHANGED = "flag_changed"
+    ITEM_CHANGED = "item_changed"
+    SUB_PHASE_CHANGED = "sub_phase_changed"
+    VALUE_CHANGED = "value_changed"
+    ARGUMENT_CHANGED = "argument_changed"
+    COMPARATOR_CHANGED = "comparator_changed"
+
+    def __init__(self, kind, block_index, old=None, new=None):
+        self.kind = kind
+        self.block_index = block_index
+        self.old = old
+        self.new = new
+
+    def to_dict(self):
+        return {"kind": self.kind, "block": self.block_index, "old": self.old, "new": self.new}
+
+    def format(self):
+        if self.old is None:
+            return f"{self.kind} (block {self.block_index}): {self.new}"
+        if self.new is None:
+            return f"{self.kind} (block {self.block_index}): {self.old}"
+        return f"{self.kind} (block {self.block_index}): {self.old} -> {self.new}"
+
+FLAG_FUNCTIONS = (FunctionNameEnum.GET_GLOBAL_BIT_FLAG.value, FunctionNameEnum.GET_TEAM_BIT_FLAG.value)
+
+def diff_conditions(old_conditions, new_conditions):
+    """
+    Returns the ConditionChange list between two decoded conditions. Blocks
+    present on one side only are paired by shape (the same calls in the same
+    places) to report changed flags, items, thresholds and comparators, the
+    other ones are reported as added or removed. Block indexes are those of
+    the new conditions, or of the old ones for removed blocks.
+
+    Blocks are compared as multisets: a block repeated more times on one
+    side is added or removed once per extra copy.
+    """
+    old_forms = [canonical_block(block) for block in old_conditions]
+    new_forms = [canonical_block(block) for block in new_conditions]
+
+    removed = _unmatched(old_forms, Counter(new_forms))
+    added = _unmatched(new_forms, Counter(old_forms))
+
+    # Pair removed and added blocks of the same shape, in order
+    removed_by_shape = {}
+    for index in removed:
+        removed_by_shape.setdefault(_block_shape(old_conditions[index]), []).append(index)
+
+    changes = []
+    for new_index in added:
+        new_block = new_conditions[new_index]
+        candidates = removed_by_shape.get(_block_shape(new_block))
+
+        if candidates:
+            old_block = old_conditions[candidates.pop(0)]
+            changes.extend(_diff_blocks(new_index, old_block, new_block))
+        else:
+            changes.append(ConditionChange(ConditionChange.BLOCK_ADDED, new_index, new=_describe_block(new_block)))
+
+    for candidates in removed_by_shape.values():
+        for old_index in candidates:
+            changes.append(ConditionChange(ConditionChange.BLOCK_REMOVED, old_index, old=_describe_block(old_conditions[old_index])))
+
+    return changes
+
+def _unmatched(forms, other_counts):
+    """Indexes of the forms left once each one is matched with a copy on the other side, in order"""
+    unmatched = []
+    for index, form in enumerate(forms):
+        if other_counts[form]:
+            other_counts[form] -= 1
+        else:
+            unmatched.append(index)
+    return unmatched
+
+def _diff_blocks(block_index, old_block, new_block):
+    changes = []
+
+    for old, new in zip(_ordered_by_shape(old_block), _ordered_by_shape(new_block)):
+        if old.comparator != new.comparator:
+            changes.append(ConditionChange(ConditionChange.COMPARATOR_CHANGED, block_index,
+                                           describe_condition(old), describe_condition(new)))
+            continue
+
+        for old_operand, new_operand, other in ((old.operator_left, new.operator_left, new.operator_right),
+                                                (old.operator_right, new.operator_right, new.operator_left)):
+            if isinstance(new_operand, Level5Function):
+                if [arg.value for arg in old_operand.args] != [arg.value for arg in new_operand.args]:
+                    changes.append(ConditionChange(_argument_change_kind(new_operand), block_index,
+                                                   describe_condition(old), describe_condition(new)))
+            elif old_operand.value != new_operand.value:
+                changes.append(ConditionChange(_value_change_kind(other), block_index,
+                                               describe_condition(old), describe_condition(new)))
+
+    return changes
+
+def _argument_change_kind(function):
+    if function.function_id in FLAG_FUNCTIONS:
+        return ConditionChange.FLAG_CHANGED
+    if function.function_id == FunctionNameEnum.IS_HAVE_ITEM.value:
+        return ConditionChange.ITEM_CHANGED
+    return ConditionChange.ARGUMENT_CHANGED
+
+def _value_change_kind(other):
+    if isinstance(other, Level5Function) and other.function_id == FunctionNameEnum.GET_GAME_SUB_PHASE.value:
+        return ConditionChange.SUB_PHASE_CHANGED
+    return ConditionChange.VALUE_CHANGED
+
+def _operand_shape(operand):
+    if isinstance(operand, Level5Function):
+        return ("f", operand.function_id, len(operand.args))
+    return ("v",)
+
+def _condition_shape(condition):
+    return (_operand_shape(condition.operator_left), _operand_shape(condition.operator_right))
+
+def _block_shape(block):
+    return tuple(sorted(_condition_shape(condition) for condition in block))
+
+def _ordered_by_shape(block):
+    """Conditions sorted by shape, keeping the block order between conditions of the same shape"""
+    return [condition for _, _, condition in
+            sorted((_condition_shape(condition), index, condition) for index, condition in enumerate(block))]
+
+def _describe_block(block):
+    return " && ".join(describe_condition(condition) for condition in block)
@@ -0,0 +1,123 @@
+import base64
+
+from tools.binary_writer import BinaryDataWriter
+from level_5.condition.logic import *
+
+class Level5ConditionEncoder:
+    """
+    Encodes a list of condition blocks back to the binary format read by
+    Level5ConditionDecoder.
+
+    The meaning of the two header bytes and of the bytes following a function
+    name is not known. Padding decoded from game data is written back as is,
+    otherwise the padding every function of the same arity has in game data.
+    """
+
+    # Byte following the length in the header, 0x05 in every entry seen so far
+    HEADER_BYTE = 0x05
+
+    DEFAULT_PADDING = {
+        0: b"\x00\x01\x00",
+        1: b"\x00\x02\x00\x00\x00\x00\x00"
+    }
+
+    def __init__(self, conditions):
+        self.conditions = conditions
+        self.writer = BinaryDataWriter()
+
+    @staticmethod
+    def to_base64(conditions):
+        encoder = Level5ConditionEncoder(conditions)
+        return base64.b64encode(encoder.encode()).decode("ascii")
+
+    def encode(self):
+        self.writer.skip(0x06)
+
+        for i, block in enumerate(self.conditions):
+            if i > 0:
+                # Close the previous condition block
+                self._write_instruction(0x8F)
+
+            for condition in block:
+                self._write_condition(condition)
+
+        # Header: 4 unknown bytes, then the length following the length byte and an unknown constant
+        length = self.writer.length - 0x05
+        if length > 0xFF:
+            raise ValueError(f"Condition too long: {length} bytes after the length byte, at most 255 can be encoded")
+
+        self.writer.to_seek(0x04)
+        self.writer.write_byte(length)
+        self.writer.write_byte(self.HEADER_BYTE)
+
+        return self.writer.data
+
+    def _write_condition(self, condition):
+        left = condition.operator_left
+        right = condition.operator_right
+
+        if self._is_implicit(condition):
+            # The decoder compares a lone team bit flag with 1 by itself
+            self._write_operand(left)
+            return
+
+        if isinstance(left, Level5Function) and left.function_id == FunctionNameEnum.GET_TEAM_BIT_FLAG.value:
+            raise ValueError("getTeamBitFlag can only be encoded as an implicit == 1 condition")
+
+        self._write_operand(left)
+        self._write_operand(right)
+        self._write_instruction(condition.comparator.value)
+
+    def _is_implicit(self, condition):
+        left = condition.operator_left
+        right = condition.operator_right
+
+        return (isinstance(left, Level5Function)
+                and left.function_id == FunctionNameEnum.GET_TEAM_BIT_FLAG.value
+                and isinstance(right, Level5Variable)
+                and right.value == 1
+                and condition.comparator == ComparatorEnum.EQUAL)
+
+    def _write_operand(self, operand):
+        if isinstance(operand, Level5Function):
+            self._write_function(operand)
+        elif isinstance(operand, Level5Variable):
+            self._write_variable(operand)
+        else:
+            raise ValueError(f"Unsupported operand: {operand!r}")
+
+    def _write_function(self, function):
+        signature = function.signature
+        arg_count = signature.arg_count
+
+        if arg_count is None:
+            # Generic signatures parsed from a name have no table arity, the call decides it
+            arg_count = len(function.args)
+        if arg_count != len(function.args):
+            raise ValueError(f"{signature.name} expects {arg_count} argument(s), got {len(function.args)}")
+        if arg_count > 1:
+            raise ValueError(f"{signature.name} has {arg_count} arguments, only 0 or 1 can be encoded")
+
+        padding = function.padding
+        if padding is None or len(padding) != len(self.DEFAULT_PADDING[min(arg_count, 1)]):
+            padding = self.DEFAULT_PADDING[min(arg_count, 1)]
+
+        self._write_instruction(SymbolType.FUNCTION.value)
+        self.writer.write_int32(function.function_id)
+        self.writer.write_bytes(padding)
+
+        for arg in function.args:
+            self._write_variable(arg)
+
+    def _write_variable(self, variable):
+        self._write_instruction(variable.lifetime.value)
+
+        if variable.lifetime == SymbolType.LOCAL_IDENT:
+            self.writer.write_int32(variable.value, order='little')
+        elif variable.lifetime == SymbolType.LOCAL_INT:
+            self.writer.write_int32(variable.value)
+        else:
+            raise ValueError(f"Invalid variable lifetime: {variable.lifetime}")
+
+    def _write_instruction(self, opcode):
+        self.writer.write_byte(opcode)
@@ -0,0 +1,384 @@
+from bisect import bisect_left, bisect_right
+
+from level_5.condition.logic import *
+from level_5.condition.analyzer import ConditionAnalyzer
+
+FLAG = "flag"
+TEAM_FLAG = "team_flag"
+ITEM = "item"
+SUB_PHASE = "sub_phase"
+
+# Functions read as a state of the game, the argument names the flag or item
+STATE_FUNCTIONS = {
+    FunctionNameEnum.GET_GLOBAL_BIT_FLAG.value: FLAG,
+    FunctionNameEnum.GET_TEAM_BIT_FLAG.value: TEAM_FLAG,
+    FunctionNameEnum.IS_HAVE_ITEM.value: ITEM,
+}
+
+def parse_atom(text):
+    """("flag", 77) from "flag:77", hexadecimal values are accepted; "team" and "phase" are short for team_flag and sub_phase"""
+    kind, _, value = text.strip().partition(":")
+    kind = {"team": TEAM_FLAG, "phase": SUB_PHASE}.get(kind, kind)
+
+    if kind not in (FLAG, TEAM_FLAG, ITEM, SUB_PHASE) or not value:
+        raise ValueError(f"Invalid state {text!r}, expected flag:N, team:N, item:N or phase:N")
+    return kind, int(value, 0)
+
+def format_atom(atom):
+    return f"{atom[0]}:{atom[1]}"
+
+def _bits(mask):
+    """Indexes of the set bits of an int, lowest first"""
+    if mask.bit_count() < 64:
+        indexes = []
+        while mask:
+            low = mask & -mask
+            indexes.append(low.bit_length() - 1)
+            mask ^= low
+        return indexes
+
+    data = mask.to_bytes((mask.bit_length() + 7) // 8, "little")
+    return [position * 8 + bit for position, byte in enumerate(data) if byte
+            for bit in range(8) if byte >> bit & 1]
+
+def _mask(indexes):
+    """Int with the bits of indexes set, built in one pass instead of one shift per bit"""
+    indexes = list(indexes)
+    if not indexes:
+        return 0
+
+    data = bytearray(max(indexes) // 8 + 1)
+    for index in indexes:
+        data[index >> 3] |= 1 << (index & 7)
+    return int.from_bytes(data, "little")
+
+class DependencyGraph:
+    """
+    Links every flag, team flag, item and sub-phase threshold to the blocks
+    and entries that depend on it.
+
+    Each AND-block is reduced to the atoms it needs set, the atoms it needs
+    clear and a sub-phase interval; an entry is active when one of its
+    blocks is. Blocks comparing anything else (unknown functions, ??
+    comparators, two calls) cannot be evaluated and are never active, blocks
+    that can never be true are dropped. An entry without blocks is always
+    true, like in the generated code: it gets one block with no requirement,
+    active in every state. Sets of blocks are Python ints used
+    as bitsets, one bit per block.
+    """
+
+    def __init__(self):
+        self.keys = []
+        self.block_entry = []
+        self.entry_ranges = []
+        self.required_counts = []
+        self.phase_ranges = []
+        self.opaque_blocks = 0
+        self.dead_blocks = 0
+        self._analyzer = ConditionAnalyzer()
+
+        # Block indexes are collected while adding, the bitsets are built once when first needed
+        self._required_blocks = {}
+        self._forbidden_blocks = {}
+        self._evaluable_blocks = []
+        self._bitsets = None
+
+    @property
+    def requires(self):
+        """atom -> bitset of the blocks that need it set"""
+        return self._build_bitsets()[0]
+
+    @property
+    def forbids(self):
+        """atom -> bitset of the blocks that need it clear"""
+        return self._build_bitsets()[1]
+
+    @property
+    def evaluable(self):
+        """Bitset of the blocks that can be evaluated"""
+        return self._build_bitsets()[2]
+
+    def _build_bitsets(self):
+        if self._bitsets is None:
+            self._bitsets = ({atom: _mask(indexes) for atom, indexes in self._required_blocks.items()},
+                             {atom: _mask(indexes) for atom, indexes in self._forbidden_blocks.items()},
+                             _mask(self._evaluable_blocks))
+        return self._bitsets
+
+    @classmethod
+    def from_entries(cls, entries):
+        """Graph of (key, conditions) pairs"""
+        graph = cls()
+        for key, conditions in entries:
+            graph.add(key, conditions)
+        return graph
+
+    @classmethod
+    def from_source(cls, source, tolerant=False, game=None):
+        """Graph of (key, base64) pairs, decoded with one decoder; entries that cannot be decoded are left out"""
+        from level_5.condition.decoder import Level5ConditionDecoder
+
+        decoder = Level5ConditionDecoder(tolerant=tolerant, game=game)
+        results = ((key, decoder.decode(data)) for key, data in source)
+        return cls.from_entries((key, result.conditions) for key, result in results if not result.failed)
+
+    @property
+    def block_count(self):
+        return len(self.block_entry)
+
+    def add(self, key, conditions):
+        entry = len(self.keys)
+        first_block = len(self.block_entry)
+        self.keys.append(key)
+        self._bitsets = None
+
+        # No blocks is a condition that is always true, an empty block is always active
+        for block in conditions or [[]]:
+            reduced = self._reduce_block(block)
+            if reduced is None:
+                self.dead_blocks += 1
+                continue
+
+            # The blocks of an entry are consecutive, an entry is (first block, block count)
+            index = len(self.block_entry)
+            self.block_entry.append(entry)
+
+            if reduced is False:
+                self.opaque_blocks += 1
+                self.required_counts.append(0)
+                self.phase_ranges.append(None)
+                continue
+
+            required, forbidden, phase_range = reduced
+            for atom in required:
+                self._required_blocks.setdefault(atom, []).append(index)
+            for atom in forbidden:
+                self._forbidden_blocks.setdefault(atom, []).append(index)
+
+            self.required_counts.append(len(required))
+            self.phase_ranges.append(phase_range)
+            self._evaluable_blocks.append(index)
+
+        self.entry_ranges.append((first_block, len(self.block_entry) - first_block))
+
+    def _reduce_block(self, block):
+        """(required atoms, forbidden atoms, sub-phase range or None), False when not evaluable, None when never true"""
+        terms = {}
+
+        for condition in block:
+            constraint = self._analyzer.constraint(condition)
+            if constraint is None:
+                return False
+
+            if constraint[0] == "constant":
+                if not constraint[1]:
+                    return None
+                continue
+
+            _, term, domain, interval = constraint
+            function_id, args = term
+            if function_id not in STATE_FUNCTIONS and function_id != FunctionNameEnum.GET_GAME_SUB_PHASE.value:
+                return False
+
+            current = terms.get(term, domain)
+            terms[term] = ConditionAnalyzer.intersect(current, interval)
+            if terms[term] is None:
+                return None
+
+        required = []
+        forbidden = []
+        phase_range = None
+
+        for (function_id, args), (low, high) in terms.items():
+            if function_id == FunctionNameEnum.GET_GAME_SUB_PHASE.value:
+                phase_range = (low, high)
+            elif (low, high) == (1, 1):
+                required.append((STATE_FUNCTIONS[function_id], args[0][1]))
+            elif (low, high) == (0, 0):
+                forbidden.append((STATE_FUNCTIONS[function_id], args[0][1]))
+
+        return required, forbidden, phase_range
+
+    def dependents(self, atom):
+        """Keys of the entries with a block depending on an atom; for ("sub_phase", n), on a bound at n"""
+        if atom[0] == SUB_PHASE:
+            mask = _mask(index for index, phase_range in enumerate(self.phase_ranges)
+                         if phase_range is not None and atom[1] in (phase_range[0], phase_range[1] + 1))
+        else:
+            mask = self.requires.get(atom, 0) | self.forbids.get(atom, 0)
+
+        return self._entry_keys(mask)
+
+    def atoms(self):
+        """Every flag, team flag and item used by a block"""
+        return sorted(set(self._required_blocks) | set(self._forbidden_blocks))
+
+    def entry_active(self, entry, active_blocks):
+        first, count = self.entry_ranges[entry]
+        return (active_blocks >> first) & ((1 << count) - 1) != 0
+
+    def evaluate(self, atoms=(), sub_phase=0, effects=None):
+        """GraphState with the given atoms set, see GraphState"""
+        return GraphState(self, atoms, sub_phase, effects)
+
+    def _entry_keys(self, block_mask):
+        entries = sorted({self.block_entry[index] for index in _bits(block_mask)})
+        return [self.keys[entry] for entry in entries]
+
+class StateChange:
+    """Entries activated and deactivated by a change of state, with the atoms set on the way"""
+
+    def __init__(self, unlocked, locked, atoms):
+        self.unlocked = unlocked
+        self.locked = locked
+        self.atoms = atoms
+
+    def to_dict(self):
+        return {"unlocked": self.unlocked, "locked": self.locked, "atoms": [format_atom(atom) for atom in self.atoms]}
+
+class GraphState:
+    """
+    Entries active in a state of the game, updated incrementally.
+
+    Every block keeps the number of its required atoms not set and of its
+    forbidden atoms set; setting or clearing an atom only visits the blocks
+    using it, a sub-phase change only the blocks with a bound between the
+    old and new values. Active blocks are then a few operations on the
+    bitsets, and only the entries of blocks whose state changed are checked.
+
+    effects: optional {entry key: atoms} set by an entry once it is active.
+    Setting an atom then runs to a fixpoint: the effects of the entries it
+    activates are set in turn until no new atom is set.
+    """
+
+    def __init__(self, graph, atoms=(), sub_phase=0, effects=None):
+        self.graph = graph
+        self.effects = effects or {}
+        self.atoms = set()
+        self.sub_phase = sub_phase
+        self.missing = list(graph.required_counts)
+        self.violations = [0] * graph.block_count
+
+        self.ready = _mask(index for index, count in enumerate(self.missing) if count == 0)
+        self.violated = 0
+
+        phased = [(index, phase_range) for index, phase_range in enumerate(graph.phase_ranges) if phase_range is not None]
+        self.phase_ok = graph.evaluable & ~_mask(index for index, (low, high) in phased if not low <= sub_phase <= high)
+
+        # Bounds sorted once, a sub-phase change looks up the blocks with a bound crossed
+        self._lows = sorted((low, index) for index, (low, _) in phased)
+        self._highs = sorted((high, index) for index, (_, high) in phased)
+        self._low_values = [low for low, _ in self._lows]
+        self._high_values = [high for high, _ in self._highs]
+
+        self.active = self._active_blocks()
+        self.active_entries = _mask({graph.block_entry[index] for index in _bits(self.active)})
+
+        for atom in atoms:
+            if atom[0] == SUB_PHASE:
+                self.set_sub_phase(atom[1])
+            else:
+                self.set(atom)
+
+    def active_keys(self):
+        return [self.graph.keys[entry] for entry in _bits(self.active_entries)]
+
+    def set(self, atom):
+        """Sets an atom, then the effects of the entries it activates, returns the StateChange"""
+        before = self.active_entries
+        pending = [atom]
+        added = []
+
+        while pending:
+            atom = pending.pop()
+            if atom in self.atoms:
+                continue
+
+            self.atoms.add(atom)
+            added.append(atom)
+            newly_active = self._update_atom(atom, 1)
+
+            for entry in _bits(newly_active):
+                pending.extend(self.effects.get(self.graph.keys[entry], ()))
+
+        return self._change(before, added)
+
+    def clear(self, atom):
+        """Clears an atom, effects are not undone"""
+        before = self.active_entries
+        if atom in self.atoms:
+            self.atoms.discard(atom)
+            self._update_atom(atom, -1)
+        return self._change(before, [])
+
+    def what_if(self, atom):
+        """StateChange of setting an atom or moving to a sub-phase, the state is left as it was"""
+        if atom[0] == SUB_PHASE:
+            sub_phase = self.sub_phase
+            change = self.set_sub_phase(atom[1])
+            self.set_sub_phase(sub_phase)
+            return change
+
+        change = self.set(atom)
+        for added in reversed(change.atoms):
+            self.clear(added)
+        return change
+
+    def set_sub_phase(self, sub_phase):
+        before = self.active_entries
+        low_phase, high_phase = sorted((self.sub_phase, sub_phase))
+        self.sub_phase = sub_phase
+
+        # A block changes when a bound lies between the old and the new sub-phase
+        candidates = set()
+        candidates.update(index for _, index in self._lows[bisect_right(self._low_values, low_phase):bisect_right(self._low_values, high_phase)])
+        candidates.update(index for _, index in self._highs[bisect_left(self._high_values, low_phase):bisect_left(self._high_values, high_phase)])
+
+        inside = [index for index in candidates if self.graph.phase_ranges[index][0] <= sub_phase <= self.graph.phase_ranges[index][1]]
+        changed = _mask(candidates)
+        self.phase_ok = (self.phase_ok & ~changed) | _mask(inside)
+
+        self._refresh(changed)
+        return self._change(before, [])
+
+    def _update_atom(self, atom, delta):
+        """Updates the blocks using an atom set (delta 1) or cleared (-1), returns the newly active entries"""
+        graph = self.graph
+        changed = 0
+
+        required = graph.requires.get(atom, 0)
+        indexes = _bits(required)
+        for index in indexes:
+            self.missing[index] -= delta
+        self.ready = (self.ready & ~required) | _mask(index for index in indexes if self.missing[index] == 0)
+        changed |= required
+
+        forbidden = graph.forbids.get(atom, 0)
+        indexes = _bits(forbidden)
+        for index in indexes:
+            self.violations[index] += delta
+        self.violated = (self.violated & ~forbidden) | _mask(index for index in indexes if self.violations[index])
+        changed |= forbidden
+
+        before = self.active_entries
+        self._refresh(changed)
+        return self.active_entries & ~before
+
+    def _active_blocks(self):
+        return self.ready & self.phase_ok & ~self.violated & self.graph.evaluable
+
+    def _refresh(self, changed):
+        """Recomputes the active blocks and the entries of the blocks that changed"""
+        active = self._active_blocks()
+        flipped = (active ^ self.active) & changed
+        self.active = active
+
+        entries = {self.graph.block_entry[index] for index in _bits(flipped)}
+        now_active = [entry for entry in entries if self.graph.entry_active(entry, active)]
+        self.active_entries = (self.active_entries & ~_mask(entries)) | _mask(now_active)
+
+    def _change(self, before, atoms):
+        keys = self.graph.keys
+        unlocked = [keys[entry] for entry in _bits(self.active_entries & ~before)]
+        locked = [keys[entry] for entry in _bits(before & ~self.active_entries)]
+        return StateChange(unlocked, locked, atoms)
@@ -0,0 +1,135 @@
+import re
+import importlib
+import threading
+
+class FunctionSignature:
+    """
+    Identity, arity, return type and display names of a condition function.
+    The id is also exposed as value and the name as name, like the members of
+    FunctionNameEnum.
+    """
+    
+    def __init__(self, function_id, name, c_name, squirrel_name, arg_count, return_type, known=True):
+        self._id = function_id
+        self._name = name
+        self._c_name = c_name
+        self._squirrel_name = squirrel_name
+        self._arg_count = arg_count
+        self._return_type = return_type
+        self._known = known
+    
+    @classmethod
+    def generic(cls, function_id, arg_count):
+        """Signature of a function id missing from the game table"""
+        return cls(function_id, f"FUNC_{function_id:08X}", f"func_{function_id:08X}",
+                   f"CMND_FUNC_{function_id:08X}", arg_count, "int", known=False)
+    
+    @property
+    def id(self):
+        return self._id
+    
+    @property
+    def value(self):
+        return self._id
+    
+    @property
+    def name(self):
+        return self._name
+    
+    @property
+    def c_name(self):
+        return self._c_name
+    
+    @property
+    def squirrel_name(self):
+        return self._squirrel_name
+    
+    @property
+    def arg_count(self):
+        return self._arg_count
+    
+    @property
+    def return_type(self):
+        return self._return_type
+    
+    @property
+    def known(self):
+        return self._known
+    
+    def __repr__(self):
+        return f"<FunctionSignature id=0x{self.id:08X} name={self.name} args={self.arg_count} returns={self.return_type}>"
+
+class FunctionRegistry:
+    """
+    Function signatures of a game, loaded once from its table in
+    level_5/condition/games and looked up by id or by any of their names.
+    
+    Registries are read-only once loaded and can be shared by threads. Loading
+    is done under a lock; two threads asking for the same generic signature
+    may build it twice, which only costs the duplicate.
+    """
+    
+    DEFAULT_GAME = "inazuma_eleven_go"
+    
+    GENERIC_NAME_PATTERN = re.compile(r'^(?:func_|CMND_FUNC_|FUNC_)([0-9A-Fa-f]{8})$')
+    
+    _registries = {}
+    _lock = threading.Lock()
+    
+    def __init__(self, game_name, signatures):
+        self.game_name = game_name
+        self._by_id = {}
+        self._by_name = {}
+        self._generic = {}
+        
+        for signature in signatures:
+            self._by_id[signature.id] = signature
+            for name in (signature.name, signature.c_name, signature.squirrel_name):
+                self._by_name[name] = signature
+    
+    @classmethod
+    def for_game(cls, game=None):
+        game = game or cls.DEFAULT_GAME
+        registry = cls._registries.get(game)
+        
+        if registry is None:
+            with cls._lock:
+                registry = cls._registries.get(game)
+                if registry is None:
+                    module = importlib.import_module(f"level_5.condition.games.{game}")
+                    signatures = [FunctionSignature(*row) for row in module.FUNCTIONS]
+                    registry = cls(module.GAME_NAME, signatures)
+                    cls._registries[game] = registry
+        
+        return registry
+    
+    def get(self, function_id):
+        """Signature of a known function id, None otherwise"""
+        return self._by_id.get(function_id)
+    
+    def generic(self, function_id, arg_count):
+        """Shared generic signature of an unknown function id"""
+        key = (function_id, arg_count)
+        signature = self._generic.get(key)
+        
+        if signature is None:
+            signature = FunctionSignature.generic(function_id, arg_count)
+            self._generic[key] = signature
+        
+        return signature
+    
+    def by_name(self, name):
+        """Signature from an enum, C or Squirrel name, generic names give a generic signature"""
+        signature = self._by_name.get(name)
+        if signature is not None:
+            return signature
+        
+        match = self.GENERIC_NAME_PATTERN.match(name)
+        if match:
+            function_id = int(match.group(1), 16)
+            return self.get(function_id) or self.generic(function_id, None)
+        
+        return None
+    
+    def signatures(self):
+        return list(self._by_id.values())
@@ -0,0 +1,9 @@
+GAME_NAME = "Inazuma Eleven Go"
+
+# (function id, name, C name, Squirrel name, argument count, return type)
+FUNCTIONS = [
+    (0x98EE4B47, "GET_GAME_SUB_PHASE", "getGameSubPhase", "CMND_GET_GAME_SUB_PHASE", 0, "int"),
+    (0x2A3D4543, "GET_GLOBAL_BIT_FLAG", "getGlobalBitFlag", "CMND_GET_GLOBAL_BIT_FLAG", 1, "bool"),
+    (0xFBA3C513, "GET_TEAM_BIT_FLAG", "getTeamBitFlag", "CMND_GET_TEAM_BIT_FLAG", 1, "bool"),
+    (0x8D7666D8, "IS_HAVE_ITEM", "isHaveItem", "CMND_IS_HAVE_ITEM", 1, "bool"),
+]
@@ -1,5 +1,7 @@
 from enum import Enum
 
+from level_5.condition.functions import FunctionRegistry
+
 class SymbolType(Enum):
     FUNCTION = 0x35
     LOCAL_INT = 0x32
@@ -26,6 +28,8 @@ class SymbolType(Enum):
         return value == cls.LOCAL_IDENT.value
 
 class FunctionNameEnum(Enum):
+    """Ids of the functions the tool reasons about, their signatures live in FunctionRegistry"""
+    
     GET_GAME_SUB_PHASE = 0x98EE4B47
     GET_GLOBAL_BIT_FLAG = 0x2A3D4543
     GET_TEAM_BIT_FLAG = 0xFBA3C513
@@ -33,25 +37,13 @@ class FunctionNameEnum(Enum):
     
     @classmethod
     def to_string(cls, value):
-        mapping = {
-            cls.GET_GAME_SUB_PHASE.value: "getGameSubPhase",
-            cls.GET_GLOBAL_BIT_FLAG.value: "getGlobalBitFlag",
-            cls.GET_TEAM_BIT_FLAG.value: "getTeamBitFlag",
-            cls.IS_HAVE_ITEM.value: "isHaveItem"
-        }
-        
-        return mapping.get(value, None)
+        signature = FunctionRegistry.for_game().get(value)
+        return signature.c_name if signature else None
     
     @classmethod
     def get_return_type(cls, value):
-        mapping = {
-            cls.GET_GAME_SUB_PHASE.value: "int",
-            cls.GET_GLOBAL_BIT_FLAG.value: "bool",
-            cls.GET_TEAM_BIT_FLAG.value: "bool",
-            cls.IS_HAVE_ITEM.value: "bool"
-        }
-        
-        return mapping.get(value, None)
+        signature = FunctionRegistry.for_game().get(value)
+        return signature.return_type if signature else None
 
 class FunctionArgEnum(Enum):
     GET_GAME_SUB_PHASE = 0
@@ -61,14 +53,8 @@ class FunctionArgEnum(Enum):
     
     @classmethod
     def get_arg_count(cls, function_value):
-        mapping = {
-            FunctionNameEnum.GET_GAME_SUB_PHASE.value: cls.GET_GAME_SUB_PHASE.value,
-            FunctionNameEnum.GET_GLOBAL_BIT_FLAG.value: cls.GET_GLOBAL_BIT_FLAG.value,
-            FunctionNameEnum.GET_TEAM_BIT_FLAG.value: cls.GET_TEAM_BIT_FLAG.value,
-            FunctionNameEnum.IS_HAVE_ITEM.value: cls.IS_HAVE_ITEM.value
-        }
-        
-        return mapping.get(function_value, None)
+        signature = FunctionRegistry.for_game().get(function_value)
+        return signature.arg_count if signature else None
 
 class ComparatorEnum(Enum):
     LESS_THAN = 0x6E
@@ -96,10 +82,11 @@ class ComparatorEnum(Enum):
         return mapping.get(value, None)
 
 class Level5Variable:
-    def __init__(self, name, lifetime, value):
+    def __init__(self, name, lifetime, value, offset=None):
         self._name = name
         self._lifetime = lifetime
         self._value = value
+        self._offset = offset
     
     @property
     def name(self):
@@ -113,34 +100,72 @@ class Level5Variable:
     def value(self):
         return self._value
     
+    @property
+    def offset(self):
+        """Byte offset of the variable in the source data, None when implicit"""
+        return self._offset
+    
     def __repr__(self):
         return (f"<Level5Variable name={self.name} "
                 f"lifetime={self.lifetime.name} "
                 f"value={self.value}>")
 
 class Level5Function:
-    def __init__(self, name, args):
-        self._name = name
+    def __init__(self, signature, args, offset=None, padding=None):
+        """signature: FunctionSignature (a FunctionNameEnum member is looked up in the registry)"""
+        if isinstance(signature, FunctionNameEnum):
+            signature = FunctionRegistry.for_game().get(signature.value)
+        
+        self._signature = signature
         self._args = args
+        self._offset = offset
+        self._padding = padding
+    
+    @property
+    def signature(self):
+        return self._signature
     
     @property
     def name(self):
-        return self._name
+        """
+        FunctionNameEnum member of the function, so that func.name ==
+        FunctionNameEnum.X keeps working; the signature for ids without a
+        member (it also exposes the id as value and the name as name).
+        """
+        try:
+            return FunctionNameEnum(self._signature.id)
+        except ValueError:
+            return self._signature
+    
+    @property
+    def function_id(self):
+        return self._signature.id
     
     @property
     def args(self):
         return self._args
     
+    @property
+    def offset(self):
+        """Byte offset of the function opcode in the source data"""
+        return self._offset
+    
+    @property
+    def padding(self):
+        """Unknown bytes read after the function name, None when not decoded"""
+        return self._padding
+    
     def __repr__(self):
-        return (f"<Level5Function name={self.name} "
+        return (f"<Level5Function name={self.signature.name} "
                 f"args={self.args}>")
 
 class Level5Condition:
-    def __init__(self, operator_left, operator_right, comparator, comparator_type="int"):
+    def __init__(self, operator_left, operator_right, comparator, comparator_type="int", offset=None):
         self._operator_left = operator_left
         self._operator_right = operator_right
         self._comparator = comparator
         self._comparator_type = comparator_type
+        self._offset = offset
     
     @property
     def operator_left(self):
@@ -158,6 +183,11 @@ class Level5Condition:
     def comparator_type(self):
         return self._comparator_type
     
+    @property
+    def offset(self):
+        """Byte offset of the comparator in the source data, None when implicit"""
+        return self._offset
+    
     def __repr__(self):
         return (f"<Level5Condition "
                 f"operator_left={self.operator_left} "
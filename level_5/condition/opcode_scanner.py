@@ -0,0 +1,325 @@
+import binascii
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from level_5.condition.logic import *
+from level_5.condition.functions import FunctionRegistry
+
+FUNCTION = SymbolType.FUNCTION.value
+LOCAL_INT = SymbolType.LOCAL_INT.value
+LOCAL_IDENT = SymbolType.LOCAL_IDENT.value
+BLOCK_SEPARATOR = 0x8F
+COMPARATORS = frozenset(comparator.value for comparator in ComparatorEnum)
+
+# Opcodes that can follow the padding of a function without arguments, see Level5ConditionDecoder
+NEXT_OPCODES = frozenset([FUNCTION, LOCAL_INT, LOCAL_IDENT, BLOCK_SEPARATOR]) | COMPARATORS
+
+HEADER_SIZE = 0x06
+
+def pack_blobs(blobs):
+    """Concatenates condition blobs into one buffer, returns (buffer, offsets) with offsets[i]:offsets[i + 1] the blob i"""
+    offsets = [0]
+    for blob in blobs:
+        offsets.append(offsets[-1] + len(blob))
+    return b"".join(blobs), offsets
+
+def pack_entries(entries):
+    """
+    Decodes (key, base64) pairs and packs them, returns (keys, buffer,
+    offsets). Entries that are not valid Base64 are packed as empty blobs,
+    they only report a truncated header.
+    """
+    keys = []
+    blobs = []
+
+    for key, data in entries:
+        try:
+            blob = binascii.a2b_base64(data)
+        except ValueError:
+            blob = b""
+        keys.append(key)
+        blobs.append(blob)
+
+    buffer, offsets = pack_blobs(blobs)
+    return keys, buffer, offsets
+
+class OpcodeTable:
+    """
+    Instructions of a batch of condition blobs, one row per instruction in
+    the order of the blobs and offsets, as columns:
+
+    entry        index of the blob
+    offset       offset of the opcode in the blob
+    opcode       opcode byte
+    function_id  id of a 0x35 row, or of the called function for the rows of
+                 its arguments, -1 otherwise
+    value        value of a 0x32 or 0x34 row, -1 otherwise
+    comparator   comparator byte of a comparator row, 0 otherwise
+
+    Unknown opcodes and block separators are rows as well. Instructions that
+    cannot be read (truncated, unknown function with unrecognized arguments,
+    invalid argument) are not rows: their (entry, offset, opcode) are in the
+    error columns, opcode -1 for a truncated header, and the scan resumes at
+    the next 0x8F of the blob like the tolerant decoder.
+
+    Columns are NumPy arrays for the NumPy scanner and lists for the Python one.
+    """
+
+    COLUMNS = ("entry", "offset", "opcode", "function_id", "value", "comparator")
+    ERROR_COLUMNS = ("error_entry", "error_offset", "error_opcode")
+
+    def __init__(self, entry_count, columns, error_columns):
+        self.entry_count = entry_count
+        self.entry, self.offset, self.opcode, self.function_id, self.value, self.comparator = columns
+        self.error_entry, self.error_offset, self.error_opcode = error_columns
+
+    def __len__(self):
+        return len(self.entry)
+
+    def rows(self):
+        """Rows as tuples of Python ints, in the order of COLUMNS"""
+        return list(zip(*(_to_list(getattr(self, name)) for name in self.COLUMNS)))
+
+    def errors(self):
+        """Errors as (entry, offset, opcode) tuples of Python ints"""
+        return list(zip(*(_to_list(getattr(self, name)) for name in self.ERROR_COLUMNS)))
+
+    def to_dict(self):
+        return {name: _to_list(getattr(self, name)) for name in self.COLUMNS + self.ERROR_COLUMNS}
+
+def _to_list(column):
+    return column.tolist() if hasattr(column, "tolist") else list(column)
+
+def numpy_available():
+    return np is not None
+
+def scan_opcodes(buffer, offsets, game=None):
+    """OpcodeTable of packed blobs, with the NumPy scanner when NumPy is installed"""
+    if np is not None:
+        return scan_opcodes_numpy(buffer, offsets, game)
+    return scan_opcodes_python(buffer, offsets, game)
+
+def _function_arities(game):
+    return {signature.id: signature.arg_count for signature in FunctionRegistry.for_game(game).signatures()}
+
+def scan_opcodes_python(buffer, offsets, game=None):
+    """
+    Reference scanner, one blob and one byte at a time with the rules of
+    Level5ConditionDecoder._read_conditions, without building conditions.
+    """
+    arities = _function_arities(game)
+    columns = tuple([] for _ in OpcodeTable.COLUMNS)
+    entries, row_offsets, opcodes, function_ids, values, comparators = columns
+    error_columns = ([], [], [])
+
+    for entry in range(len(offsets) - 1):
+        blob = buffer[offsets[entry]:offsets[entry + 1]]
+        end = len(blob)
+
+        if end < HEADER_SIZE:
+            _append_error(error_columns, entry, end if end >= 4 else 0, -1)
+            continue
+
+        position = HEADER_SIZE
+        pending = 0
+        owner = -1
+
+        while position < end:
+            opcode = blob[position]
+            function_id = value = -1
+            comparator = 0
+            step = 1
+            failed = False
+
+            if opcode == FUNCTION:
+                arg_count = None
+                if position + 5 <= end:
+                    function_id = int.from_bytes(blob[position + 1:position + 5], "big")
+                    arg_count = arities.get(function_id)
+                    if arg_count is None:
+                        arg_count = _guess_arg_count(blob, position, end)
+
+                step = 8 if arg_count == 0 else 12
+                failed = (arg_count is None
+                          or position + step + 5 * arg_count > end
+                          or any(blob[position + 12 + 5 * i] not in (LOCAL_INT, LOCAL_IDENT) for i in range(arg_count)))
+                pending, owner = (0, -1) if failed else (arg_count, function_id)
+            elif opcode == LOCAL_INT or opcode == LOCAL_IDENT:
+                step = 5
+                failed = position + 5 > end
+                if not failed:
+                    value = int.from_bytes(blob[position + 1:position + 5], "big" if opcode == LOCAL_INT else "little")
+                    if pending:
+                        function_id = owner
+                        pending -= 1
+            elif opcode in COMPARATORS:
+                comparator = opcode
+
+            if failed:
+                _append_error(error_columns, entry, position, opcode)
+                position = blob.find(b"\x8F", position + 1)
+                if position == -1:
+                    break
+                continue
+
+            entries.append(entry)
+            row_offsets.append(position)
+            opcodes.append(opcode)
+            function_ids.append(function_id)
+            values.append(value)
+            comparators.append(comparator)
+            position += step
+
+    return OpcodeTable(len(offsets) - 1, columns, error_columns)
+
+def _guess_arg_count(blob, position, end):
+    """Level5ConditionDecoder._guess_arg_count for the function at position, None when unrecognized"""
+    if position + 8 >= end or blob[position + 8] in NEXT_OPCODES:
+        return 0
+    if position + 12 < end and blob[position + 12] in (LOCAL_INT, LOCAL_IDENT):
+        return 1
+    return None
+
+def _append_error(error_columns, entry, offset, opcode):
+    error_columns[0].append(entry)
+    error_columns[1].append(offset)
+    error_columns[2].append(opcode)
+
+def scan_opcodes_numpy(buffer, offsets, game=None):
+    """
+    Vectorized scanner. Instructions have variable lengths, so the blobs are
+    walked in lockstep: a frontier holds the position of every blob not
+    finished yet, and each step reads one instruction of all of them with
+    array operations, computes the position of their next instruction and
+    drops the blobs that reached their end. The number of steps is the
+    instruction count of the longest blob, not the size of the buffer.
+
+    Gives the same table as scan_opcodes_python.
+    """
+    if np is None:
+        raise ImportError("The vectorized scanner requires the numpy package (pip install numpy)")
+
+    arities = _function_arities(game)
+    known_ids = np.array(sorted(arities) or [-1], dtype=np.int64)
+    known_arities = np.array([arities[function_id] for function_id in sorted(arities)] or [0], dtype=np.int64)
+    max_arity = max(1, int(known_arities.max()))
+
+    offsets = np.asarray(offsets, dtype=np.int64)
+    size = int(offsets[-1]) if len(offsets) else 0
+    starts = offsets[:-1]
+    lengths = offsets[1:] - starts
+
+    # Bytes past the end are read by the gathers of the last instruction, they are never used
+    data = np.zeros(size + 12 + 5 * max_arity, dtype=np.uint8)
+    data[:size] = np.frombuffer(buffer, dtype=np.uint8, count=size)
+
+    # Block separators, where scanning resumes after an error
+    separators = np.append(np.flatnonzero(data[:size] == BLOCK_SEPARATOR), size)
+
+    is_local_byte = np.zeros(256, dtype=bool)
+    is_local_byte[[LOCAL_INT, LOCAL_IDENT]] = True
+    is_next_opcode = np.zeros(256, dtype=bool)
+    is_next_opcode[list(NEXT_OPCODES)] = True
+    is_comparator = np.zeros(256, dtype=bool)
+    is_comparator[list(COMPARATORS)] = True
+
+    header_ok = lengths >= HEADER_SIZE
+    bad_headers = np.flatnonzero(~header_ok)
+    bad_lengths = lengths[bad_headers]
+    error_parts = [(bad_headers, np.where(bad_lengths >= 4, bad_lengths, 0), np.full(len(bad_headers), -1, dtype=np.int64))]
+    row_parts = []
+
+    # Frontier: one slot per blob not finished
+    entry = np.flatnonzero(header_ok & (lengths > HEADER_SIZE))
+    position = starts[entry] + HEADER_SIZE
+    end = starts[entry] + lengths[entry]
+    pending = np.zeros(len(entry), dtype=np.int64)
+    owner = np.full(len(entry), -1, dtype=np.int64)
+
+    while len(entry):
+        opcode = data[position]
+        step = np.ones(len(entry), dtype=np.int64)
+        failed = np.zeros(len(entry), dtype=bool)
+        function_id = np.full(len(entry), -1, dtype=np.int64)
+        value = np.full(len(entry), -1, dtype=np.int64)
+
+        # Functions: arity from the game table, guessed from the following bytes for unknown ids
+        functions = np.flatnonzero(opcode == FUNCTION)
+        if len(functions):
+            at = position[functions]
+            limit = end[functions]
+            ids = _read_words(data, at + 1, "big")
+            slot = np.minimum(np.searchsorted(known_ids, ids), len(known_ids) - 1)
+            guess_zero = (at + 8 >= limit) | is_next_opcode[data[at + 8]]
+            guess_one = (at + 12 < limit) & is_local_byte[data[at + 12]]
+            arity = np.where(known_ids[slot] == ids, known_arities[slot],
+                             np.where(guess_zero, 0, np.where(guess_one, 1, -1)))
+
+            length = np.where(arity == 0, 8, 12)
+            ok = (at + 5 <= limit) & (arity >= 0) & (at + length + 5 * arity <= limit)
+            for i in range(max_arity):
+                ok &= (arity <= i) | is_local_byte[data[at + 12 + 5 * i]]
+
+            function_id[functions] = ids
+            step[functions] = length
+            failed[functions] = ~ok
+            pending[functions] = np.where(ok, arity, 0)
+            owner[functions] = ids
+
+        # Locals, the ones read while arguments are pending belong to the last function
+        locals_ = np.flatnonzero((opcode == LOCAL_INT) | (opcode == LOCAL_IDENT))
+        if len(locals_):
+            at = position[locals_]
+            big_endian = opcode[locals_] == LOCAL_INT
+            value[locals_] = np.where(big_endian, _read_words(data, at + 1, "big"), _read_words(data, at + 1, "little"))
+            step[locals_] = 5
+            failed[locals_] = at + 5 > end[locals_]
+
+            argument = pending[locals_] > 0
+            function_id[locals_] = np.where(argument, owner[locals_], -1)
+            pending[locals_] -= argument
+
+        comparator = np.where(is_comparator[opcode], opcode, 0).astype(np.uint8)
+
+        if failed.any():
+            ok = ~failed
+            row_parts.append((entry[ok], position[ok], opcode[ok], function_id[ok], value[ok], comparator[ok]))
+
+            errors = np.flatnonzero(failed)
+            error_parts.append((entry[errors], position[errors] - starts[entry[errors]], opcode[errors].astype(np.int64)))
+            pending[errors] = 0
+            position = position + step
+            position[errors] = separators[np.searchsorted(separators, position[errors] - step[errors] + 1)]
+        else:
+            row_parts.append((entry, position, opcode, function_id, value, comparator))
+            position = position + step
+
+        active = position < end
+        entry, position, end, pending, owner = entry[active], position[active], end[active], pending[active], owner[active]
+
+    if row_parts:
+        columns = [np.concatenate(part) for part in zip(*row_parts)]
+    else:
+        columns = [np.empty(0, dtype=dtype) for dtype in (np.int64, np.int64, np.uint8, np.int64, np.int64, np.uint8)]
+
+    # Instructions were read step by step, absolute positions give the order of the blobs
+    order = np.argsort(columns[1], kind="stable")
+    columns = [column[order] for column in columns]
+    columns[1] = columns[1] - starts[columns[0]]
+
+    error_columns = [np.concatenate(part) for part in zip(*error_parts)]
+    order = np.lexsort((error_columns[1], error_columns[0]))
+    error_columns = [column[order] for column in error_columns]
+
+    return OpcodeTable(len(starts), columns, error_columns)
+
+def _read_words(data, positions, order):
+    """Unsigned 32-bit words at positions, as int64"""
+    shifts = (24, 16, 8, 0) if order == "big" else (0, 8, 16, 24)
+    words = np.zeros(len(positions), dtype=np.int64)
+    for i, shift in enumerate(shifts):
+        words |= data[positions + i].astype(np.int64) << shift
+    return words
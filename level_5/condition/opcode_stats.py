@@ -0,0 +1,303 @@
+import binascii
+from collections import Counter
+
+from level_5.condition.logic import *
+from level_5.condition.dump import read_dump_chunks
+from level_5.condition.functions import FunctionRegistry
+from level_5.condition.opcode_scanner import (np, pack_entries, scan_opcodes_numpy,
+                                              FUNCTION, LOCAL_INT, LOCAL_IDENT, BLOCK_SEPARATOR, COMPARATORS)
+
+KNOWN_OPCODES = frozenset([FUNCTION, LOCAL_INT, LOCAL_IDENT, BLOCK_SEPARATOR]) | COMPARATORS
+
+# Comparators whose meaning is not known yet, rendered as ?? by the generators
+UNKNOWN_COMPARATORS = frozenset(comparator.value for comparator in ComparatorEnum
+                                if ComparatorEnum.to_string(comparator.value) == "??")
+
+def opcode_name(opcode):
+    if opcode == FUNCTION:
+        return "FUNCTION"
+    if opcode == LOCAL_INT:
+        return "LOCAL_INT"
+    if opcode == LOCAL_IDENT:
+        return "LOCAL_IDENT"
+    if opcode == BLOCK_SEPARATOR:
+        return "BLOCK_SEPARATOR"
+    if opcode in COMPARATORS:
+        comparator = ComparatorEnum(opcode)
+        return f"{comparator.name} ({ComparatorEnum.to_string(opcode)})"
+    return "unknown"
+
+class OpcodeExample:
+    """An entry using an opcode or a function id, with the offset of the instruction"""
+
+    def __init__(self, key, offset, data):
+        self.key = key
+        self.offset = offset
+        self.data = data
+
+    def context(self, width=8):
+        """Bytes around the instruction, the opcode in brackets"""
+        raw = binascii.a2b_base64(self.data)
+        before = raw[max(self.offset - width, 0):self.offset].hex(" ")
+        after = raw[self.offset + 1:self.offset + 1 + width].hex(" ")
+        return f"{before} [{raw[self.offset]:02x}] {after}".strip()
+
+    def describe(self, game=None):
+        """The decoded condition of a comparator, or the bytes around the instruction"""
+        from level_5.condition.analyzer import describe_condition
+        from level_5.condition.decoder import Level5ConditionDecoder
+
+        result = Level5ConditionDecoder(tolerant=True, game=game).decode(self.data)
+        for block in result.conditions or []:
+            for condition in block:
+                if condition.offset == self.offset:
+                    return describe_condition(condition)
+
+        return self.context()
+
+    def to_dict(self):
+        return {"key": self.key, "offset": self.offset, "data": self.data}
+
+class ValueDistribution:
+    """Counts of the values an operand takes"""
+
+    def __init__(self):
+        self.counts = Counter()
+
+    @property
+    def total(self):
+        return sum(self.counts.values())
+
+    def top(self, count=5):
+        return self.counts.most_common(count)
+
+    def to_dict(self, top=20):
+        values = list(self.counts)
+        return {
+            "total": self.total,
+            "distinct": len(values),
+            "min": min(values, default=None),
+            "max": max(values, default=None),
+            "top": [[value, count] for value, count in self.top(top)]
+        }
+
+    def format(self):
+        values = list(self.counts)
+        top = ", ".join(f"{value} ({count})" for value, count in self.top())
+        return (f"{self.total} values, {len(values)} distinct, "
+                f"range {min(values)}..{max(values)}, most used: {top}")
+
+class OpcodeStatistics:
+    """
+    Opcode, function, comparator and operand value counts of a corpus, built
+    from OpcodeTable chunks with bincount and unique counts instead of
+    decoding every entry.
+
+    Comparators are attributed to the function among the two operands read
+    before them, and their other operand is counted as a value compared with
+    that function. Examples are kept for every opcode and unknown function
+    id; they are reported for unknown opcodes, comparators of unknown
+    meaning, opcodes making less than rare_fraction of the instructions and
+    errors.
+    """
+
+    def __init__(self, max_examples=5, rare_fraction=0.001, game=None):
+        if np is None:
+            raise ImportError("Opcode statistics require the numpy package (pip install numpy)")
+
+        self.max_examples = max_examples
+        self.rare_fraction = rare_fraction
+        self.game = game
+        self.registry = FunctionRegistry.for_game(game)
+
+        self.entry_count = 0
+        self.byte_count = 0
+        self.opcode_counts = np.zeros(256, dtype=np.int64)
+        self.error_counts = Counter()
+        self.function_counts = Counter()
+        self.comparator_counts = Counter()
+        self.argument_values = {}
+        self.compared_values = {}
+        self.examples = {}
+        self.function_examples = {}
+        self.error_examples = {}
+
+    @property
+    def instruction_count(self):
+        return int(self.opcode_counts.sum())
+
+    @classmethod
+    def from_dump(cls, path, chunk_size=1 << 22, **kwargs):
+        """Statistics of a dump file, read in one pass through a memory map"""
+        statistics = cls(**kwargs)
+        for entries in read_dump_chunks(path, chunk_size):
+            statistics.add_entries(entries)
+        return statistics
+
+    def add_entries(self, entries):
+        """Scans and counts a list of (key, base64) pairs"""
+        keys, buffer, offsets = pack_entries(entries)
+        data = [value.decode("ascii") if isinstance(value, bytes) else value for _, value in entries]
+        self.add_table(keys, data, scan_opcodes_numpy(buffer, offsets, self.game))
+        self.byte_count += len(buffer)
+
+    def add_table(self, keys, data, table):
+        """Counts an OpcodeTable, keys and data (Base64) are those of its entries for the examples"""
+        self.entry_count += table.entry_count
+        opcode = table.opcode
+        function_id = table.function_id
+
+        chunk_counts = np.bincount(opcode, minlength=256)
+        self.opcode_counts += chunk_counts
+
+        functions = opcode == FUNCTION
+        _add_counts(self.function_counts, function_id[functions])
+
+        # Arguments are locals carrying the id of their function
+        is_local = (opcode == LOCAL_INT) | (opcode == LOCAL_IDENT)
+        arguments = is_local & (function_id >= 0)
+        _add_pair_counts(self.argument_values, function_id[arguments], table.value[arguments])
+
+        self._add_comparators(table, functions, is_local & ~arguments)
+
+        for code in np.flatnonzero(chunk_counts).tolist():
+            self._add_examples(self.examples, code, opcode == code, table, keys, data)
+
+        unknown = functions & ~np.isin(function_id, [signature.id for signature in self.registry.signatures()])
+        for unknown_id in np.unique(function_id[unknown]).tolist():
+            self._add_examples(self.function_examples, unknown_id, unknown & (function_id == unknown_id), table, keys, data)
+
+        for code in np.unique(table.error_opcode).tolist():
+            rows = np.flatnonzero(table.error_opcode == code)
+            self.error_counts[code] += len(rows)
+
+            examples = self.error_examples.setdefault(code, [])
+            for row in rows[:self.max_examples - len(examples)]:
+                entry = int(table.error_entry[row])
+                examples.append(OpcodeExample(keys[entry], int(table.error_offset[row]), data[entry]))
+
+    def _add_comparators(self, table, functions, values):
+        """Counts comparators by function, with the values compared to each function"""
+        opcode = table.opcode
+        comparators = np.flatnonzero(np.isin(opcode, list(COMPARATORS)))
+        operands = np.flatnonzero(functions | values)
+
+        # The two operands read before each comparator, in the same entry
+        position = np.searchsorted(operands, comparators)
+        valid = position >= 2
+        comparators, position = comparators[valid], position[valid]
+        left = operands[position - 2]
+        right = operands[position - 1]
+        same_entry = (table.entry[left] == table.entry[comparators]) & (table.entry[right] == table.entry[comparators])
+        comparators, left, right = comparators[same_entry], left[same_entry], right[same_entry]
+
+        left_is_function = opcode[left] == FUNCTION
+        right_is_function = opcode[right] == FUNCTION
+        function = np.where(left_is_function, table.function_id[left],
+                            np.where(right_is_function, table.function_id[right], -1))
+
+        pairs = np.stack([opcode[comparators].astype(np.int64), function], axis=1)
+        for (comparator, function_id), count in zip(*np.unique(pairs, axis=0, return_counts=True)):
+            self.comparator_counts[(int(comparator), int(function_id))] += int(count)
+
+        # Values compared with a function: the other operand when it is a local
+        compared = np.where(left_is_function & ~right_is_function, right,
+                            np.where(right_is_function & ~left_is_function, left, -1))
+        keep = compared >= 0
+        _add_pair_counts(self.compared_values, function[keep], table.value[compared[keep]])
+
+    def _add_examples(self, examples, code, mask, table, keys, data):
+        found = examples.setdefault(code, [])
+        if len(found) >= self.max_examples:
+            return
+
+        for row in np.flatnonzero(mask)[:self.max_examples - len(found)]:
+            entry = int(table.entry[row])
+            found.append(OpcodeExample(keys[entry], int(table.offset[row]), data[entry]))
+
+    def reported_opcodes(self):
+        """Opcodes whose examples are reported: unknown, comparators of unknown meaning and rare ones"""
+        threshold = self.instruction_count * self.rare_fraction
+        return [code for code in np.flatnonzero(self.opcode_counts).tolist()
+                if code not in KNOWN_OPCODES or code in UNKNOWN_COMPARATORS or self.opcode_counts[code] < threshold]
+
+    def function_name(self, function_id):
+        if function_id < 0:
+            return "no function"
+        signature = self.registry.get(function_id)
+        return signature.c_name if signature else f"unknown 0x{function_id:08X}"
+
+    def to_dict(self):
+        return {
+            "entries": self.entry_count,
+            "bytes": self.byte_count,
+            "instructions": self.instruction_count,
+            "opcodes": {f"0x{code:02X}": int(self.opcode_counts[code]) for code in np.flatnonzero(self.opcode_counts).tolist()},
+            "functions": {f"0x{function_id:08X}": count for function_id, count in self.function_counts.most_common()},
+            "comparators": [{"comparator": f"0x{comparator:02X}", "function": None if function_id < 0 else f"0x{function_id:08X}", "count": count}
+                            for (comparator, function_id), count in self.comparator_counts.most_common()],
+            "argument_values": {f"0x{function_id:08X}": values.to_dict() for function_id, values in self.argument_values.items()},
+            "compared_values": {f"0x{function_id:08X}": values.to_dict() for function_id, values in self.compared_values.items()},
+            "examples": {f"0x{code:02X}": [example.to_dict() for example in self.examples[code]] for code in self.reported_opcodes()},
+            "unknown_functions": {f"0x{function_id:08X}": [example.to_dict() for example in examples]
+                                  for function_id, examples in self.function_examples.items()},
+            "errors": {str(code): count for code, count in self.error_counts.items()},
+            "error_examples": {str(code): [example.to_dict() for example in examples]
+                               for code, examples in self.error_examples.items()}
+        }
+
+    def format(self):
+        total = max(self.instruction_count, 1)
+        lines = [f"{self.entry_count} entries, {self.byte_count} bytes, {self.instruction_count} instructions, "
+                 f"{sum(self.error_counts.values())} unreadable instructions", "", "Opcodes:"]
+
+        for code in np.argsort(-self.opcode_counts, kind="stable").tolist():
+            count = int(self.opcode_counts[code])
+            if count:
+                lines.append(f"  0x{code:02X} {opcode_name(code):<32} {count:>10} {count / total:8.3%}")
+
+        lines += ["", "Functions:"]
+        for function_id, count in self.function_counts.most_common():
+            lines.append(f"  0x{function_id:08X} {self.function_name(function_id):<32} {count:>10}")
+
+        lines += ["", "Comparators by function:"]
+        for (comparator, function_id), count in sorted(self.comparator_counts.items()):
+            lines.append(f"  0x{comparator:02X} {ComparatorEnum.to_string(comparator):<3} {self.function_name(function_id):<32} {count:>10}")
+
+        lines += ["", "Values:"]
+        for title, distributions in (("arguments", self.argument_values), ("compared with", self.compared_values)):
+            for function_id, values in distributions.items():
+                lines.append(f"  {title} {self.function_name(function_id)}: {values.format()}")
+
+        lines += ["", "Examples:"]
+        for code in self.reported_opcodes():
+            lines.append(f"  0x{code:02X} {opcode_name(code)}, {int(self.opcode_counts[code])} uses:")
+            lines += [f"    entry {example.key} at offset {example.offset}: {example.describe(self.game)}"
+                      for example in self.examples[code]]
+
+        for function_id, examples in self.function_examples.items():
+            lines.append(f"  function 0x{function_id:08X}, {self.function_counts[function_id]} uses:")
+            lines += [f"    entry {example.key} at offset {example.offset}: {example.context()}" for example in examples]
+
+        for code, examples in self.error_examples.items():
+            name = "header" if code < 0 else f"0x{code:02X} {opcode_name(code)}"
+            lines.append(f"  unreadable {name}, {self.error_counts[code]} times:")
+            lines += [f"    entry {example.key} at offset {example.offset}" for example in examples]
+
+        return "\n".join(lines)
+
+def _add_counts(counter, values):
+    for value, count in zip(*np.unique(values, return_counts=True)):
+        counter[int(value)] += int(count)
+
+def _add_pair_counts(distributions, groups, values):
+    """Adds values to the ValueDistribution of their group"""
+    if not len(groups):
+        return
+
+    pairs = (groups.astype(np.uint64) << np.uint64(32)) | values.astype(np.uint64)
+    unique, counts = np.unique(pairs, return_counts=True)
+
+    for pair, count in zip(unique.tolist(), counts.tolist()):
+        group = pair >> 32
+        distributions.setdefault(group, ValueDistribution()).counts[pair & 0xFFFFFFFF] += count
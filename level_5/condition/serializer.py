@@ -0,0 +1,83 @@
+from level_5.condition.logic import *
+from level_5.condition.functions import FunctionRegistry
+
+class ConditionSerializer:
+    """
+    Converts decoded conditions to compact records made of dicts, lists and ints
+    and rebuilds them without reading the binary data again.
+
+    Record layout (version 1):
+        {"v": 1, "key": key, "blocks": [[condition, ...], ...]}
+        condition: {"l": operand, "r": operand, "c": comparator code, "t": comparator type, "o": offset}
+        function:  {"f": function id, "n": function name, "a": [operand, ...], "o": offset}
+        variable:  {"s": symbol type code, "v": value, "o": offset}
+    Offsets are byte offsets in the decoded data, None for implicit values.
+    """
+
+    SCHEMA_VERSION = 1
+
+    @classmethod
+    def to_record(cls, conditions, key=None):
+        return {
+            "v": cls.SCHEMA_VERSION,
+            "key": key,
+            "blocks": [[cls._condition_to_record(condition) for condition in block] for block in conditions]
+        }
+
+    @classmethod
+    def from_record(cls, record):
+        """Returns the (key, conditions) pair stored in a record"""
+        version = record.get("v")
+        if version != cls.SCHEMA_VERSION:
+            raise ValueError(f"Unsupported record version: {version}")
+
+        counter = [0]
+        conditions = [[cls._condition_from_record(condition, counter) for condition in block] for block in record["blocks"]]
+        return record.get("key"), conditions
+
+    @classmethod
+    def _condition_to_record(cls, condition):
+        return {
+            "l": cls._operand_to_record(condition.operator_left),
+            "r": cls._operand_to_record(condition.operator_right),
+            "c": condition.comparator.value,
+            "t": condition.comparator_type,
+            "o": condition.offset
+        }
+
+    @classmethod
+    def _operand_to_record(cls, operand):
+        if isinstance(operand, Level5Function):
+            return {
+                "f": operand.function_id,
+                "n": operand.signature.name,
+                "a": [cls._operand_to_record(arg) for arg in operand.args],
+                "o": operand.offset
+            }
+        elif isinstance(operand, Level5Variable):
+            return {
+                "s": operand.lifetime.value,
+                "v": operand.value,
+                "o": operand.offset
+            }
+
+        raise ValueError(f"Unsupported operand: {operand!r}")
+
+    @classmethod
+    def _condition_from_record(cls, record, counter):
+        left = cls._operand_from_record(record["l"], counter)
+        right = cls._operand_from_record(record["r"], counter)
+        return Level5Condition(left, right, ComparatorEnum(record["c"]), record["t"], record.get("o"))
+
+    @classmethod
+    def _operand_from_record(cls, record, counter):
+        if "f" in record:
+            args = [cls._operand_from_record(arg, counter) for arg in record["a"]]
+            registry = FunctionRegistry.for_game()
+            signature = registry.get(record["f"]) or registry.generic(record["f"], len(args))
+            return Level5Function(signature, args, record.get("o"))
+
+        # Variable names are not stored, they are numbered in reading order like the decoder does
+        name = f"variable{counter[0]}"
+        counter[0] += 1
+        return Level5Variable(name, SymbolType(record["s"]), record["v"], record.get("o"))
@@ -0,0 +1,61 @@
+from level_5.condition.logic import *
+
+class ConditionSummary:
+    """
+    Functions, flags, items and sub-phase values referenced by decoded conditions.
+    Global and team bit flags are separate id spaces and are kept apart.
+    """
+
+    def __init__(self):
+        self.block_count = 0
+        self.condition_count = 0
+        self.functions = set()
+        self.flags = set()
+        self.team_flags = set()
+        self.items = set()
+        self.sub_phases = set()
+
+    @classmethod
+    def from_conditions(cls, conditions):
+        summary = cls()
+        summary.block_count = len(conditions)
+
+        for block in conditions:
+            for condition in block:
+                summary.condition_count += 1
+                summary._add_condition(condition)
+
+        return summary
+
+    @property
+    def sub_phase_range(self):
+        """(lowest, highest) sub-phase compared against, None when the sub-phase is not used"""
+        if not self.sub_phases:
+            return None
+        return min(self.sub_phases), max(self.sub_phases)
+
+    def _add_condition(self, condition):
+        for operand, other in ((condition.operator_left, condition.operator_right),
+                               (condition.operator_right, condition.operator_left)):
+            if not isinstance(operand, Level5Function):
+                continue
+
+            self.functions.add(operand.signature.c_name)
+
+            function_id = operand.function_id
+            if function_id == FunctionNameEnum.GET_GLOBAL_BIT_FLAG.value and operand.args:
+                self.flags.add(operand.args[0].value)
+            elif function_id == FunctionNameEnum.GET_TEAM_BIT_FLAG.value and operand.args:
+                self.team_flags.add(operand.args[0].value)
+            elif function_id == FunctionNameEnum.IS_HAVE_ITEM.value and operand.args:
+                self.items.add(operand.args[0].value)
+            elif function_id == FunctionNameEnum.GET_GAME_SUB_PHASE.value and isinstance(other, Level5Variable):
+                self.sub_phases.add(other.value)
+
+    def __repr__(self):
+        return (f"<ConditionSummary blocks={self.block_count} "
+                f"functions={sorted(self.functions)} "
+                f"flags={sorted(self.flags)} "
+                f"team_flags={sorted(self.team_flags)} "
+                f"items={sorted(self.items)} "
+                f"sub_phase_range={self.sub_phase_range}>")
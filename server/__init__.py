@@ -0,0 +1,3 @@
+from .condition_service import ConditionService
+from .decode_server import DecodeServer
+from .decode_client import DecodeClient, UnixDecodeClient
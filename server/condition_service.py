@@ -0,0 +1,131 @@
+import time
+import threading
+
+from tools.lru_cache import LRUCache
+from languages.code_emitter import CodeEmitter, ConditionEntry
+from level_5.condition.encoder import Level5ConditionEncoder
+from level_5.condition.serializer import ConditionSerializer
+
+class ConditionService:
+    """
+    Answers JSON-like requests (dicts) independently of the transport.
+    Decoded entries are kept in a bounded cache keyed by their Base64 data,
+    so repeated requests reuse the decoded conditions and generated code.
+    Generated code is only reused for the same data: entries with the same
+    structural hash may differ by block order and offsets, the hash is only
+    returned by decode.
+
+    handle() can be called from several threads at once: a cached entry is
+    decoded and generated under its own lock, so requests for different
+    data run in parallel.
+
+    Requests:
+        {"op": "decode", "data": base64, "key": optional key}
+        {"op": "generate", "data": base64, "targets": ["c", "squirrel", "json"]}
+        {"op": "encode", "record": serialized condition record}
+        {"op": "health"} / {"op": "stats"}
+        {"batch": [request, ...]}
+    """
+    
+    def __init__(self, cache_size=65536):
+        self.entries = LRUCache(cache_size)
+        self.started = time.time()
+        self.request_count = 0
+        self.error_count = 0
+        self.operation_counts = {}
+        self._lock = threading.Lock()
+        
+        self._handlers = {
+            "decode": self.decode,
+            "generate": self.generate,
+            "encode": self.encode,
+            "health": self.health,
+            "stats": self.stats
+        }
+    
+    def handle(self, request):
+        """Handles a single or batched request, errors are returned instead of raised"""
+        if isinstance(request, dict) and "batch" in request:
+            return {"results": [self._handle_single(item) for item in request["batch"]]}
+        
+        return self._handle_single(request)
+    
+    def _handle_single(self, request):
+        with self._lock:
+            self.request_count += 1
+        
+        try:
+            if not isinstance(request, dict):
+                raise ValueError("Request must be a JSON object")
+            
+            operation = request.get("op")
+            handler = self._handlers.get(operation)
+            
+            if handler is None:
+                raise ValueError(f"Unknown operation: {operation}")
+            
+            with self._lock:
+                self.operation_counts[operation] = self.operation_counts.get(operation, 0) + 1
+            return handler(request)
+        except Exception as e:
+            with self._lock:
+                self.error_count += 1
+            return {"error": str(e)}
+    
+    def decode(self, request):
+        entry, lock = self._get_entry(request)
+        with lock:
+            return {"record": ConditionSerializer.to_record(entry.conditions, request.get("key")),
+                    "hash": entry.structure_hash}
+    
+    def generate(self, request):
+        entry, lock = self._get_entry(request)
+        targets = request.get("targets", ["c"])
+        
+        if isinstance(targets, str):
+            targets = CodeEmitter.parse_targets(targets)
+        else:
+            targets = [CodeEmitter.resolve_target(target) for target in targets]
+        
+        with lock:
+            return {"outputs": entry.emit_all(targets)}
+    
+    def encode(self, request):
+        _, conditions = ConditionSerializer.from_record(request["record"])
+        return {"data": Level5ConditionEncoder.to_base64(conditions)}
+    
+    def health(self, request=None):
+        return {"status": "ok"}
+    
+    def stats(self, request=None):
+        with self._lock:
+            operations = dict(self.operation_counts)
+        return {
+            "uptime": time.time() - self.started,
+            "requests": self.request_count,
+            "errors": self.error_count,
+            "operations": operations,
+            "cache": self.entries.stats()
+        }
+    
+    def _get_entry(self, request):
+        """(entry, lock), the lock must be held while the entry is used"""
+        data = request.get("data")
+        
+        if not isinstance(data, str) or not data.strip():
+            raise ValueError("Missing Base64 data")
+        
+        data = data.strip()
+        cached = self.entries.get(data)
+        
+        if cached is None:
+            entry = ConditionEntry(data)
+            # Decode before caching so invalid data is never stored
+            entry.conditions
+            cached = (entry, threading.Lock())
+            # Two threads decoding the same new data keep the first entry cached
+            with self._lock:
+                cached = self.entries.get(data) or cached
+                self.entries.put(data, cached)
+        
+        return cached
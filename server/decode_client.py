@@ -0,0 +1,94 @@
+import json
+import socket
+import http.client
+
+class _ClientOperations:
+    """Request helpers shared by the HTTP and Unix socket clients"""
+
+    def decode(self, data, key=None):
+        return self.request({"op": "decode", "data": data, "key": key})
+
+    def generate(self, data, targets=("c",)):
+        return self.request({"op": "generate", "data": data, "targets": list(targets)})
+
+    def encode(self, record):
+        return self.request({"op": "encode", "record": record})
+
+    def batch(self, requests):
+        return self.request({"batch": list(requests)})["results"]
+
+    def health(self):
+        return self.request({"op": "health"})
+
+    def stats(self):
+        return self.request({"op": "stats"})
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+class DecodeClient(_ClientOperations):
+    """HTTP client for DecodeServer, the connection is kept alive between requests"""
+
+    def __init__(self, host="127.0.0.1", port=8765, timeout=30):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self._connection = None
+
+    def request(self, request):
+        payload = json.dumps(request, separators=(",", ":"))
+
+        # Retry once on a fresh connection if the server closed the previous one
+        for attempt in range(2):
+            if self._connection is None:
+                self._connection = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+
+            try:
+                self._connection.request("POST", "/", payload, {"Content-Type": "application/json"})
+                response = self._connection.getresponse()
+                return json.loads(response.read())
+            except (ConnectionError, http.client.HTTPException):
+                self.close()
+                if attempt:
+                    raise
+
+    def close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+class UnixDecodeClient(_ClientOperations):
+    """Unix socket client for DecodeServer, sends one JSON request per line"""
+
+    def __init__(self, path, timeout=30):
+        self.path = path
+        self.timeout = timeout
+        self._socket = None
+        self._file = None
+
+    def request(self, request):
+        if self._socket is None:
+            self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._socket.settimeout(self.timeout)
+            self._socket.connect(self.path)
+            self._file = self._socket.makefile("rwb")
+
+        self._file.write(json.dumps(request, separators=(",", ":")).encode("utf-8") + b"\n")
+        self._file.flush()
+
+        line = self._file.readline()
+        if not line:
+            self.close()
+            raise ConnectionError("Server closed the connection")
+
+        return json.loads(line)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._socket.close()
+            self._file = None
+            self._socket = None
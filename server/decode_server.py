@@ -0,0 +1,162 @@
+import json
+import asyncio
+
+from server.condition_service import ConditionService
+
+class DecodeServer:
+    """
+    Long-running asyncio server around a ConditionService.
+
+    HTTP (localhost, keep-alive):
+        GET  /health, /stats
+        POST /decode, /generate, /encode   body: request without "op"
+        POST /                             body: request or {"batch": [...]}
+    Unix socket: one JSON request per line, one JSON response per line.
+
+    Requests are handled on the default executor of the loop
+    (asyncio.to_thread), a large request does not stall the other clients.
+    """
+
+    ROUTES = {
+        "/decode": "decode",
+        "/generate": "generate",
+        "/encode": "encode",
+        "/health": "health",
+        "/stats": "stats"
+    }
+
+    MAX_BODY_SIZE = 64 * 1024 * 1024
+
+    def __init__(self, service=None, host="127.0.0.1", port=8765, unix_path=None):
+        self.service = service or ConditionService()
+        self.host = host
+        self.port = port
+        self.unix_path = unix_path
+        self._servers = []
+
+    async def start(self):
+        if self.port is not None:
+            self._servers.append(await asyncio.start_server(self._handle_http, self.host, self.port))
+        if self.unix_path:
+            self._servers.append(await asyncio.start_unix_server(self._handle_lines, self.unix_path, limit=self.MAX_BODY_SIZE))
+
+    async def serve_forever(self):
+        await self.start()
+        await asyncio.gather(*(server.serve_forever() for server in self._servers))
+
+    async def close(self):
+        for server in self._servers:
+            server.close()
+            await server.wait_closed()
+        self._servers = []
+
+    async def _handle_lines(self, reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+
+                response = await asyncio.to_thread(self._handle_body, line)
+                writer.write(json.dumps(response, separators=(",", ":")).encode("utf-8") + b"\n")
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _handle_http(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+
+                parts = request_line.decode("latin-1").split()
+                if len(parts) < 2:
+                    await self._write_http(writer, 400, {"error": "Bad request"}, False)
+                    break
+
+                method, path = parts[0].upper(), parts[1].split("?", 1)[0]
+                headers = await self._read_headers(reader)
+                keep_alive = headers.get("connection", "").lower() != "close"
+
+                try:
+                    length = int(headers.get("content-length", 0))
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    await self._write_http(writer, 400, {"error": "Invalid Content-Length"}, False)
+                    break
+                if length > self.MAX_BODY_SIZE:
+                    await self._write_http(writer, 413, {"error": "Request too large"}, False)
+                    break
+
+                body = await reader.readexactly(length) if length else b""
+                status, response = await asyncio.to_thread(self._route, method, path, body)
+                await self._write_http(writer, status, response, keep_alive)
+
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def _read_headers(self, reader):
+        headers = {}
+
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                return headers
+
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+    def _route(self, method, path, body):
+        if path == "/" and method == "POST":
+            return 200, self._handle_body(body)
+
+        operation = self.ROUTES.get(path)
+        if operation is None:
+            return 404, {"error": f"Unknown path: {path}"}
+
+        if method == "GET":
+            if operation not in ("health", "stats"):
+                return 405, {"error": f"{path} requires POST"}
+            return 200, self.service.handle({"op": operation})
+
+        if method != "POST":
+            return 405, {"error": f"Unsupported method: {method}"}
+
+        try:
+            request = json.loads(body) if body else {}
+        except ValueError as e:
+            return 400, {"error": f"Invalid JSON: {e}"}
+
+        if isinstance(request, dict):
+            request["op"] = operation
+        return 200, self.service.handle(request)
+
+    def _handle_body(self, body):
+        try:
+            request = json.loads(body)
+        except ValueError as e:
+            return {"error": f"Invalid JSON: {e}"}
+
+        return self.service.handle(request)
+
+    async def _write_http(self, writer, status, response, keep_alive):
+        reasons = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 413: "Payload Too Large"}
+        payload = json.dumps(response, separators=(",", ":")).encode("utf-8")
+
+        head = (f"HTTP/1.1 {status} {reasons.get(status, 'Error')}\r\n"
+                f"Content-Type: application/json\r\n"
+                f"Content-Length: {len(payload)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+
+        writer.write(head.encode("latin-1") + payload)
+        await writer.drain()
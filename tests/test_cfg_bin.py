@@ -0,0 +1,134 @@
+import os
+import zlib
+import struct
+import tempfile
+import unittest
+
+from level_5.cfg_bin import CfgBinReader, CfgBinParamType, read_condition_fields, read_cfg_bin_conditions
+from level_5.cfg_bin.conditions import is_condition
+
+SUB_PHASE = "AAAAAA8FNZjuS0cAAQAyBfZ9Sng="
+FLAG = "AAAAADUFNZjuS0cAAQAyAAAABW41mO5LRwABADIAAAAKb481Kj1FQwACAAAAAAAyAAAATTIAAAABeA=="
+
+ENTRIES = [
+    ("TALK_INFO_BEGIN", [3]),
+    ("TALK_INFO", [1, SUB_PHASE, "hello", 1.5]),
+    ("TALK_INFO", [2, None, FLAG, 7, 8, 9]),
+    ("TALK_INFO", [3, "AAAAAA==", "テスト"]),
+    ("TALK_INFO_END", []),
+]
+
+def build_cfg_bin(entries):
+    """cfg.bin bytes of (name, values) entries, strings (None for no string), ints and floats"""
+    strings = bytearray()
+    string_offsets = {}
+    body = bytearray()
+
+    def string_offset(value):
+        if value is None:
+            return -1
+        if value not in string_offsets:
+            string_offsets[value] = len(strings)
+            strings.extend(value.encode("utf-8") + b"\x00")
+        return string_offsets[value]
+
+    for name, values in entries:
+        types = [CfgBinParamType.FLOAT if isinstance(value, float) else
+                 CfgBinParamType.INT if isinstance(value, int) else CfgBinParamType.STRING for value in values]
+        body += struct.pack("<IB", zlib.crc32(name.encode("utf-8")), len(values))
+        for start in range(0, len(types), 4):
+            body.append(sum(param_type << (2 * shift) for shift, param_type in enumerate(types[start:start + 4])))
+        body += bytes(-len(body) % 4)
+
+        for value, param_type in zip(values, types):
+            if param_type == CfgBinParamType.STRING:
+                body += struct.pack("<i", string_offset(value))
+            elif param_type == CfgBinParamType.FLOAT:
+                body += struct.pack("<f", value)
+            else:
+                body += struct.pack("<i", value)
+
+    data = bytearray(struct.pack("<4I", len(entries), 0x10 + len(body), len(strings), len(string_offsets)))
+    data += body + strings
+    data += b"\xFF" * (-len(data) % 16)
+
+    # Key table: header, (crc32, name offset) per name, then the names
+    names = sorted({name for name, _ in entries})
+    key_strings = bytearray()
+    records = bytearray()
+    for name in names:
+        records += struct.pack("<II", zlib.crc32(name.encode("utf-8")), len(key_strings))
+        key_strings += name.encode("utf-8") + b"\x00"
+
+    strings_offset = 0x10 + len(records)
+    data += struct.pack("<4I", strings_offset + len(key_strings), len(names), strings_offset, len(key_strings))
+    data += records + key_strings
+    return bytes(data)
+
+class CfgBinReaderTest(unittest.TestCase):
+    def test_entries(self):
+        reader = CfgBinReader(build_cfg_bin(ENTRIES))
+        entries = list(reader.entries())
+
+        self.assertEqual([entry.name for entry in entries], [name for name, _ in ENTRIES])
+        self.assertEqual(entries[1].values, [1, SUB_PHASE, "hello", 1.5])
+        self.assertEqual(entries[1].types, [CfgBinParamType.INT, CfgBinParamType.STRING,
+                                            CfgBinParamType.STRING, CfgBinParamType.FLOAT])
+        self.assertEqual(entries[2].values, [2, None, FLAG, 7, 8, 9])
+        self.assertEqual(entries[3].values[2], "テスト")
+        self.assertEqual(entries[4].values, [])
+
+    def test_names_without_key_table(self):
+        data = build_cfg_bin(ENTRIES)
+        string_end = struct.unpack_from("<I", data, 4)[0] + struct.unpack_from("<I", data, 8)[0]
+        entries = list(CfgBinReader(data[:string_end]).entries())
+        self.assertEqual(entries[0].name, f"0x{zlib.crc32(b'TALK_INFO_BEGIN'):08X}")
+
+    def test_truncated_string_table(self):
+        data = build_cfg_bin(ENTRIES)
+        with self.assertRaises(ValueError):
+            CfgBinReader(data[:struct.unpack_from("<I", data, 4)[0] + 4])
+
+    def test_is_condition(self):
+        self.assertTrue(is_condition(SUB_PHASE))
+        self.assertFalse(is_condition("AAAAAA=="))
+        self.assertFalse(is_condition("hello"))
+        self.assertFalse(is_condition(None))
+
+class CfgBinConditionsTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.root = self.directory.name
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, *parts):
+        path = os.path.join(self.root, *parts)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(build_cfg_bin(ENTRIES))
+        return path
+
+    def test_condition_fields(self):
+        path = self.write("talk_info.cfg.bin")
+        fields = [(field.key, data) for field, data in read_condition_fields(path)]
+        self.assertEqual(fields, [("talk_info.1.TALK_INFO.1", SUB_PHASE), ("talk_info.2.TALK_INFO.2", FLAG)])
+
+    def test_tables_with_the_same_name_have_different_keys(self):
+        self.write("chapter1", "talk_info.cfg.bin")
+        self.write("chapter2", "talk_info.cfg.bin")
+
+        keys = [key for key, _ in read_cfg_bin_conditions([self.root])]
+        self.assertEqual(keys, ["chapter1/talk_info.1.TALK_INFO.1", "chapter1/talk_info.2.TALK_INFO.2",
+                                "chapter2/talk_info.1.TALK_INFO.1", "chapter2/talk_info.2.TALK_INFO.2"])
+
+    def test_tables_read_under_the_same_name_are_rejected(self):
+        first = self.write("chapter1", "talk_info.cfg.bin")
+        second = self.write("chapter2", "talk_info.cfg.bin")
+
+        with self.assertRaises(ValueError):
+            list(read_cfg_bin_conditions([first, second]))
+
+if __name__ == "__main__":
+    unittest.main()
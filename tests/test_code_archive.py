@@ -0,0 +1,77 @@
+import os
+import tempfile
+import unittest
+
+from languages.code_emitter import CodeEmitter
+from languages.code_archive import (CodeArchiveReader, CodeArchiveWriter, PackCodeArchiveReader,
+                                    archive_format, open_archive_reader, open_archive_writer)
+
+MEMBERS = [
+    (CodeEmitter.file_name("talk.1", "c"), "bool condition()\n{\n    return true;\n}"),
+    (CodeEmitter.file_name("../talk.2", "squirrel"), "function condition()\n{\n    return false;\n}"),
+    (CodeEmitter.file_name("テスト", "json"), '{"blocks": []}'),
+]
+
+ARCHIVES = ["code.zip", "code.tar", "code.tar.gz", "code.tgz", "code.tar.xz", "code.pack"]
+
+class CodeArchiveTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write_archive(self, name, compress=False):
+        path = os.path.join(self.directory.name, name)
+        with open_archive_writer(path, compress) as writer:
+            for member, text in MEMBERS:
+                writer.write(member, text)
+        return path
+
+    def test_round_trip(self):
+        for name in ARCHIVES:
+            for compress in (False, True):
+                with self.subTest(archive=name, compress=compress):
+                    path = self.write_archive(name, compress)
+                    with open_archive_reader(path) as reader:
+                        self.assertEqual(reader.names(), [member for member, _ in MEMBERS])
+                        for member, text in MEMBERS:
+                            self.assertIn(member, reader)
+                            self.assertEqual(reader.read(member), text)
+                        self.assertNotIn("missing.c", reader)
+                        with self.assertRaises(KeyError):
+                            reader.read_bytes("missing.c")
+
+    def test_get_by_key_and_target(self):
+        for name in ARCHIVES:
+            with self.subTest(archive=name):
+                with open_archive_reader(self.write_archive(name)) as reader:
+                    self.assertEqual(reader.get("talk.1", "c"), MEMBERS[0][1])
+                    self.assertEqual(reader.get("../talk.2", "squirrel"), MEMBERS[1][1])
+
+    def test_pack_compression_flag(self):
+        with PackCodeArchiveReader(self.write_archive("stored.pack")) as reader:
+            self.assertFalse(reader.compressed)
+        with PackCodeArchiveReader(self.write_archive("compressed.pack", compress=True)) as reader:
+            self.assertTrue(reader.compressed)
+
+    def test_invalid_pack(self):
+        path = os.path.join(self.directory.name, "invalid.pack")
+        with open(path, "wb") as f:
+            f.write(b"INZC" + bytes(64))
+        with self.assertRaises(ValueError):
+            PackCodeArchiveReader(path)
+
+    def test_unknown_format(self):
+        self.assertEqual(archive_format("CODE.TAR.GZ"), "tar")
+        with self.assertRaises(ValueError):
+            archive_format("code.rar")
+
+    def test_base_classes_are_abstract(self):
+        with self.assertRaises(TypeError):
+            CodeArchiveWriter()
+        with self.assertRaises(TypeError):
+            CodeArchiveReader()
+
+if __name__ == "__main__":
+    unittest.main()
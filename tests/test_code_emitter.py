@@ -0,0 +1,37 @@
+import unittest
+
+from languages.code_emitter import CodeEmitter
+from languages.c_language.c_codegenerator import CCodeGenerator
+from level_5.condition.functions import FunctionSignature
+from level_5.condition.logic import ComparatorEnum, Level5Condition, Level5Function, Level5Variable
+
+class FileNameTest(unittest.TestCase):
+    def test_plain_keys_are_kept(self):
+        self.assertEqual(CodeEmitter.file_name("talk.12.name.0", "c"), "talk.12.name.0.c")
+        self.assertEqual(CodeEmitter.file_name(3, "squirrel"), "3.nut")
+
+    def test_keys_cannot_leave_the_output_directory(self):
+        self.assertEqual(CodeEmitter.file_name("../x", "c"), "..%2Fx.c")
+        self.assertEqual(CodeEmitter.file_name("..", "c"), "%2E%2E.c")
+        self.assertEqual(CodeEmitter.file_name("a\\b", "json"), "a%5Cb.json")
+        self.assertEqual(CodeEmitter.file_name("C:x", "c"), "C%3Ax.c")
+
+    def test_names_are_unique(self):
+        keys = ["a/b", "a%2Fb", "a_b", ".", "%2E", ""]
+        names = {CodeEmitter.file_name(key, "c") for key in keys}
+        self.assertEqual(len(names), len(keys))
+
+class CCodeGeneratorTest(unittest.TestCase):
+    def generate(self, function_id):
+        function = Level5Function(FunctionSignature.generic(function_id, 0), [])
+        right = Level5Variable("var", 0, 10)
+        return CCodeGenerator([[Level5Condition(function, right, ComparatorEnum.GREATER_THAN_OR_EQUAL)]]).generate()
+
+    def test_calls_are_named_by_the_registry_of_the_game(self):
+        self.assertIn("getGameSubPhase() >= 10", self.generate(0x98EE4B47))
+
+    def test_unknown_functions_keep_their_generic_name(self):
+        self.assertIn("func_12345678() >= 10", self.generate(0x12345678))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+import unittest
+
+from languages.code_emitter import ConditionEntry
+from languages.code_parser import parse_code, Level5ParseError
+from level_5.condition.encoder import Level5ConditionEncoder
+
+# Samples of the README, functions with and without an argument
+README_VECTORS = [
+    "AAAAAA8FNZjuS0cAAQAyBfZ9Sng=",
+    "AAAAADUFNZjuS0cAAQAyAAAABW41mO5LRwABADIAAAAKb481Kj1FQwACAAAAAAAyAAAATTIAAAABeA==",
+]
+
+class RoundTripTest(unittest.TestCase):
+    def test_generated_code_encodes_to_the_same_bytes(self):
+        for data in README_VECTORS:
+            for target in ("c", "squirrel"):
+                with self.subTest(data=data, target=target):
+                    code = ConditionEntry(data).emit(target)
+                    self.assertEqual(Level5ConditionEncoder.to_base64(parse_code(code)), data)
+
+class NumberLiteralTest(unittest.TestCase):
+    def assertParseError(self, code, token):
+        with self.assertRaises(Level5ParseError) as context:
+            parse_code(code)
+        self.assertEqual(context.exception.position, code.index(token))
+
+    def test_leading_zero_is_rejected(self):
+        self.assertParseError("if (getGameSubPhase() == 012) { result = true; }", "012")
+        self.assertParseError("if (getGlobalBitFlag(077)) { result = true; }", "077")
+
+    def test_out_of_range_is_rejected(self):
+        self.assertParseError("if (getGameSubPhase() == 99999999999) { result = true; }", "99999999999")
+        self.assertParseError("if (getGameSubPhase() == -1) { result = true; }", "-1")
+        self.assertParseError("if (getGlobalBitFlag(4294967296)) { result = true; }", "4294967296")
+
+    def test_uint32_bounds_are_accepted(self):
+        for number in ("0", "4294967295", "0xFFFFFFFF", "0x0A"):
+            with self.subTest(number=number):
+                blocks = parse_code(f"if (getGameSubPhase() == {number}) {{ result = true; }}")
+                self.assertEqual(blocks[0][0].operator_right.value, int(number, 0))
+
+class AlwaysFalseTest(unittest.TestCase):
+    def test_code_that_never_sets_result_is_rejected(self):
+        for code in ("if (getGlobalBitFlag(1)) { }", "bool result = false; return result;"):
+            with self.subTest(code=code):
+                with self.assertRaises(Level5ParseError):
+                    parse_code(code)
+
+    def test_top_level_result_is_always_true(self):
+        self.assertEqual(parse_code("bool result = false; result = true; return result;"), [])
+
+if __name__ == "__main__":
+    unittest.main()
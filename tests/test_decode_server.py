@@ -0,0 +1,42 @@
+import json
+import asyncio
+import unittest
+
+from server.decode_server import DecodeServer
+
+DATA = "AAAAAA8FNZjuS0cAAQAyBfZ9Sng="
+
+class DecodeServerTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.server = DecodeServer(port=0)
+        await self.server.start()
+        self.port = self.server._servers[0].sockets[0].getsockname()[1]
+
+    async def asyncTearDown(self):
+        await self.server.close()
+
+    async def request(self, head, body=b""):
+        reader, writer = await asyncio.open_connection("127.0.0.1", self.port)
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
+        response = await reader.read()
+        writer.close()
+
+        status_line, _, payload = response.partition(b"\r\n\r\n")
+        return int(status_line.split()[1]), json.loads(payload)
+
+    async def test_generate(self):
+        body = json.dumps({"data": DATA}).encode()
+        status, response = await self.request(f"POST /generate HTTP/1.1\r\nContent-Length: {len(body)}\r\nConnection: close\r\n\r\n", body)
+        self.assertEqual(status, 200)
+        self.assertIn("getGameSubPhase() == 100040010", response["outputs"]["c"])
+
+    async def test_invalid_content_length_is_a_bad_request(self):
+        for length in ("-1", "ten"):
+            with self.subTest(length=length):
+                status, response = await self.request(f"POST /decode HTTP/1.1\r\nContent-Length: {length}\r\n\r\n")
+                self.assertEqual(status, 400)
+                self.assertEqual(response, {"error": "Invalid Content-Length"})
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import asyncio
+import unittest
+
+from languages.decode_stream import decode_batch, decode_stream
+
+VALID = "AAAAAA8FNZjuS0cAAQAyBfZ9Sng="
+OTHER = "AAAAADUFNZjuS0cAAQAyAAAABW41mO5LRwABADIAAAAKb481Kj1FQwACAAAAAAAyAAAATTIAAAABeA=="
+INVALID = "notbase64!!"
+
+def collect(source, **kwargs):
+    async def run():
+        return [result async for result in decode_stream(source, **kwargs)]
+    return asyncio.run(run())
+
+class DecodeStreamTest(unittest.TestCase):
+    def test_results_follow_the_source(self):
+        results = collect([VALID, OTHER] * 10, targets=["c"], executor="thread", chunk_size=3)
+
+        self.assertEqual([result.index for result in results], list(range(20)))
+        self.assertEqual([result.key for result in results], list(range(20)))
+        self.assertTrue(all(result.ok for result in results))
+        self.assertIn("getGameSubPhase()", results[0].entry.emit("c"))
+
+    def test_async_source_of_keys(self):
+        async def source():
+            for key in ("a", "b", "c"):
+                yield key, VALID
+
+        results = collect(source(), executor="thread")
+        self.assertEqual([result.key for result in results], ["a", "b", "c"])
+
+    def test_unordered_results_cover_the_source(self):
+        results = collect([VALID] * 50, executor="thread", max_workers=4, chunk_size=2, ordered=False)
+        self.assertEqual(sorted(result.index for result in results), list(range(50)))
+
+    def test_errors_are_reported_per_entry(self):
+        results = collect([VALID, INVALID, OTHER], executor="thread", chunk_size=2)
+
+        self.assertEqual([result.ok for result in results], [True, False, True])
+        self.assertIsNone(results[1].entry)
+        self.assertTrue(results[1].error)
+
+    def test_tolerant_failures_keep_their_entry(self):
+        results = collect([INVALID, VALID], executor="thread", tolerant=True)
+
+        self.assertFalse(results[0].ok)
+        self.assertTrue(results[0].entry.error is not None)
+        self.assertTrue(results[0].error.startswith(results[0].entry.error.reason))
+        self.assertTrue(results[1].ok)
+
+    def test_source_is_read_only_as_results_are_consumed(self):
+        consumed = []
+
+        def source():
+            for index in range(100):
+                consumed.append(index)
+                yield VALID
+
+        async def run():
+            stream = decode_stream(source(), executor="thread", max_in_flight=2, chunk_size=1)
+            first = await stream.__anext__()
+            read = len(consumed)
+            await stream.aclose()
+            return first, read
+
+        first, read = asyncio.run(run())
+        self.assertEqual(first.index, 0)
+        self.assertLessEqual(read, 2)
+
+    def test_invalid_limits(self):
+        with self.assertRaises(ValueError):
+            collect([VALID], max_in_flight=0)
+        with self.assertRaises(ValueError):
+            collect([VALID], chunk_size=0)
+
+class DecodeBatchTest(unittest.TestCase):
+    def test_results_follow_the_source(self):
+        source = [("a", VALID), ("b", INVALID), ("c", OTHER)] * 5
+        results = list(decode_batch(source, ["c", "json"], max_workers=2, chunk_size=2))
+
+        self.assertEqual([result.key for result in results], [key for key, _ in source])
+        self.assertEqual([result.ok for result in results], [True, False, True] * 5)
+        self.assertIn("getGlobalBitFlag", results[2].entry.emit("c"))
+
+if __name__ == "__main__":
+    unittest.main()
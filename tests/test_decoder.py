@@ -0,0 +1,46 @@
+import base64
+import unittest
+
+from languages.code_emitter import ConditionEntry
+from level_5.condition.decoder import Level5ConditionDecoder, Level5DecodeError
+from level_5.condition.diagnostics import Level5Diagnostic
+
+SUB_PHASE_ENTRY = "AAAAAA8FNZjuS0cAAQAyBfZ9Sng="
+
+class TolerantDecodingTest(unittest.TestCase):
+    def test_invalid_base64_fails_the_entry(self):
+        result = Level5ConditionDecoder(tolerant=True).decode("notbase64!!")
+        self.assertTrue(result.failed)
+        self.assertIsNone(result.conditions)
+        self.assertEqual(result.error.reason, Level5Diagnostic.INVALID_BASE64)
+
+    def test_missing_header_fails_the_entry(self):
+        result = Level5ConditionDecoder(tolerant=True).decode("AAAA")
+        self.assertTrue(result.failed)
+        self.assertIsNone(result.conditions)
+        self.assertEqual(result.error.reason, Level5Diagnostic.TRUNCATED)
+
+    def test_broken_block_is_dropped(self):
+        # A function opcode cut after its first byte, in a block of its own
+        data = base64.b64decode(SUB_PHASE_ENTRY) + b"\x8F\x35\x00"
+        result = Level5ConditionDecoder(tolerant=True).decode(base64.b64encode(data).decode())
+
+        self.assertFalse(result.failed)
+        self.assertEqual(len(result.conditions), 1)
+        self.assertEqual([diagnostic.reason for diagnostic in result.diagnostics], [Level5Diagnostic.TRUNCATED])
+        self.assertEqual(result.diagnostics[0].offset, 21)
+
+    def test_strict_mode_raises(self):
+        with self.assertRaises(ValueError):
+            Level5ConditionDecoder().decode("notbase64!!")
+
+    def test_failed_entry_is_never_always_true(self):
+        entry = ConditionEntry("notbase64!!", "bad", tolerant=True)
+        self.assertEqual(entry.error.reason, Level5Diagnostic.INVALID_BASE64)
+        with self.assertRaises(Level5DecodeError):
+            entry.conditions
+        with self.assertRaises(Level5DecodeError):
+            entry.emit("c")
+
+if __name__ == "__main__":
+    unittest.main()
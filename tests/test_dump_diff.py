@@ -0,0 +1,61 @@
+import os
+import tempfile
+import unittest
+
+from languages.code_parser import parse_code
+from level_5.condition.encoder import Level5ConditionEncoder
+from level_5.condition.dump_diff import ConditionChange, DumpDiff, EntryDiff, diff_conditions
+
+FLAG_1 = "if (getGlobalBitFlag(1)) { result = true; }"
+FLAG_2 = "if (getGlobalBitFlag(2)) { result = true; }"
+PHASE = "if (getGameSubPhase() >= 10) { result = true; }"
+
+def kinds(old_code, new_code):
+    return [change.kind for change in diff_conditions(parse_code(old_code), parse_code(new_code))]
+
+class DiffConditionsTest(unittest.TestCase):
+    def test_same_blocks_in_another_order(self):
+        self.assertEqual(kinds(FLAG_1 + PHASE, PHASE + FLAG_1), [])
+
+    def test_duplicate_blocks_are_counted(self):
+        self.assertEqual(kinds(FLAG_1 + FLAG_1, FLAG_1), [ConditionChange.BLOCK_REMOVED])
+        self.assertEqual(kinds(FLAG_1, FLAG_1 + FLAG_1), [ConditionChange.BLOCK_ADDED])
+
+    def test_blocks_of_the_same_shape_are_paired(self):
+        self.assertEqual(kinds(FLAG_1 + FLAG_1, FLAG_1 + FLAG_2), [ConditionChange.FLAG_CHANGED])
+        self.assertEqual(kinds(PHASE, PHASE.replace("10", "20")), [ConditionChange.SUB_PHASE_CHANGED])
+        self.assertEqual(kinds(PHASE, PHASE.replace(">=", ">")), [ConditionChange.COMPARATOR_CHANGED])
+
+    def test_blocks_of_another_shape_are_added_and_removed(self):
+        self.assertEqual(kinds(FLAG_1, PHASE), [ConditionChange.BLOCK_ADDED, ConditionChange.BLOCK_REMOVED])
+
+class DumpDiffTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write_dump(self, name, entries):
+        path = os.path.join(self.directory.name, name)
+        with open(path, "w", encoding="utf-8") as f:
+            for key, code in entries:
+                f.write(f"{key}\t{Level5ConditionEncoder.to_base64(parse_code(code))}\n")
+        return path
+
+    def test_compare(self):
+        old = self.write_dump("old.txt", [("same", FLAG_1), ("reordered", FLAG_1 + PHASE),
+                                          ("duplicate", FLAG_1 + FLAG_1), ("removed", FLAG_2)])
+        new = self.write_dump("new.txt", [("same", FLAG_1), ("reordered", PHASE + FLAG_1),
+                                          ("duplicate", FLAG_1), ("added", FLAG_2)])
+        diff = DumpDiff.compare(old, new)
+
+        self.assertEqual((diff.added, diff.removed, diff.unchanged), (["added"], ["removed"], 1))
+
+        statuses = {entry.key: entry for entry in diff.changed}
+        self.assertEqual(statuses["reordered"].status, EntryDiff.EQUIVALENT)
+        self.assertEqual(statuses["duplicate"].status, EntryDiff.CHANGED)
+        self.assertEqual([change.kind for change in statuses["duplicate"].changes], [ConditionChange.BLOCK_REMOVED])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,36 @@
+import unittest
+
+from languages.code_parser import parse_code
+
+from level_5.condition.decoder import Level5ConditionDecoder
+from level_5.condition.encoder import Level5ConditionEncoder
+
+# Samples of the README
+README_VECTORS = [
+    "AAAAAA8FNZjuS0cAAQAyBfZ9Sng=",
+    "AAAAADUFNZjuS0cAAQAyAAAABW41mO5LRwABADIAAAAKb481Kj1FQwACAAAAAAAyAAAATTIAAAABeA==",
+]
+
+class EncoderRoundTripTest(unittest.TestCase):
+    def test_readme_vectors_round_trip(self):
+        for data in README_VECTORS:
+            with self.subTest(data=data):
+                conditions = Level5ConditionDecoder.from_base64(data)
+                self.assertEqual(Level5ConditionEncoder.to_base64(conditions), data)
+
+    def test_header_byte_is_constant(self):
+        for data in README_VECTORS:
+            encoded = Level5ConditionEncoder(Level5ConditionDecoder.from_base64(data)).encode()
+            self.assertEqual(encoded[5], Level5ConditionEncoder.HEADER_BYTE)
+
+    def test_too_long_condition_is_rejected(self):
+        # A flag block takes 24 bytes: 10 blocks fit in the length byte, 11 do not
+        def flags(count):
+            return parse_code("".join(f"if (getGlobalBitFlag({flag})) {{ result = true; }}" for flag in range(count)))
+
+        self.assertEqual(Level5ConditionEncoder(flags(10)).encode()[4], 240)
+        with self.assertRaises(ValueError):
+            Level5ConditionEncoder(flags(11)).encode()
+
+if __name__ == "__main__":
+    unittest.main()
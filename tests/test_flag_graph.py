@@ -0,0 +1,87 @@
+import unittest
+
+from languages.code_parser import parse_code
+from level_5.condition.flag_graph import DependencyGraph, FLAG, ITEM, SUB_PHASE, TEAM_FLAG, parse_atom
+
+ENTRIES = {
+    "always": "result = true;",
+    "flag": "if (getGlobalBitFlag(77)) { result = true; }",
+    "not_flag": "if (!getGlobalBitFlag(77)) { result = true; }",
+    "flag_and_item": "if (getGlobalBitFlag(78) && isHaveItem(12)) { result = true; }",
+    "team_or_phase": """
+        if (getTeamBitFlag(3)) { result = true; }
+        if (getGameSubPhase() >= 100 && getGameSubPhase() < 200) { result = true; }
+    """,
+    "dead": "if (1 == 2) { result = true; }",
+}
+
+def build_graph():
+    return DependencyGraph.from_entries((key, parse_code(code)) for key, code in ENTRIES.items())
+
+class DependencyGraphTest(unittest.TestCase):
+    def test_entry_without_blocks_is_always_active(self):
+        graph = build_graph()
+        state = graph.evaluate()
+        self.assertIn("always", state.active_keys())
+
+        state.set((FLAG, 77))
+        state.set_sub_phase(150)
+        self.assertIn("always", state.active_keys())
+
+    def test_initial_state(self):
+        self.assertEqual(build_graph().evaluate().active_keys(), ["always", "not_flag"])
+        self.assertEqual(build_graph().dead_blocks, 1)
+
+    def test_set_and_clear(self):
+        state = build_graph().evaluate()
+
+        change = state.set((FLAG, 77))
+        self.assertEqual(change.unlocked, ["flag"])
+        self.assertEqual(change.locked, ["not_flag"])
+
+        change = state.clear((FLAG, 77))
+        self.assertEqual(change.unlocked, ["not_flag"])
+        self.assertEqual(change.locked, ["flag"])
+
+    def test_every_required_atom_is_needed(self):
+        state = build_graph().evaluate([(FLAG, 78)])
+        self.assertNotIn("flag_and_item", state.active_keys())
+        self.assertEqual(state.set((ITEM, 12)).unlocked, ["flag_and_item"])
+
+    def test_any_block_activates_the_entry(self):
+        self.assertIn("team_or_phase", build_graph().evaluate([(TEAM_FLAG, 3)]).active_keys())
+
+        state = build_graph().evaluate()
+        self.assertEqual(state.set_sub_phase(100).unlocked, ["team_or_phase"])
+        self.assertEqual(state.set_sub_phase(199).unlocked, [])
+        self.assertEqual(state.set_sub_phase(200).locked, ["team_or_phase"])
+
+    def test_what_if_leaves_the_state(self):
+        state = build_graph().evaluate()
+        before = state.active_keys()
+
+        self.assertEqual(state.what_if((FLAG, 77)).unlocked, ["flag"])
+        self.assertEqual(state.what_if((SUB_PHASE, 150)).unlocked, ["team_or_phase"])
+        self.assertEqual(state.active_keys(), before)
+
+    def test_effects_run_to_a_fixpoint(self):
+        state = build_graph().evaluate(effects={"flag": [(FLAG, 78)], "flag_and_item": [(TEAM_FLAG, 3)]})
+        state.set((ITEM, 12))
+
+        change = state.set((FLAG, 77))
+        self.assertEqual(sorted(change.unlocked), ["flag", "flag_and_item", "team_or_phase"])
+        self.assertEqual(change.atoms, [(FLAG, 77), (FLAG, 78), (TEAM_FLAG, 3)])
+
+    def test_dependents(self):
+        graph = build_graph()
+        self.assertEqual(graph.dependents((FLAG, 77)), ["flag", "not_flag"])
+        self.assertEqual(graph.dependents((SUB_PHASE, 200)), ["team_or_phase"])
+
+    def test_parse_atom(self):
+        self.assertEqual(parse_atom("team:0x10"), (TEAM_FLAG, 16))
+        self.assertEqual(parse_atom("phase:5"), (SUB_PHASE, 5))
+        with self.assertRaises(ValueError):
+            parse_atom("flag")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from exporters.sqlite_exporter import SqliteExporter
+from level_5.condition.decoder import Level5ConditionDecoder
+
+DATA = "AAAAADUFNZjuS0cAAQAyAAAABW41mO5LRwABADIAAAAKb481Kj1FQwACAAAAAAAyAAAATTIAAAABeA=="
+
+def index_names(connection):
+    return {row[0] for row in connection.execute("SELECT name FROM sqlite_master WHERE type = 'index' AND name LIKE 'idx_%'")}
+
+class SqliteExporterTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "conditions.db")
+        self.conditions = Level5ConditionDecoder.from_base64(DATA)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_append_defers_the_existing_indexes(self):
+        with SqliteExporter(self.path) as exporter:
+            exporter.write("a", self.conditions)
+
+        exporter = SqliteExporter(self.path)
+        self.assertEqual(index_names(exporter.connection), set())
+        exporter.write("b", self.conditions)
+        exporter.close()
+
+        with sqlite3.connect(self.path) as connection:
+            self.assertEqual(index_names(connection), set(SqliteExporter.index_names()))
+            self.assertEqual(connection.execute("SELECT key FROM entries ORDER BY id").fetchall(), [("a",), ("b",)])
+            flags = connection.execute("SELECT key, flag_id FROM flag_conditions ORDER BY key").fetchall()
+            self.assertEqual(flags, [("a", 77), ("b", 77)])
+
+    def test_delete_keeps_the_indexes_when_not_deferred(self):
+        with SqliteExporter(self.path) as exporter:
+            exporter.write("a", self.conditions)
+
+        exporter = SqliteExporter(self.path, defer_indexes=False)
+        self.assertEqual(index_names(exporter.connection), set(SqliteExporter.index_names()))
+        exporter.delete(["a"])
+        exporter.close()
+
+        with sqlite3.connect(self.path) as connection:
+            for table in ("entries", "blocks", "conditions", "function_calls", "arguments"):
+                self.assertEqual(connection.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0], 0)
+
+if __name__ == "__main__":
+    unittest.main()
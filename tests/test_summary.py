@@ -0,0 +1,14 @@
+import unittest
+
+from languages.code_parser import parse_code
+from level_5.condition.summary import ConditionSummary
+
+class ConditionSummaryTest(unittest.TestCase):
+    def test_global_and_team_flags_are_kept_apart(self):
+        conditions = parse_code("if (getGlobalBitFlag(77) && !getTeamBitFlag(3)) { result = true; }")
+        summary = ConditionSummary.from_conditions(conditions)
+        self.assertEqual(summary.flags, {77})
+        self.assertEqual(summary.team_flags, {3})
+
+if __name__ == "__main__":
+    unittest.main()
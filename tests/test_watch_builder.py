@@ -0,0 +1,67 @@
+import os
+import tempfile
+import unittest
+
+from languages.watch_builder import WatchBuilder
+
+VALID = "AAAAAA8FNZjuS0cAAQAyBfZ9Sng="
+OTHER = "AAAAADUFNZjuS0cAAQAyAAAABW41mO5LRwABADIAAAAKb481Kj1FQwACAAAAAAAyAAAATTIAAAABeA=="
+
+class WatchBuilderTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.root = os.path.join(self.directory.name, "dumps")
+        self.output = os.path.join(self.directory.name, "output")
+        os.makedirs(self.root)
+        self.builder = WatchBuilder(self.root, ["c"], self.output)
+        self.mtime = 1_000_000_000
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write_dump(self, text):
+        path = os.path.join(self.root, "talk.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        # Every write is seen as a change, whatever the resolution of the file system clock
+        self.mtime += 1
+        os.utime(path, (self.mtime, self.mtime))
+
+    def output_path(self, key):
+        return os.path.join(self.output, "talk", f"{key}.c")
+
+    def test_only_changed_entries_are_built(self):
+        self.write_dump(f"a\t{VALID}\nb\t{VALID}\n")
+        self.assertEqual(self.builder.run_cycle().entries_built, 2)
+
+        self.write_dump(f"a\t{VALID}\nb\t{OTHER}\n")
+        stats = self.builder.run_cycle()
+        self.assertEqual((stats.entries_built, stats.entries_skipped), (1, 1))
+
+    def test_removed_entries_lose_their_outputs(self):
+        self.write_dump(f"a\t{VALID}\nb\t{VALID}\n")
+        self.builder.run_cycle()
+
+        self.write_dump(f"a\t{VALID}\n")
+        self.assertEqual(self.builder.run_cycle().entries_removed, 1)
+        self.assertFalse(os.path.exists(self.output_path("b")))
+        self.assertTrue(os.path.exists(self.output_path("a")))
+
+    def test_failed_entry_loses_its_old_output_and_is_retried(self):
+        self.write_dump(f"a\t{VALID}\nb\t{VALID}\n")
+        self.builder.run_cycle()
+
+        self.write_dump(f"a\t{VALID}\nb\tnotbase64!!\n")
+        stats = self.builder.run_cycle()
+        self.assertEqual(len(stats.errors), 1)
+        self.assertFalse(os.path.exists(self.output_path("b")))
+        self.assertNotIn("b", self.builder.entry_hashes["talk.txt"])
+
+        # The same data again is built, not skipped as already done
+        self.write_dump(f"a\t{VALID}\nb\t{VALID}\n")
+        stats = self.builder.run_cycle()
+        self.assertEqual((stats.entries_built, stats.entries_skipped), (1, 1))
+        self.assertTrue(os.path.exists(self.output_path("b")))
+
+if __name__ == "__main__":
+    unittest.main()
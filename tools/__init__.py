@@ -1,2 +1,3 @@
 from .binary_reader import BinaryDataReader
-from .binary_writer import BinaryDataWriter
\ No newline at end of file
+from .binary_writer import BinaryDataWriter
+from .lru_cache import LRUCache
@@ -1,11 +1,20 @@
 import struct
 
 class BinaryDataReader:
+    INT32 = {'big': struct.Struct(">I"), 'little': struct.Struct("<I")}
+    SINT32 = {'big': struct.Struct(">i"), 'little': struct.Struct("<i")}
+    FLOAT = {'big': struct.Struct(">f"), 'little': struct.Struct("<f")}
+    
     def __init__(self, data, order='big'):
         self.data = data
         self._offset = 0
         self._order = order
     
+    def reset(self, data, offset=0):
+        """Rebinds the reader to new data so the same reader can be reused"""
+        self.data = data
+        self._offset = offset
+    
     @property
     def length(self):
         return len(self.data)
@@ -32,15 +41,34 @@ class BinaryDataReader:
         return chunk
     
     def read_byte(self):
-        return self.read_bytes(1)[0]
+        if self._offset >= len(self.data):
+            raise ValueError("Attempt to read beyond the end of the buffer.")
+        value = self.data[self._offset]
+        self._offset += 1
+        return value
     
     def read_byte_as_hex(self):
         return f"{self.read_bytes(1)[0]:02X}"
     
     def read_int32(self, order=None):
-        byte_order = order if order else self._order
-        format_char = ">I" if byte_order == 'big' else "<I"
-        return struct.unpack(format_char, self.read_bytes(4))[0]
+        if self._offset + 4 > len(self.data):
+            raise ValueError("Attempt to read beyond the end of the buffer.")
+        value = self.INT32[order or self._order].unpack_from(self.data, self._offset)[0]
+        self._offset += 4
+        return value
+    
+    def read_sint32(self, order=None):
+        return self._unpack(self.SINT32, 4, order)
+    
+    def read_float(self, order=None):
+        return self._unpack(self.FLOAT, 4, order)
+    
+    def _unpack(self, structs, size, order):
+        if self._offset + size > len(self.data):
+            raise ValueError("Attempt to read beyond the end of the buffer.")
+        value = structs[order or self._order].unpack_from(self.data, self._offset)[0]
+        self._offset += size
+        return value
     
     def read_int24(self, order=None):
         byte_order = order if order else self._order
@@ -51,6 +79,10 @@ class BinaryDataReader:
             raise ValueError("Attempt to skip beyond the end of the buffer.")
         self._offset += length
     
+    def align(self, alignment):
+        """Skips to the next multiple of alignment"""
+        self.skip(-self._offset % alignment)
+    
     def to_seek(self, position):
         if position < 0 or position > len(self.data):
             raise ValueError("Invalid seek position.")
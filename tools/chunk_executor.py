@@ -0,0 +1,59 @@
+import collections
+from concurrent.futures import Executor
+
+def create_executor(executor, max_workers):
+    """Returns (executor, owned), "thread" and "process" create an executor the caller shuts down"""
+    if executor is None or isinstance(executor, Executor):
+        return executor, False
+    # Pools are imported on demand, the process pool pulls in multiprocessing
+    if executor == "thread":
+        from concurrent.futures import ThreadPoolExecutor
+        return ThreadPoolExecutor(max_workers), True
+    if executor == "process":
+        from concurrent.futures import ProcessPoolExecutor
+        return ProcessPoolExecutor(max_workers), True
+
+    raise ValueError(f"Unknown executor: {executor}")
+
+def iter_chunks(source, chunk_size):
+    """Groups Base64 strings or (key, Base64) pairs into lists of (index, key, data)"""
+    chunk = []
+
+    for index, item in enumerate(source):
+        key, data = item if isinstance(item, tuple) else (index, item)
+        chunk.append((index, key, data))
+
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+
+    if chunk:
+        yield chunk
+
+def map_chunks(source, function, args=(), executor="thread", max_workers=None, max_in_flight=16, chunk_size=256):
+    """
+    Runs function(chunk, *args) over chunks of (index, key, data) of an
+    iterable on an executor, at most max_in_flight chunks at once, and yields
+    the items of the returned lists in source order. function must be a
+    module level function to run on a process pool.
+    """
+    if max_in_flight < 1 or chunk_size < 1:
+        raise ValueError("max_in_flight and chunk_size must be at least 1")
+
+    executor, owned = create_executor(executor or "thread", max_workers)
+    pending = collections.deque()
+
+    try:
+        for chunk in iter_chunks(source, chunk_size):
+            pending.append(executor.submit(function, chunk, *args))
+
+            while len(pending) >= max_in_flight:
+                yield from pending.popleft().result()
+
+        while pending:
+            yield from pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+        if owned:
+            executor.shutdown(wait=False, cancel_futures=True)
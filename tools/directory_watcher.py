@@ -0,0 +1,96 @@
+import os
+import fnmatch
+import hashlib
+
+class FileState:
+    """Modification time, size and content hash of a watched file"""
+
+    def __init__(self, mtime_ns, size, digest):
+        self.mtime_ns = mtime_ns
+        self.size = size
+        self.digest = digest
+
+class DirectoryChanges:
+    """Files added, modified and removed since the previous scan, with the work that was skipped"""
+
+    def __init__(self):
+        self.added = []
+        self.modified = []
+        self.removed = []
+        self.unchanged = 0
+        self.touched = 0
+        self.hashed_bytes = 0
+
+    @property
+    def changed(self):
+        return self.added + self.modified
+
+    def __bool__(self):
+        return bool(self.added or self.modified or self.removed)
+
+class DirectoryWatcher:
+    """
+    Polls a directory and keeps an index of relative path -> (mtime, size,
+    content hash). Files whose mtime and size did not change are not read,
+    files that were only touched (same content) are not reported as changed.
+    No notification API of the OS is used.
+    """
+
+    def __init__(self, root, patterns=("*",), recursive=True):
+        self.root = root
+        self.patterns = patterns
+        self.recursive = recursive
+        self.index = {}
+
+    def scan(self):
+        changes = DirectoryChanges()
+        seen = set()
+
+        for path in self._files():
+            seen.add(path)
+            full_path = os.path.join(self.root, path)
+
+            try:
+                stat = os.stat(full_path)
+            except OSError:
+                # Removed between the listing and the stat, the next scan reports it
+                continue
+
+            state = self.index.get(path)
+            if state is not None and state.mtime_ns == stat.st_mtime_ns and state.size == stat.st_size:
+                changes.unchanged += 1
+                continue
+
+            digest = self._hash(full_path)
+            changes.hashed_bytes += stat.st_size
+            self.index[path] = FileState(stat.st_mtime_ns, stat.st_size, digest)
+
+            if state is None:
+                changes.added.append(path)
+            elif state.digest == digest:
+                changes.touched += 1
+            else:
+                changes.modified.append(path)
+
+        for path in [path for path in self.index if path not in seen]:
+            del self.index[path]
+            changes.removed.append(path)
+
+        return changes
+
+    def _files(self):
+        for directory, subdirectories, files in os.walk(self.root):
+            if not self.recursive:
+                subdirectories.clear()
+
+            for name in files:
+                if any(fnmatch.fnmatch(name, pattern) for pattern in self.patterns):
+                    yield os.path.relpath(os.path.join(directory, name), self.root)
+
+    @staticmethod
+    def _hash(path):
+        digest = hashlib.blake2b(digest_size=16)
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        return digest.digest()